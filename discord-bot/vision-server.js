@@ -7,6 +7,56 @@
 const WebSocket = require('ws');
 const EventEmitter = require('events');
 
+// Binary game_state frames - mirrors vision-agent/utils/wire.py
+const WIRE_FORMAT = 'binary-delta-v1';
+const WIRE_MAGIC = 0x56;
+const WIRE_VERSION = 1;
+const FLAG_KEYFRAME = 0x01;
+const WIRE_HEADER_SIZE = 19;
+const WIRE_FIELDS = [
+      ['hp', 'u16'], ['shield', 'u16'], ['wood', 'u16'], ['brick', 'u16'], ['metal', 'u16'],
+      ['storm_phase', 'u8'], ['storm_seconds', 'u16'], ['alive_players', 'u8'], ['eliminations', 'u8'],
+      ['surge_active', 'bool'], ['surge_text', 'str'], ['timestamp', 'f64'],
+      ['capture_fps', 'f32'], ['confidence', 'f32'], ['stream_id', 'str']
+];
+
+// previous maps stream_id (or '' for single-stream agents) to the last decoded state
+function decodeStateFrame(buffer, previous) {
+      if (buffer.readUInt8(0) !== WIRE_MAGIC || buffer.readUInt8(1) !== WIRE_VERSION) {
+                throw new Error('Not a game_state frame');
+      }
+      const flags = buffer.readUInt8(2);
+      const sentAt = buffer.readDoubleLE(7);
+      const present = buffer.readUInt16LE(15);
+      const nulls = buffer.readUInt16LE(17);
+      const changes = {};
+      let offset = WIRE_HEADER_SIZE;
+      WIRE_FIELDS.forEach(([name, type], bit) => {
+                if (!(present & (1 << bit))) return;
+                if (nulls & (1 << bit)) { changes[name] = null; return; }
+                switch (type) {
+                  case 'u8': changes[name] = buffer.readUInt8(offset); offset += 1; break;
+                  case 'bool': changes[name] = buffer.readUInt8(offset) !== 0; offset += 1; break;
+                  case 'u16': changes[name] = buffer.readUInt16LE(offset); offset += 2; break;
+                  case 'f32': changes[name] = buffer.readFloatLE(offset); offset += 4; break;
+                  case 'f64': changes[name] = buffer.readDoubleLE(offset); offset += 8; break;
+                  case 'str': {
+                                const length = buffer.readUInt8(offset);
+                                changes[name] = buffer.toString('utf8', offset + 1, offset + 1 + length);
+                                offset += 1 + length;
+                                break;
+                  }
+                }
+      });
+      const stream = changes.stream_id || '';
+      const base = previous[stream];
+      if (!(flags & FLAG_KEYFRAME) && !base) return null;
+      const state = (flags & FLAG_KEYFRAME) ? changes : { ...base, ...changes };
+      const seconds = state.storm_seconds;
+      state.storm_timer = seconds == null ? null : `${Math.floor(seconds / 60)}:${String(seconds % 60).padStart(2, '0')}`;
+      return { state, stream, sentAt };
+}
+
 class VisionServer extends EventEmitter {
       constructor(port = 8765) {
                 super();
@@ -14,6 +64,9 @@ class VisionServer extends EventEmitter {
                 this.wss = null;
                 this.clients = new Set();
                 this.latestState = null;
+                this.latestStates = new Map(); // per stream_id for multi-stream agents
+                this.latestStats = null;
+                this.readiness = null;
                 this.stateHistory = [];
                 this.maxHistory = 100;
                 this.isRunning = false;
@@ -34,9 +87,17 @@ class VisionServer extends EventEmitter {
                         this.emit('agent_connected');
                         ws.send(JSON.stringify({ type: 'connected', message: 'Vision server ready' }));
 
-                                  ws.on('message', (data) => {
+                                  ws.on('message', (data, isBinary) => {
                                                     try {
+                                                                          if (isBinary) {
+                                                                                                    this.handleBinaryState(ws, data);
+                                                                                                    return;
+                                                                          }
                                                                           const message = JSON.parse(data.toString());
+                                                                          if (message.type === 'hello') {
+                                                                                                    this.handleHello(ws, message.data || {});
+                                                                                                    return;
+                                                                          }
                                                                           this.handleMessage(message);
                                                     } catch (error) {
                                                                           console.error('Invalid message:', error);
@@ -45,6 +106,7 @@ class VisionServer extends EventEmitter {
 
                                   ws.on('close', () => {
                                                     this.clients.delete(ws);
+                                                    this.readiness = null;
                                                     this.emit('agent_disconnected');
                                   });
           });
@@ -59,6 +121,12 @@ class VisionServer extends EventEmitter {
                 case 'surge_warning':
                                   this.emit('surge_warning', data);
                                   break;
+                case 'surge_end':
+                                  this.emit('surge_end', data);
+                                  break;
+                case 'hp_drop':
+                                  this.emit('hp_drop', data);
+                                  break;
                 case 'low_hp':
                                   this.emit('low_hp', data);
                                   break;
@@ -71,11 +139,44 @@ class VisionServer extends EventEmitter {
                 case 'storm_phase':
                                   this.emit('storm_phase', data);
                                   break;
+                case 'alive_threshold':
+                                  this.emit('alive_threshold', data);
+                                  break;
+                case 'stats':
+                                  this.latestStats = data;
+                                  this.emit('stats', data);
+                                  break;
+                case 'readiness':
+                                  this.readiness = data;
+                                  this.emit('readiness', data);
+                                  break;
+                case 'resource_budget':
+                                  console.warn('Vision agent over its resource budget:', (data.reasons || []).join('; '));
+                                  this.emit('resource_budget', data);
+                                  break;
               }
     }
 
+    handleHello(ws, data) {
+              const formats = data.formats || [];
+              const format = formats.includes(WIRE_FORMAT) ? WIRE_FORMAT : 'json';
+              ws.wireStates = {};
+              ws.send(JSON.stringify({ type: 'hello_ack', data: { format } }));
+    }
+
+    handleBinaryState(ws, data) {
+              ws.wireStates = ws.wireStates || {};
+              const decoded = decodeStateFrame(data, ws.wireStates);
+              if (!decoded) return; // delta before the first keyframe
+              ws.wireStates[decoded.stream] = decoded.state;
+              this.handleGameState({ ...decoded.state }, decoded.sentAt);
+    }
+
     handleGameState(state, timestamp) {
               this.latestState = { ...state, receivedAt: Date.now(), sourceTimestamp: timestamp };
+              if (state.stream_id) {
+                            this.latestStates.set(state.stream_id, this.latestState);
+              }
               this.stateHistory.push(this.latestState);
               if (this.stateHistory.length > this.maxHistory) {
                             this.stateHistory.shift();
@@ -83,10 +184,23 @@ class VisionServer extends EventEmitter {
               this.emit('state_update', this.latestState);
     }
 
-    getLatestState() {
+    getLatestState(streamId = null) {
+              if (streamId) return this.latestStates.get(streamId) || null;
               return this.latestState;
     }
 
+    getStreamIds() {
+              return [...this.latestStates.keys()];
+    }
+
+    getLatestStats() {
+              return this.latestStats;
+    }
+
+    getReadiness() {
+              return this.readiness;
+    }
+
     getStateHistory(count = 10) {
               return this.stateHistory.slice(-count);
     }
@@ -114,3 +228,4 @@ class VisionServer extends EventEmitter {
 }
 
 module.exports = VisionServer;
+module.exports.decodeStateFrame = decodeStateFrame;
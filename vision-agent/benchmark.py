@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Fortnite IGL Vision Agent - Benchmark
+Runs StateExtractor headless over synthetic HUD frames with known values
+and reports FPS, per-stage latency percentiles and per-field accuracy.
+
+Usage:
+    python benchmark.py --frames 300
+    python benchmark.py --no-easyocr --min-fps 20 --min-accuracy 0.95
+    python benchmark.py --resolution 2560x1440
+"""
+
+import sys
+import json
+import copy
+import time
+import socket
+import argparse
+import logging
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils.extractor import StateExtractor, GameState
+from utils.tracker import StateTracker
+from utils.backends import BACKENDS, backend_available
+from utils.wire import StateEncoder, WIRE_FORMAT
+from utils.synthetic import SyntheticHUD, SyntheticCapture, HUDTruth, SCORED_FIELDS
+
+logger = logging.getLogger(__name__)
+
+STAGES = ('capture', 'preprocess', 'ocr', 'extract', 'serialize', 'send')
+
+
+class StageTimer:
+    """Accumulates time per stage within a frame, then keeps one sample per frame."""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self._frame: Dict[str, float] = defaultdict(float)
+
+    def wrap(self, stage: str, func: Callable) -> Callable:
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._frame[stage] += time.perf_counter() - started
+        return timed
+
+    def add(self, stage: str, seconds: float):
+        self._frame[stage] += seconds
+
+    def discard_frame(self):
+        self._frame.clear()
+
+    def end_frame(self):
+        for stage in STAGES:
+            self.samples[stage].append(self._frame.get(stage, 0.0))
+        self._frame.clear()
+
+    def percentiles(self) -> Dict[str, Dict[str, float]]:
+        report = {}
+        for stage in STAGES:
+            values = np.array(self.samples.get(stage) or [0.0]) * 1000.0
+            report[stage] = {
+                'p50': float(np.percentile(values, 50)),
+                'p95': float(np.percentile(values, 95)),
+                'p99': float(np.percentile(values, 99)),
+                'max': float(values.max()),
+            }
+        return report
+
+
+def instrument(extractor: StateExtractor, timer: StageTimer):
+    """Route the OCR engine's preprocessing and recognizer calls through the timer."""
+    ocr = extractor.ocr
+    for name in ('preprocess_for_numbers', 'preprocess_for_text', 'preprocess_surge_warning'):
+        setattr(ocr, name, timer.wrap('preprocess', getattr(ocr, name)))
+    if ocr.digits is not None:
+        ocr.digits.recognize = timer.wrap('ocr', ocr.digits.recognize)
+    if ocr.reader is not None:
+        ocr.reader.readtext = timer.wrap('ocr', ocr.reader.readtext)
+
+
+def score(state: GameState, truth: HUDTruth) -> Dict[str, bool]:
+    expected = truth.as_fields()
+    return {name: getattr(state, name) == expected[name] for name in SCORED_FIELDS}
+
+
+def run_benchmark(config: Dict[str, Any], frames: int, fps: float, seed: int, noise: float,
+                  warmup: int = 5, size=(1920, 1080), augment: bool = True) -> Dict[str, Any]:
+    hud = SyntheticHUD(config.get('regions', {}), size=size, seed=seed, noise=noise,
+                       base_resolution=config.get('capture', {}).get('base_resolution'), augment=augment)
+    capture = SyntheticCapture(hud, frames + warmup, fps=fps)
+    extractor = StateExtractor(config, capture=capture)
+    if not extractor.initialize():
+        raise RuntimeError("StateExtractor failed to initialize")
+    tracker_config = config.get('tracker', {})
+    tracker = None
+    if tracker_config.get('enabled', True):
+        tracker = StateTracker(tracker_config, scheduler=extractor.scheduler)
+
+    wire_format = config.get('websocket', {}).get('wire_format', 'json')
+    encoder = StateEncoder(config.get('websocket', {}).get('keyframe_interval', 30))
+    sender, receiver = socket.socketpair()
+    receiver.setblocking(False)
+
+    timer = StageTimer()
+    instrument(extractor, timer)
+    raw_hits = defaultdict(int)
+    published_hits = defaultdict(int)
+    payload_bytes = 0
+    confidence = 0.0
+    measured = 0
+    busy = 0.0
+
+    try:
+        for index in range(frames + warmup):
+            started = time.perf_counter()
+            frame = extractor.grab_frame()
+            if frame is None:
+                break
+            timer.add('capture', time.perf_counter() - started - capture.render_time)
+            truth = capture.last_truth
+
+            extract_started = time.perf_counter()
+            state = extractor.extract_frame(frame, extractor.capture_time())
+            timer.add('extract', time.perf_counter() - extract_started)
+            published = tracker.update(state, extractor.last_refreshed) if tracker is not None else state
+
+            serialize_started = time.perf_counter()
+            data = published.to_dict()
+            if wire_format == WIRE_FORMAT:
+                payload = encoder.encode(data, time.time())
+            else:
+                payload = json.dumps({'type': 'game_state', 'data': data, 'timestamp': time.time()}).encode('utf-8')
+            timer.add('serialize', time.perf_counter() - serialize_started)
+
+            send_started = time.perf_counter()
+            sender.sendall(payload)
+            timer.add('send', time.perf_counter() - send_started)
+            try:
+                while receiver.recv(65536):
+                    pass
+            except BlockingIOError:
+                pass
+            frame_busy = time.perf_counter() - started - capture.render_time
+
+            if index < warmup:
+                timer.discard_frame()
+                continue
+            timer.end_frame()
+            busy += frame_busy
+            measured += 1
+            payload_bytes += len(payload)
+            confidence += state.confidence
+            for name, ok in score(state, truth).items():
+                raw_hits[name] += ok
+            for name, ok in score(published, truth).items():
+                published_hits[name] += ok
+    finally:
+        sender.close()
+        receiver.close()
+        extractor.release()
+
+    measured = max(measured, 1)
+    raw = {name: raw_hits[name] / measured for name in SCORED_FIELDS}
+    final = {name: published_hits[name] / measured for name in SCORED_FIELDS}
+    return {
+        'frames': measured,
+        'fps': measured / busy if busy > 0 else 0.0,
+        'latency_ms': timer.percentiles(),
+        'accuracy_raw': raw,
+        'accuracy': final,
+        'mean_accuracy': sum(final.values()) / len(final),
+        'bytes_per_state': payload_bytes / measured,
+        'wire_format': wire_format,
+        'cache': extractor.cache_stats(),
+        'digits': {'hits': extractor.ocr.digit_hits, 'fallbacks': extractor.ocr.digit_fallbacks,
+                   'escalations': extractor.ocr.escalations, 'tiers': dict(extractor.ocr.tier_hits)},
+        'mean_confidence': confidence / measured,
+        'augmented': augment,
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    print(f"\nFrames: {report['frames']}   FPS: {report['fps']:.1f}   "
+          f"Wire: {report['wire_format']} ({report['bytes_per_state']:.0f} B/state)")
+    print(f"\n{'stage':<12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for stage, row in report['latency_ms'].items():
+        print(f"{stage:<12}{row['p50']:>10.2f}{row['p95']:>10.2f}{row['p99']:>10.2f}{row['max']:>10.2f}")
+    print(f"\n{'field':<16}{'raw':>8}{'published':>12}")
+    for name in SCORED_FIELDS:
+        print(f"{name:<16}{report['accuracy_raw'][name]:>8.1%}{report['accuracy'][name]:>12.1%}")
+    print(f"\nMean accuracy: {report['mean_accuracy']:.1%}   Mean confidence: {report['mean_confidence']:.2f}")
+    cache = report['cache']
+    if cache:
+        print(f"Cache hit rate: {cache.get('hit_rate', 0):.1%}")
+    digits = report['digits']
+    tiers = ", ".join(f"tier {tier}: {count}" for tier, count in sorted(digits['tiers'].items(), reverse=True))
+    print(f"Digit recognizer: {digits['hits']} hits, {digits['fallbacks']} fallbacks, "
+          f"{digits['escalations']} escalated ({tiers})")
+    print("Note: synthetic glyphs are Hershey fonts" + (" with blur/JPEG augmentation" if report['augmented'] else "") +
+          ", not the Fortnite HUD font; accuracy here does not reflect accuracy on the real HUD.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the vision agent on synthetic HUD frames")
+    parser.add_argument('--config', '-c', default='config.json')
+    parser.add_argument('--frames', '-n', type=int, default=300)
+    parser.add_argument('--fps', type=float, default=3.0, help="simulated capture rate (drives game time)")
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--noise', type=float, default=0.0, help="per-pixel noise std dev")
+    parser.add_argument('--no-augment', action='store_true',
+                        help="draw clean glyphs without scale jitter, blur or JPEG artifacts")
+    parser.add_argument('--resolution', default='1920x1080', help="synthetic screen size, WIDTHxHEIGHT")
+    parser.add_argument('--mode', choices=['batched', 'sequential'], default=None,
+                        help="override ocr.batch_mode")
+    parser.add_argument('--no-cache', action='store_true')
+    parser.add_argument('--no-schedule', action='store_true', help="read every field every frame")
+    parser.add_argument('--no-easyocr', action='store_true', help="digit recognizer only")
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default=None, help="override ocr.backend")
+    parser.add_argument('--json', metavar='PATH', help="write the report as JSON")
+    parser.add_argument('--min-fps', type=float, default=0.0, help="fail below this FPS")
+    parser.add_argument('--min-accuracy', type=float, default=0.0, help="fail below this mean accuracy")
+    parser.add_argument('--debug', '-d', action='store_true')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.WARNING,
+                        format='%(asctime)s | %(levelname)7s | %(name)s | %(message)s', datefmt='%H:%M:%S')
+
+    with open(args.config, 'r') as f:
+        config = copy.deepcopy(json.load(f))
+    capture_config = config.setdefault('capture', {})
+    for key in ('record', 'replay'):
+        capture_config.pop(key, None)
+    ocr_config = config.setdefault('ocr', {})
+    ocr_config['gpu'] = False
+    ocr_config['digit_templates'] = None  # never read or write the user's learned templates
+    ocr_config['background_load'] = False  # measure with the model in place from the first frame
+    if args.backend:
+        ocr_config['backend'] = args.backend
+    backend = ocr_config.get('backend', 'easyocr')
+    if args.no_easyocr or not backend_available(backend):
+        if not args.no_easyocr:
+            print(f"OCR backend '{backend}' not installed: benchmarking the digit recognizer only")
+        ocr_config['fallback'] = False
+    if args.mode:
+        ocr_config['batch_mode'] = args.mode == 'batched'
+    if args.no_cache:
+        config.setdefault('cache', {})['enabled'] = False
+    if args.no_schedule:
+        config.setdefault('schedule', {})['enabled'] = False
+
+    size = tuple(int(v) for v in args.resolution.lower().split('x'))
+    report = run_benchmark(config, args.frames, args.fps, args.seed, args.noise, size=size,
+                           augment=not args.no_augment)
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    failures = []
+    if report['fps'] < args.min_fps:
+        failures.append(f"FPS {report['fps']:.1f} < {args.min_fps}")
+    if report['mean_accuracy'] < args.min_accuracy:
+        failures.append(f"accuracy {report['mean_accuracy']:.1%} < {args.min_accuracy:.1%}")
+    if failures:
+        print("\nFAILED: " + ", ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
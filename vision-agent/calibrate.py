@@ -1,146 +1,485 @@
 #!/usr/bin/env python3
 """
 Fortnite Vision Agent Calibration Tool
-Interactive tool to calibrate UI region coordinates for your resolution.
+Interactive tool to calibrate UI region coordinates for your resolution,
+and an automatic pass that tightens them to the text they contain.
+
+Usage:
+    python calibrate.py
+    python calibrate.py --tighten screenshots/
+    python calibrate.py --tighten match.fnrec --samples 60 --dry-run
 """
 
 import sys
 import json
+import time
+import argparse
 import cv2
 import numpy as np
 from pathlib import Path
 from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
 import logging
 
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils.backends import backend_available
+from utils.capture import RegionFrame
+from utils.ocr import FortniteOCR
+from utils.recorder import MAGIC, ReplayCapture
+from utils.regions import FIELD_REGIONS, RegionPlan
+from utils.video import VideoCapture
+
 logging.basicConfig(level=logging.INFO, format='%(message)s')
 logger = logging.getLogger(__name__)
 
 
 class CalibrationTool:
-      """Interactive calibration tool for vision agent regions."""
+    """Interactive calibration tool for vision agent regions."""
 
     REGIONS = {
-              '1': ('hp', 'Health Points'),
-              '2': ('shield', 'Shield'),
-              '3': ('wood', 'Wood Materials'),
-              '4': ('brick', 'Brick Materials'),
-              '5': ('metal', 'Metal Materials'),
-              '6': ('storm_timer', 'Storm Timer'),
-              '7': ('storm_phase', 'Storm Phase'),
-              '8': ('player_count', 'Alive Players'),
-              '9': ('surge_warning', 'Surge Warning'),
-              '0': ('elimination_count', 'Eliminations'),
+        '1': ('hp', 'Health Points'),
+        '2': ('shield', 'Shield'),
+        '3': ('wood', 'Wood Materials'),
+        '4': ('brick', 'Brick Materials'),
+        '5': ('metal', 'Metal Materials'),
+        '6': ('storm_timer', 'Storm Timer'),
+        '7': ('storm_phase', 'Storm Phase'),
+        '8': ('player_count', 'Alive Players'),
+        '9': ('surge_warning', 'Surge Warning'),
+        '0': ('elimination_count', 'Eliminations'),
     }
 
     COLORS = {
-              'hp': (0, 255, 0), 'shield': (255, 200, 0),
-              'wood': (0, 150, 255), 'brick': (0, 100, 200), 'metal': (200, 200, 200),
-              'storm_timer': (255, 0, 255), 'storm_phase': (255, 100, 255),
-              'player_count': (0, 255, 255), 'surge_warning': (0, 0, 255),
-              'elimination_count': (255, 255, 0),
+        'hp': (0, 255, 0), 'shield': (255, 200, 0),
+        'wood': (0, 150, 255), 'brick': (0, 100, 200), 'metal': (200, 200, 200),
+        'storm_timer': (255, 0, 255), 'storm_phase': (255, 100, 255),
+        'player_count': (0, 255, 255), 'surge_warning': (0, 0, 255),
+        'elimination_count': (255, 255, 0),
     }
 
     def __init__(self):
-              self.screenshot = None
-              self.display_image = None
-              self.regions = {}
-              self.selecting = False
-              self.start_point = None
-              self.end_point = None
-              self.window_name = "Fortnite Vision Agent Calibration"
+        self.screenshot = None
+        self.display_image = None
+        self.regions = {}
+        self.selecting = False
+        self.start_point = None
+        self.end_point = None
+        self.window_name = "Fortnite Vision Agent Calibration"
 
     def capture_screenshot(self) -> bool:
-              try:
-                            import bettercam
-                            camera = bettercam.create(output_color="BGR")
-                            frame = camera.grab()
-                            camera.release()
-                            if frame is not None:
-                                              self.screenshot = frame.copy()
-                                              self.display_image = frame.copy()
-                                              logger.info(f"Screenshot captured: {frame.shape[1]}x{frame.shape[0]}")
-                                              return True
-                                          return False
-except ImportError:
+        try:
+            import bettercam
+            camera = bettercam.create(output_color="BGR")
+            frame = camera.grab()
+            camera.release()
+            if frame is not None:
+                self.screenshot = frame.copy()
+                self.display_image = frame.copy()
+                logger.info(f"Screenshot captured: {frame.shape[1]}x{frame.shape[0]}")
+                return True
+            return False
+        except ImportError:
             logger.error("BetterCam not installed. Run: pip install bettercam")
             return False
 
     def mouse_callback(self, event, x, y, flags, param):
-              if event == cv2.EVENT_LBUTTONDOWN:
-                            self.selecting = True
-                            self.start_point = (x, y)
-                            self.end_point = (x, y)
-elif event == cv2.EVENT_MOUSEMOVE and self.selecting:
+        if event == cv2.EVENT_LBUTTONDOWN:
+            self.selecting = True
+            self.start_point = (x, y)
+            self.end_point = (x, y)
+        elif event == cv2.EVENT_MOUSEMOVE and self.selecting:
             self.end_point = (x, y)
             self._update_display()
-elif event == cv2.EVENT_LBUTTONUP:
+        elif event == cv2.EVENT_LBUTTONUP:
             self.selecting = False
             self.end_point = (x, y)
             self._update_display()
 
     def _update_display(self):
-              self.display_image = self.screenshot.copy()
-              for name, region in self.regions.items():
-                            color = self.COLORS.get(name, (255, 255, 255))
-                            x, y, w, h = region['x'], region['y'], region['width'], region['height']
-                            cv2.rectangle(self.display_image, (x, y), (x+w, y+h), color, 2)
-                            cv2.putText(self.display_image, name, (x, y-5), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
-                        if self.start_point and self.end_point:
-                                      cv2.rectangle(self.display_image, self.start_point, self.end_point, (0, 255, 0), 2)
+        self.display_image = self.screenshot.copy()
+        for name, region in self.regions.items():
+            color = self.COLORS.get(name, (255, 255, 255))
+            x, y, w, h = region['x'], region['y'], region['width'], region['height']
+            cv2.rectangle(self.display_image, (x, y), (x+w, y+h), color, 2)
+            cv2.putText(self.display_image, name, (x, y-5), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
+        if self.start_point and self.end_point:
+            cv2.rectangle(self.display_image, self.start_point, self.end_point, (0, 255, 0), 2)
 
     def assign_region(self, key: str):
-              if not self.start_point or not self.end_point or key not in self.REGIONS:
-                            return
-                        name, desc = self.REGIONS[key]
+        if not self.start_point or not self.end_point or key not in self.REGIONS:
+            return
+        name, desc = self.REGIONS[key]
         x1, y1 = self.start_point
         x2, y2 = self.end_point
         self.regions[name] = {
-                      'x': min(x1, x2), 'y': min(y1, y2),
-                      'width': abs(x2 - x1), 'height': abs(y2 - y1)
+            'x': min(x1, x2), 'y': min(y1, y2),
+            'width': abs(x2 - x1), 'height': abs(y2 - y1)
         }
         logger.info(f"Assigned: {name}")
         self.start_point = self.end_point = None
         self._update_display()
 
     def save_config(self, path: str = "config.json"):
-              config = {'regions': {}}
+        config = {'regions': {}}
         materials = {}
         for name, region in self.regions.items():
-                      if name in ['wood', 'brick', 'metal']:
-                                        materials[name] = region
-else:
+            if name in ['wood', 'brick', 'metal']:
+                materials[name] = region
+            else:
                 config['regions'][name] = region
-          if materials:
-                        config['regions']['materials'] = materials
-                    with open(path, 'w') as f:
-                                  json.dump(config, f, indent=2)
-                              logger.info(f"Saved to {path}")
+        if materials:
+            config['regions']['materials'] = materials
+        if self.screenshot is not None:
+            # Regions are drawn in screenshot pixels; the agent scales them to other resolutions
+            config['capture'] = {'base_resolution': [self.screenshot.shape[1], self.screenshot.shape[0]]}
+        with open(path, 'w') as f:
+            json.dump(config, f, indent=2)
+        logger.info(f"Saved to {path}")
 
     def run(self):
-              logger.info("FORTNITE VISION AGENT CALIBRATION")
+        logger.info("FORTNITE VISION AGENT CALIBRATION")
         if not self.capture_screenshot():
-                      return
-                  cv2.namedWindow(self.window_name, cv2.WINDOW_NORMAL)
+            return
+        cv2.namedWindow(self.window_name, cv2.WINDOW_NORMAL)
         cv2.setMouseCallback(self.window_name, self.mouse_callback)
         self._update_display()
         while True:
-                      cv2.imshow(self.window_name, self.display_image)
-                      key = cv2.waitKey(1) & 0xFF
-                      if chr(key) in self.REGIONS:
-                                        self.assign_region(chr(key))
-elif key == ord('s'):
+            cv2.imshow(self.window_name, self.display_image)
+            key = cv2.waitKey(1) & 0xFF
+            if chr(key) in self.REGIONS:
+                self.assign_region(chr(key))
+            elif key == ord('s'):
                 self.save_config()
-elif key == ord('r'):
+            elif key == ord('r'):
                 self.start_point = self.end_point = None
                 self._update_display()
-elif key == ord('q') or key == 27:
+            elif key == ord('q') or key == 27:
                 break
         cv2.destroyAllWindows()
 
 
+IMAGE_SUFFIXES = {'.png', '.jpg', '.jpeg', '.bmp'}
+
+
+def load_sample_frames(paths: List[str], samples: int = 30) -> List[Any]:
+    """Up to samples frames, evenly spread, from screenshots, one recording or one video."""
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(sorted(f for f in path.iterdir() if f.suffix.lower() in IMAGE_SUFFIXES))
+        else:
+            files.append(path)
+    images = [f for f in files if f.suffix.lower() in IMAGE_SUFFIXES]
+    if images:
+        step = len(images) / min(samples, len(images))
+        picked = [images[int(i * step)] for i in range(min(samples, len(images)))]
+        return [frame for frame in (cv2.imread(str(f)) for f in picked) if frame is not None]
+    if len(files) != 1:
+        raise ValueError("Pass screenshots, or a single recording or video")
+
+    source = str(files[0])
+    with open(source, 'rb') as f:
+        is_recording = f.read(len(MAGIC)) == MAGIC
+    frames = []
+    if is_recording:
+        capture = ReplayCapture(source, realtime=False)
+        if not capture.initialize():
+            return []
+        step = max(len(capture) // samples, 1)
+        for index in range(len(capture)):
+            frame = capture.capture()
+            if index % step or len(frames) >= samples:
+                continue
+            if isinstance(frame, RegionFrame):
+                frame = RegionFrame(frame.boxes, [image.copy() for image in frame.images], frame.screen_size)
+            else:
+                frame = frame.copy()
+            frames.append(frame)
+    else:
+        with VideoCapture(source) as probe:
+            duration = probe.duration
+        capture = VideoCapture(source, sample_fps=samples / max(duration, 1e-3))
+        while len(frames) < samples:
+            frame = capture.capture()
+            if frame is None:
+                break
+            frames.append(frame)
+    capture.release()
+    return frames
+
+
+class RegionTightener:
+    """
+    Shrinks each configured region to the text it holds across sample
+    frames (tight bounding box plus a margin, and a glyph of slack either
+    side for numbers that grow), then picks the smallest downscale that
+    still reads the same values. A region is only changed when the new
+    crop agrees with the original reads on min_agreement of the samples.
+    """
+
+    SCALES = (1.0, 0.75, 0.5, 0.35)
+
+    def __init__(self, config: Dict[str, Any], margin: float = 0.25, glyph_slack: float = 1.0,
+                 min_text_height: int = 12, min_agreement: float = 0.98, repeats: int = 3):
+        self.config = config
+        self.base_resolution = config.get('capture', {}).get('base_resolution')
+        self.margin = margin
+        self.glyph_slack = glyph_slack
+        self.min_text_height = min_text_height
+        self.min_agreement = min_agreement
+        self.repeats = repeats
+        self.ocr = FortniteOCR.from_config(config)
+        if self.ocr.digits is not None:
+            self.ocr.digits.templates_path = None  # measuring, not learning
+        self._keywords = config.get('detection', {}).get('surge_keywords', ['SURGE', 'DAMAGE'])
+
+    def run(self, frames: List[Any]) -> List[Dict[str, Any]]:
+        frame_size = self._frame_size(frames[0])
+        usable = [frame for frame in frames if self._frame_size(frame) == frame_size]
+        if len(usable) < len(frames):
+            logger.warning(f"Ignoring {len(frames) - len(usable)} samples not at {frame_size[0]}x{frame_size[1]}")
+        plan = RegionPlan.compile(self.config.get('regions', {}), frame_size, self.base_resolution)
+        self.ocr.initialize(warmup_shapes=plan.roi_shapes)
+        # Measured on unscaled crops; the current scale only counts for the "before" cost
+        unscaled = RegionPlan(tuple(region._replace(scale=1.0) for region in plan.regions), frame_size)
+        crops = [[] for _ in plan.regions]
+        for frame in usable:
+            bound = unscaled.bind(frame.boxes) if isinstance(frame, RegionFrame) else None
+            for index in range(len(unscaled)):
+                crop = unscaled.view(frame, index, bound)
+                if crop is not None:
+                    crops[index].append(np.ascontiguousarray(crop))
+        return [self._tighten(plan, index, crops[index]) for index in range(len(plan))]
+
+    def apply(self, results: List[Dict[str, Any]]) -> int:
+        """Write the changed regions into config; returns how many changed."""
+        paths = {name: path for name, path, _ in FIELD_REGIONS}
+        changed = 0
+        for result in results:
+            if result['region'] is None:
+                continue
+            target = self.config['regions']
+            path = paths[result['field']]
+            for key in path[:-1]:
+                target = target[key]
+            target[path[-1]] = result['region']
+            changed += 1
+        return changed
+
+    def _tighten(self, plan: RegionPlan, index: int, crops: List[np.ndarray]) -> Dict[str, Any]:
+        region = plan.regions[index]
+        height, width = plan.roi_shape(index)
+        result = {'field': region.field, 'name': region.name, 'region': None, 'scale': region.scale,
+                  'pixels': (height * width, height * width), 'ms': (0.0, 0.0), 'agreement': None, 'note': ''}
+        if not crops:
+            result['note'] = 'not in the samples'
+            return result
+
+        found = self._text_box(region.kind, crops)
+        if found is None:
+            result['note'] = 'no text seen'
+            return result
+        (x0, y0, x1, y1), text_height = found
+        tight = [crop[y0:y1, x0:x1] for crop in crops]
+        reference = [self._read(region, crop) for crop in crops]
+        agreement = self._agreement(region.kind, reference, [self._read(region, crop) for crop in tight])
+        result['agreement'] = agreement
+        if agreement < self.min_agreement:
+            result['note'] = 'tight crop reads differently; kept'
+            return result
+
+        scale = 1.0
+        if region.kind != 'surge':
+            for candidate in self.SCALES[1:]:
+                if text_height * candidate < self.min_text_height:
+                    break
+                scaled = [self._scale(crop, candidate) for crop in tight]
+                if self._agreement(region.kind, reference, [self._read(region, crop) for crop in scaled]) \
+                        < self.min_agreement:
+                    break
+                scale = candidate
+
+        before = self._cost(region, crops, region.scale)
+        after = self._cost(region, tight, scale)
+        scaled_shape = self._scale(tight[0], scale).shape
+        result.update(
+            region=self._to_config(region, (region.box[0] + x0, region.box[1] + y0, x1 - x0, y1 - y0),
+                                   plan.frame_size, scale),
+            scale=scale,
+            pixels=(result['pixels'][0], scaled_shape[0] * scaled_shape[1]),
+            ms=(before, after)
+        )
+        return result
+
+    def _text_box(self, kind: str, crops: List[np.ndarray]) -> Optional[Tuple[Tuple[int, int, int, int], float]]:
+        """Union of per-sample glyph boxes in crop pixels, padded, and the median text height."""
+        boxes = []
+        heights = []
+        for crop in crops:
+            if kind == 'surge':
+                if not self.ocr.surge_gate_open(crop):
+                    continue  # the banner is only there during a surge
+                ink = self.ocr.preprocess_surge_warning(crop, 'tighten')
+            else:
+                ink = self.ocr.preprocess_for_numbers(crop, 'tighten')
+            count, _, stats, _ = cv2.connectedComponentsWithStats(ink, connectivity=8)
+            if count <= 1:
+                continue
+            parts = stats[1:]
+            # Glyphs are about the same height; specks and stray pixels are not
+            parts = parts[(parts[:, cv2.CC_STAT_HEIGHT] >= parts[:, cv2.CC_STAT_HEIGHT].max() * 0.5)
+                          & (parts[:, cv2.CC_STAT_AREA] >= 4)]
+            x0, y0 = parts[:, cv2.CC_STAT_LEFT].min(), parts[:, cv2.CC_STAT_TOP].min()
+            x1 = (parts[:, cv2.CC_STAT_LEFT] + parts[:, cv2.CC_STAT_WIDTH]).max()
+            y1 = (parts[:, cv2.CC_STAT_TOP] + parts[:, cv2.CC_STAT_HEIGHT]).max()
+            boxes.append((x0, y0, x1, y1))
+            heights.append(y1 - y0)
+        if not boxes:
+            return None
+        boxes = np.array(boxes)
+        text_height = float(np.median(heights))
+        pad = max(2, int(round(self.margin * text_height)))
+        slack = 0 if kind == 'surge' else int(round(self.glyph_slack * 0.6 * text_height))
+        height, width = crops[0].shape[:2]
+        return ((max(int(boxes[:, 0].min()) - pad - slack, 0), max(int(boxes[:, 1].min()) - pad, 0),
+                 min(int(boxes[:, 2].max()) + pad + slack, width), min(int(boxes[:, 3].max()) + pad, height)),
+                text_height)
+
+    def _read(self, region, crop: np.ndarray):
+        """What the extractor reads from crop; None when it is unsure."""
+        if region.kind == 'surge':
+            return self.ocr.detect_surge_warning(crop, self._keywords, region=region.name)['detected']
+        # Only confident digit reads count; a low-confidence best guess would make noise look like change
+        value = self.ocr.read_digits(crop, region.kind, region=region.name)
+        if value is None and self.ocr.fallback and self.ocr.ready:
+            value = self._read_full(region, crop)
+        return value
+
+    def _read_full(self, region, crop: np.ndarray):
+        if region.kind == 'surge':
+            return self.ocr.detect_surge_warning(crop, self._keywords, region=region.name)
+        if region.kind == 'time':
+            return self.ocr.read_time(crop, region=region.name)
+        return self.ocr.read_number(crop, region=region.name)
+
+    @staticmethod
+    def _agreement(kind: str, reference: List[Any], reads: List[Any]) -> float:
+        # Samples the original crop could not read say nothing either way
+        pairs = [(a, b) for a, b in zip(reference, reads) if a is not None]
+        if not pairs:
+            return 0.0
+        return sum(a == b for a, b in pairs) / len(pairs)
+
+    @staticmethod
+    def _scale(crop: np.ndarray, scale: float) -> np.ndarray:
+        if scale >= 1.0:
+            return crop
+        return cv2.resize(crop, (max(int(round(crop.shape[1] * scale)), 1), max(int(round(crop.shape[0] * scale)), 1)),
+                          interpolation=cv2.INTER_AREA)
+
+    def _cost(self, region, crops: List[np.ndarray], scale: float) -> float:
+        """Mean ms per frame to downscale, preprocess and read this region, as the extractor does."""
+        started = time.perf_counter()
+        for _ in range(self.repeats):
+            for crop in crops:
+                self._read_full(region, self._scale(crop, scale))
+        return (time.perf_counter() - started) * 1000.0 / (self.repeats * len(crops))
+
+    def _to_config(self, region, box: Tuple[int, int, int, int], frame_size: Tuple[int, int],
+                   scale: float) -> Dict[str, Any]:
+        """A pixel box on the sample frames in the units the region was configured in."""
+        path = {name: path for name, path, _ in FIELD_REGIONS}[region.field]
+        original = self.config['regions']
+        for key in path:
+            original = original[key]
+        x, y, w, h = box
+        values = [original.get(k, 0) for k in ('x', 'y', 'width', 'height')]
+        if all(isinstance(v, float) and 0.0 <= v <= 1.0 for v in values):
+            converted = [round(x / frame_size[0], 5), round(y / frame_size[1], 5),
+                         round(w / frame_size[0], 5), round(h / frame_size[1], 5)]
+        else:
+            sx, sy = (self.base_resolution[0] / frame_size[0], self.base_resolution[1] / frame_size[1]) \
+                if self.base_resolution else (1.0, 1.0)
+            converted = [int(np.floor(x * sx)), int(np.floor(y * sy)),
+                         int(np.ceil(w * sx)), int(np.ceil(h * sy))]
+        updated = dict(original, x=converted[0], y=converted[1], width=converted[2], height=converted[3])
+        updated.pop('scale', None)
+        if scale < 1.0:
+            updated['scale'] = scale
+        return updated
+
+    @staticmethod
+    def _frame_size(frame) -> Tuple[int, int]:
+        if isinstance(frame, RegionFrame):
+            return tuple(frame.screen_size)
+        return (frame.shape[1], frame.shape[0])
+
+
+def print_tighten_report(results: List[Dict[str, Any]]):
+    print(f"{'region':<18}{'px before':>10}{'px after':>10}{'scale':>7}{'ms before':>11}{'ms after':>10}"
+          f"{'agree':>8}  note")
+    for r in results:
+        agreement = f"{r['agreement']:.0%}" if r['agreement'] is not None else '-'
+        print(f"{r['name']:<18}{r['pixels'][0]:>10}{r['pixels'][1]:>10}{r['scale']:>7.2f}"
+              f"{r['ms'][0]:>11.3f}{r['ms'][1]:>10.3f}{agreement:>8}  {r['note']}")
+    before = sum(r['pixels'][0] for r in results)
+    after = sum(r['pixels'][1] for r in results)
+    ms_before = sum(r['ms'][0] for r in results if r['region'] is not None)
+    ms_after = sum(r['ms'][1] for r in results if r['region'] is not None)
+    print(f"\nOCR pixels per frame: {before} -> {after} ({after / before:.0%})" if before else "")
+    print(f"Changed regions, ms per frame: {ms_before:.2f} -> {ms_after:.2f}")
+
+
+def tighten_regions(args) -> int:
+    with open(args.config) as f:
+        config = json.load(f)
+    if not config.get('regions'):
+        logger.error(f"No regions in {args.config}; calibrate them first")
+        return 1
+    ocr_config = config.setdefault('ocr', {})
+    if not backend_available(ocr_config.get('backend', 'easyocr')):
+        logger.warning("OCR backend not installed: verifying with the digit recognizer only")
+        config = dict(config, ocr=dict(ocr_config, fallback=False))
+
+    frames = load_sample_frames(args.tighten, args.samples)
+    if not frames:
+        logger.error("No sample frames could be read")
+        return 1
+    logger.info(f"Tightening regions over {len(frames)} samples")
+    tightener = RegionTightener(config, margin=args.margin, min_agreement=args.min_agreement)
+    results = tightener.run(frames)
+    tightener.ocr.release()
+    print_tighten_report(results)
+
+    if args.dry_run:
+        return 0
+    with open(args.config) as f:
+        saved = json.load(f)  # write back the file as it was, not the verification overrides
+    tightener.config = saved
+    changed = tightener.apply(results)
+    with open(args.config, 'w') as f:
+        json.dump(saved, f, indent=2)
+    logger.info(f"Saved {changed} tightened regions to {args.config}")
+    return 0
+
+
 def run_calibration():
-      CalibrationTool().run()
+    parser = argparse.ArgumentParser(description="Fortnite Vision Agent calibration")
+    parser.add_argument('--tighten', nargs='+', metavar='PATH',
+                        help="shrink the configured regions to their text, using screenshots, a recording or a video")
+    parser.add_argument('--config', '-c', default='config.json')
+    parser.add_argument('--samples', type=int, default=30, help="sample frames to use")
+    parser.add_argument('--margin', type=float, default=0.25, help="padding around the text, in text heights")
+    parser.add_argument('--min-agreement', type=float, default=0.98,
+                        help="share of samples a changed region must read the same as before")
+    parser.add_argument('--dry-run', action='store_true', help="report without saving")
+    args = parser.parse_args()
+    if args.tighten:
+        return tighten_regions(args)
+    CalibrationTool().run()
+    return 0
 
 
 if __name__ == "__main__":
-      run_calibration()
+    sys.exit(run_calibration())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Fortnite Vision Agent ONNX Export
+Exports EasyOCR's detector and recognizer to ONNX and quantizes them to
+int8 for the "onnx" OCR backend. Needs easyocr (with torch), onnx and
+onnxruntime once, on any machine; the agent then only needs onnxruntime.
+
+Usage:
+    python export_onnx.py
+    python export_onnx.py --out models --no-detector
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+import logging
+
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
+
+
+def export_recognizer(reader, path: Path, height: int = 64):
+    import torch
+
+    class Recognizer(torch.nn.Module):
+        # EasyOCR's CTC models take an unused text argument
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, image):
+            return self.model(image, None)
+
+    model = Recognizer(getattr(reader.recognizer, 'module', reader.recognizer)).eval()
+    dummy = torch.zeros(1, 1, height, 256)
+    torch.onnx.export(model, dummy, str(path), input_names=['image'], output_names=['logits'],
+                      dynamic_axes={'image': {0: 'batch', 3: 'width'}, 'logits': {0: 'batch', 1: 'steps'}},
+                      opset_version=17)
+
+
+def export_detector(reader, path: Path):
+    import torch
+
+    class Detector(torch.nn.Module):
+        # CRAFT returns (score maps, features); only the score maps are used
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, image):
+            return self.model(image)[0]
+
+    model = Detector(getattr(reader.detector, 'module', reader.detector)).eval()
+    dummy = torch.zeros(1, 3, 320, 640)
+    torch.onnx.export(model, dummy, str(path), input_names=['image'], output_names=['scores'],
+                      dynamic_axes={'image': {0: 'batch', 2: 'height', 3: 'width'},
+                                    'scores': {0: 'batch', 1: 'rows', 2: 'cols'}},
+                      opset_version=17)
+
+
+def quantize(source: Path, target: Path):
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+    quantize_dynamic(str(source), str(target), weight_type=QuantType.QInt8)
+    logger.info(f"  {target.name}: {source.stat().st_size / 1e6:.1f} MB -> {target.stat().st_size / 1e6:.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export EasyOCR models for the ONNX OCR backend")
+    parser.add_argument('--out', default='models', help="output directory")
+    parser.add_argument('--languages', nargs='+', default=['en'])
+    parser.add_argument('--name', default='english_g2', help="recognizer file name")
+    parser.add_argument('--no-detector', action='store_true',
+                        help="recognizer only; HUD tiles are split by projection instead")
+    parser.add_argument('--fp32', action='store_true', help="skip int8 quantization")
+    args = parser.parse_args()
+
+    try:
+        import easyocr
+    except ImportError:
+        logger.error("Exporting needs easyocr and torch. Run: pip install easyocr onnx onnxruntime")
+        return 1
+    out = Path(args.out)
+    out.mkdir(parents=True, exist_ok=True)
+    # quantize=False: torch's own dynamic quantization does not export to ONNX
+    reader = easyocr.Reader(args.languages, gpu=False, quantize=False, verbose=False)
+
+    models = [(args.name, export_recognizer)]
+    if not args.no_detector:
+        models.append(('craft', export_detector))
+    for name, export in models:
+        fp32 = out / f"{name}.onnx"
+        logger.info(f"Exporting {fp32}")
+        export(reader, fp32)
+        final = fp32
+        if not args.fp32:
+            final = out / f"{name}_int8.onnx"
+            quantize(fp32, final)
+        if export is export_recognizer:
+            with open(final.with_suffix('.json'), 'w') as f:
+                json.dump({'charset': reader.character, 'input_height': 64}, f)
+            recognizer = final
+        else:
+            detector = final
+
+    logger.info("Set in config.json:")
+    logger.info(f'  "ocr": {{"backend": "onnx", "onnx": {{"recognizer": "{recognizer.as_posix()}", '
+                f'"detector": {json.dumps(None if args.no_detector else detector.as_posix())}}}}}')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -25,91 +25,245 @@ from utils.capture import FastCapture, AdaptiveCapture
 from utils.ocr import FortniteOCR
 from utils.extractor import StateExtractor, GameState
 from utils.bridge import VisionBridge, MockBridge
+from utils.pipeline import StatePipeline
+from utils.tracker import StateTracker
+from utils.metrics import MetricsRegistry, MetricsServer
+from utils.governor import ResourceGovernor
+from utils.multistream import MultiStreamExtractor
+from utils.events import EventDetector
 
 def setup_logging(debug: bool = False):
-      level = logging.DEBUG if debug else logging.INFO
-      logging.basicConfig(level=level, format='%(asctime)s | %(levelname)7s | %(name)s | %(message)s', datefmt='%H:%M:%S')
+    level = logging.DEBUG if debug else logging.INFO
+    logging.basicConfig(level=level, format='%(asctime)s | %(levelname)7s | %(name)s | %(message)s', datefmt='%H:%M:%S')
 
 logger = logging.getLogger(__name__)
 
 class VisionAgent:
-      def __init__(self, config_path: str = "config.json", test_mode: bool = False):
-                self.config = self._load_config(config_path)
-                self.test_mode = test_mode
-                self.extractor = StateExtractor(self.config)
-                if test_mode:
-                              self.bridge = MockBridge()
-else:
+    def __init__(self, config_path: str = "config.json", test_mode: bool = False, mode: Optional[str] = None,
+                 record: Optional[str] = None, replay: Optional[str] = None, replay_fast: bool = False):
+        self.config = self._load_config(config_path)
+        capture_config = self.config.setdefault('capture', {})
+        if record:
+            capture_config['record'] = record
+        if replay:
+            capture_config['replay'] = replay
+            capture_config['replay_realtime'] = not replay_fast
+        self.test_mode = test_mode
+        self.mode = mode or self.config.get('pipeline', {}).get('mode', 'serial')
+        metrics_config = self.config.get('metrics', {})
+        self.metrics = MetricsRegistry() if metrics_config.get('enabled', True) else None
+        self.metrics_server = None
+        if self.metrics is not None and metrics_config.get('http_port'):
+            self.metrics_server = MetricsServer(self.metrics, host=metrics_config.get('host', '127.0.0.1'),
+                                                port=metrics_config['http_port'])
+        self.stats_interval = metrics_config.get('stats_interval', 10.0)
+        self._last_stats = 0.0
+        self.streams = None
+        self.tracker = None
+        if self.config.get('streams'):
+            # Squad mode: one extractor per stream around a shared OCR engine
+            self.streams = MultiStreamExtractor(self.config, metrics=self.metrics)
+            self.streams.on_readiness = self._on_readiness
+            self.extractor = self.streams
+        else:
+            self.extractor = StateExtractor(self.config, metrics=self.metrics)
+            self.extractor.on_readiness = self._on_readiness
+            tracker_config = self.config.get('tracker', {})
+            if tracker_config.get('enabled', True):
+                self.tracker = StateTracker(tracker_config, scheduler=self.extractor.scheduler)
+        if test_mode:
+            self.bridge = MockBridge()
+        else:
             ws_config = self.config.get('websocket', {})
-              self.bridge = VisionBridge(host=ws_config.get('host', 'localhost'), port=ws_config.get('port', 8765))
+            self.bridge = VisionBridge(
+                host=ws_config.get('host', 'localhost'),
+                port=ws_config.get('port', 8765),
+                reconnect_delay=ws_config.get('reconnect_delay', 1.0),
+                max_reconnect_delay=ws_config.get('max_reconnect_delay', 30.0),
+                queue_size=ws_config.get('queue_size', 100),
+                wire_format=ws_config.get('wire_format', 'json'),
+                keyframe_interval=ws_config.get('keyframe_interval', 30),
+                event_ttl=ws_config.get('event_ttl', 10.0),
+                metrics=self.metrics
+            )
+        events_config = self.config.get('events', {})
+        self.events = None
+        if events_config.get('enabled', True):
+            self.events = EventDetector(events_config, bridge=self.bridge, metrics=self.metrics)
+        performance_config = self.config.get('performance', {})
+        self.governor = None
+        if self.streams is not None:
+            if performance_config.get('governor', True):
+                logger.info("Resource governor is not used with multiple streams")
+        elif performance_config.get('governor', True):
+            self.governor = ResourceGovernor(performance_config, self.extractor,
+                                             bridge=self.bridge, metrics=self.metrics)
         self._running = False
         self._last_state = None
         self._state_count = 0
         self._start_time = 0
-        self._fps_samples = []
         signal.signal(signal.SIGINT, self._handle_shutdown)
         signal.signal(signal.SIGTERM, self._handle_shutdown)
 
     def _load_config(self, config_path: str) -> dict:
-              try:
-                            with open(config_path, 'r') as f:
-                                              return json.load(f)
-                                      except:
-                            return {"capture": {"target_fps": 3}, "websocket": {"host": "localhost", "port": 8765}, "ocr": {"gpu": True}, "regions": {}}
+        try:
+            with open(config_path, 'r') as f:
+                return json.load(f)
+        except:
+            return {"capture": {"target_fps": 3}, "websocket": {"host": "localhost", "port": 8765}, "ocr": {"gpu": True}, "regions": {}}
 
     def _handle_shutdown(self, signum, frame):
-              self._running = False
+        self._running = False
 
     def start(self) -> bool:
-              logger.info("=" * 50)
+        logger.info("=" * 50)
         logger.info("FORTNITE IGL VISION AGENT - 100% FREE Local AI")
         logger.info("=" * 50)
+        started = time.time()
         if not self.extractor.initialize():
-                      return False
-                  if not self.test_mode:
-                                self.bridge.connect()
-                            self._running = True
+            return False
+        if not self.test_mode:
+            self.bridge.connect()
+        readiness = self.extractor.readiness()
+        logger.info(f"Extractor up in {time.time() - started:.1f}s ({readiness['status']}, OCR {readiness['ocr']})")
+        self.bridge.send_event('readiness', readiness)
+        if self.metrics_server is not None:
+            self.metrics_server.start()
+        if self.governor is not None:
+            self.governor.start()
+        self._running = True
         self._start_time = time.time()
         return True
 
     def run(self):
-              if not self.start():
-                            return
-                        target_fps = self.config.get('capture', {}).get('target_fps', 3)
-        frame_time = 1.0 / target_fps
+        if not self.start():
+            return
         try:
-                      while self._running:
-                                        loop_start = time.time()
-                                        state = self.extractor.extract_state()
-                                        if state:
-                                                              self._state_count += 1
-                                                              if self.bridge.is_connected:
-                                                                                        self.bridge.send_state(state.to_dict())
-                                                                                    if self._state_count % 30 == 0:
-                                                                                                              logger.info(f"HP:{state.hp} Shield:{state.shield} Mats:{state.total_mats} Alive:{state.alive_players}")
-                                                                                                      elapsed = time.time() - loop_start
-                                                          if elapsed < frame_time:
-                                                                                time.sleep(frame_time - elapsed)
+            if self.streams is not None:
+                self._run_streams()
+            elif self.mode == 'threaded':
+                self._run_pipelined()
+            else:
+                self._run_serial()
         except KeyboardInterrupt:
             pass
-finally:
+        finally:
             self.stop()
 
+    def _run_serial(self):
+        target_fps = self.config.get('capture', {}).get('target_fps', 3)
+        while self._running:
+            loop_start = time.time()
+            frame_time = getattr(self.extractor.capture, 'frame_time', 1.0 / target_fps)
+            state = self.extractor.extract_state()
+            if state is None and self.extractor.capture_exhausted:
+                logger.info("Replay finished")
+                break
+            if state and self.tracker is not None:
+                state = self.tracker.update(state, self.extractor.last_refreshed)
+            if state:
+                self._publish(state)
+                self._on_state(state)
+            elapsed = time.time() - loop_start
+            if elapsed < frame_time:
+                time.sleep(frame_time - elapsed)
+
+    def _run_streams(self):
+        target_fps = self.config.get('capture', {}).get('target_fps', 3)
+        frame_time = 1.0 / target_fps
+        while self._running:
+            loop_start = time.time()
+            states = self.streams.extract()
+            if not states and self.streams.capture_exhausted:
+                logger.info("Replay finished")
+                break
+            for state in states:
+                self._publish(state)
+                self._on_state(state)
+            elapsed = time.time() - loop_start
+            if elapsed < frame_time:
+                time.sleep(frame_time - elapsed)
+
+    def _run_pipelined(self):
+        pipeline_config = self.config.get('pipeline', {})
+        pipeline = StatePipeline(
+            self.extractor,
+            self.bridge,
+            target_fps=self.config.get('capture', {}).get('target_fps', 3),
+            queue_size=pipeline_config.get('queue_size', 1),
+            on_state=self._on_state,
+            tracker=self.tracker,
+            events=self.events,
+            lossless=getattr(self.extractor.capture, 'realtime', True) is False,
+            metrics=self.metrics
+        )
+        pipeline.start()
+        try:
+            while self._running:
+                time.sleep(0.2)
+                if self.extractor.capture_exhausted and pipeline.idle:
+                    logger.info("Replay finished")
+                    break
+        finally:
+            pipeline.stop()
+            logger.info(f"Pipeline stats: {pipeline.stats()}")
+
+    def _publish(self, state: GameState):
+        if self.events is None or self.events.process(state):
+            self.bridge.send_state(state)
+
+    def _on_state(self, state: GameState):
+        self._last_state = state
+        self._state_count += 1
+        if self._state_count % 30 == 0:
+            if self.streams is not None:
+                cache = self.streams.extractors[state.stream_id].cache_stats()
+            else:
+                cache = self.extractor.cache_stats()
+            stream = f"[{state.stream_id}] " if state.stream_id else ""
+            logger.info(f"{stream}HP:{state.hp} Shield:{state.shield} Mats:{state.total_mats} Alive:{state.alive_players} "
+                        f"Cache:{cache.get('hits', 0)}/{cache.get('misses', 0)}")
+        now = time.time()
+        if self.metrics is not None and self.stats_interval and now - self._last_stats >= self.stats_interval:
+            self._last_stats = now
+            self.bridge.send_event('stats', self.metrics.snapshot())
+
+    def _on_readiness(self, readiness: dict):
+        logger.info(f"Readiness: {readiness['status']} (OCR {readiness['ocr']})")
+        self.bridge.send_event('readiness', readiness)
+
     def stop(self):
-              self._running = False
+        self._running = False
+        if self.governor is not None:
+            self.governor.stop()
+            logger.info(f"Governor stats: {self.governor.stats()}")
+        if self.streams is not None:
+            logger.info(f"Multi-stream stats: {self.streams.stats()}")
+        elif self.extractor.pool is not None:
+            logger.info(f"OCR worker stats: {self.extractor.pool.stats()}")
+        if self.events is not None:
+            logger.info(f"Event stats: {self.events.stats()}")
         self.extractor.release()
         self.bridge.disconnect()
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+        logger.info(f"Bridge stats: {self.bridge.stats()}")
         logger.info("Vision Agent stopped")
 
 def main():
-      parser = argparse.ArgumentParser(description="Fortnite IGL Vision Agent")
+    parser = argparse.ArgumentParser(description="Fortnite IGL Vision Agent")
     parser.add_argument('--config', '-c', default='config.json')
     parser.add_argument('--test', '-t', action='store_true')
     parser.add_argument('--debug', '-d', action='store_true')
+    parser.add_argument('--mode', '-m', choices=['serial', 'threaded'], default=None)
+    parser.add_argument('--record', metavar='PATH', help="record captured frames to PATH")
+    parser.add_argument('--replay', metavar='PATH', help="use a recording as the frame source")
+    parser.add_argument('--replay-fast', action='store_true', help="replay as fast as possible instead of real time")
     args = parser.parse_args()
     setup_logging(args.debug)
-    agent = VisionAgent(config_path=args.config, test_mode=args.test)
+    agent = VisionAgent(config_path=args.config, test_mode=args.test, mode=args.mode,
+                        record=args.record, replay=args.replay, replay_fast=args.replay_fast)
     agent.run()
 
 if __name__ == "__main__":
-      main()
+    main()
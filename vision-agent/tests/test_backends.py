@@ -0,0 +1,31 @@
+import pytest
+
+from utils.backends import OCRBackend
+from utils.ocr import AGENT_DIR, FortniteOCR
+
+
+def onnx_config(**options):
+    return {'ocr': {'backend': 'onnx', 'digit_recognizer': False, 'onnx': options}}
+
+
+def test_relative_model_paths_resolve_against_the_agent_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    ocr = FortniteOCR.from_config(onnx_config(recognizer='models/rec.onnx', detector='models/det.onnx'))
+    assert ocr.backend_options['recognizer'] == str(AGENT_DIR / 'models' / 'rec.onnx')
+    assert ocr.backend_options['detector'] == str(AGENT_DIR / 'models' / 'det.onnx')
+
+
+def test_absolute_and_missing_model_paths_are_kept(tmp_path):
+    recognizer = str(tmp_path / 'rec.onnx')
+    ocr = FortniteOCR.from_config(onnx_config(recognizer=recognizer, detector=None))
+    assert ocr.backend_options['recognizer'] == recognizer
+    assert ocr.backend_options['detector'] is None
+
+
+def test_backend_must_implement_load_and_readtext():
+    class Partial(OCRBackend):
+        def load(self):
+            pass
+
+    with pytest.raises(TypeError):
+        Partial()
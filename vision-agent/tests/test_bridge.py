@@ -0,0 +1,122 @@
+import json
+
+import pytest
+
+from utils.bridge import VisionBridge
+from utils.state import GameState
+from utils.wire import StateDecoder, WIRE_FORMAT
+
+
+class FakeSocket:
+    def __init__(self):
+        self.text = []
+        self.binary = []
+
+    def send(self, payload):
+        self.text.append(payload)
+
+    def send_binary(self, payload):
+        self.binary.append(payload)
+
+
+class FailingSocket(FakeSocket):
+    """Raises on the nth text send, then behaves."""
+
+    def __init__(self, fail_at):
+        super().__init__()
+        self.fail_at = fail_at
+
+    def send(self, payload):
+        self.fail_at -= 1
+        if self.fail_at == 0:
+            raise ConnectionError("socket closed")
+        super().send(payload)
+
+
+def connected_bridge(wire_format='json'):
+    bridge = VisionBridge(wire_format=wire_format)
+    bridge.ws = FakeSocket()
+    bridge._connected = True
+    bridge.negotiated_format = wire_format
+    return bridge
+
+
+def test_send_state_reports_disconnected_bridge():
+    bridge = VisionBridge()
+    assert bridge.send_state(GameState(hp=50)) is False
+    bridge._connected = True
+    assert bridge.send_state(GameState(hp=60)) is True
+
+
+def test_send_event_reports_disconnected_bridge():
+    bridge = VisionBridge()
+    assert bridge.send_event('low_hp', {'hp': 20}) is False
+    bridge._connected = True
+    assert bridge.send_event('low_hp', {'hp': 10}) is True
+
+
+def test_failed_event_is_resent_first_after_reconnect():
+    bridge = connected_bridge()
+    bridge.ws = FailingSocket(fail_at=2)
+    for hp in (30, 20, 10):
+        bridge.send_event('low_hp', {'hp': hp})
+    with pytest.raises(ConnectionError):
+        bridge._flush()
+    bridge.ws = FakeSocket()
+    bridge._flush()
+    assert [json.loads(payload)['data']['hp'] for payload in bridge.ws.text] == [20, 10]
+    assert bridge.events_sent == 3
+
+
+def test_events_older_than_ttl_are_not_replayed():
+    bridge = connected_bridge()
+    bridge.event_ttl = 5.0
+    bridge.send_event('stats', {'fps': 60})
+    bridge._events[0]['timestamp'] -= 6.0
+    bridge.send_event('low_hp', {'hp': 10})
+    bridge._flush()
+    assert [json.loads(payload)['type'] for payload in bridge.ws.text] == ['low_hp']
+    assert bridge.events_expired == 1
+
+
+def test_full_event_queue_drops_the_oldest():
+    bridge = VisionBridge(queue_size=2)
+    for hp in (30, 20, 10):
+        bridge.send_event('low_hp', {'hp': hp})
+    assert [message['data']['hp'] for message in bridge._events] == [20, 10]
+    assert bridge.events_dropped == 1
+
+
+def test_states_are_coalesced_per_stream():
+    bridge = connected_bridge()
+    for hp in (10, 20, 30):
+        bridge.send_state(GameState(hp=hp, stream_id='a'))
+    bridge.send_state(GameState(hp=99, stream_id='b'))
+    bridge._flush()
+    sent = {message['data']['stream_id']: message['data']['hp']
+            for message in map(json.loads, bridge.ws.text)}
+    assert sent == {'a': 30, 'b': 99}
+    assert bridge.states_sent == 2
+    assert bridge.states_coalesced == 2
+
+
+def test_events_are_sent_before_states_and_not_coalesced():
+    bridge = connected_bridge()
+    bridge.send_event('low_hp', {'hp': 20})
+    bridge.send_event('low_hp', {'hp': 10})
+    bridge.send_state(GameState(hp=10))
+    bridge._flush()
+    types = [json.loads(payload)['type'] for payload in bridge.ws.text]
+    assert types == ['low_hp', 'low_hp', 'game_state']
+
+
+def test_binary_states_decode_per_stream():
+    bridge = connected_bridge(WIRE_FORMAT)
+    bridge.send_state(GameState(hp=70, wood=300, timestamp=1.0))
+    bridge._flush()
+    bridge.send_state(GameState(hp=65, wood=300, timestamp=2.0))
+    bridge._flush()
+    decoder = StateDecoder()
+    decoded = [decoder.decode(payload) for payload in bridge.ws.binary]
+    assert [state['hp'] for state, _ in decoded] == [70, 65]
+    assert decoded[1][0]['wood'] == 300
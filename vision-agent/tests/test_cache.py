@@ -0,0 +1,67 @@
+import cv2
+import numpy as np
+
+from utils.cache import RegionCache
+
+
+def render_value(text, size=(40, 20), background=60):
+    roi = np.full((size[1], size[0], 3), background, dtype=np.uint8)
+    # White glyphs with a dark outline, like the HUD
+    cv2.putText(roi, text, (1, size[1] - 4), cv2.FONT_HERSHEY_SIMPLEX, 0.45, (0, 0, 0), 3, cv2.LINE_AA)
+    cv2.putText(roi, text, (1, size[1] - 4), cv2.FONT_HERSHEY_SIMPLEX, 0.45, (255, 255, 255), 1, cv2.LINE_AA)
+    return roi
+
+
+def test_identical_roi_hits():
+    cache = RegionCache()
+    roi = render_value("145")
+    cache.store('wood', cache.fingerprint(roi), (145, 0.9))
+    assert cache.lookup('wood', cache.fingerprint(roi.copy())) == (True, (145, 0.9))
+
+
+def test_small_pixel_noise_hits():
+    cache = RegionCache(tolerance=3)
+    roi = render_value("300")
+    cache.store('brick', cache.fingerprint(roi), (300, 0.9))
+    noisy = np.clip(roi.astype(np.int16) + np.random.default_rng(0).integers(-2, 3, roi.shape), 0, 255)
+    hit, value = cache.lookup('brick', cache.fingerprint(noisy.astype(np.uint8)))
+    assert hit and value == (300, 0.9)
+
+
+def test_scenery_change_behind_the_text_hits():
+    cache = RegionCache()
+    cache.store('hp', cache.fingerprint(render_value("87", background=40)), (87, 0.9))
+    for background in (70, 90, 110):
+        assert cache.lookup('hp', cache.fingerprint(render_value("87", background=background))) == (True, (87, 0.9))
+
+
+def test_fingerprint_is_one_bit_a_pixel():
+    cache = RegionCache()
+    assert cache.fingerprint(render_value("145")).nbytes == 20 * 5
+
+
+def test_one_digit_change_is_a_miss():
+    for old, new in (("145", "148"), ("300", "380"), ("100", "101")):
+        cache = RegionCache()
+        cache.store('wood', cache.fingerprint(render_value(old)), (int(old), 1.0))
+        hit, value = cache.lookup('wood', cache.fingerprint(render_value(new)))
+        assert not hit, f"{old} -> {new} returned cached {value}"
+        assert value is None
+
+
+def test_resized_region_does_not_match_stale_entry():
+    cache = RegionCache()
+    cache.store('hp', cache.fingerprint(render_value("99")), (99, 1.0))
+    hit, _ = cache.lookup('hp', cache.fingerprint(render_value("99", size=(45, 25))))
+    assert not hit
+
+
+def test_lru_eviction_and_invalidate():
+    cache = RegionCache(max_entries=2)
+    for text in ("1", "2", "3"):
+        cache.store('metal', cache.fingerprint(render_value(text)), int(text))
+    assert cache.evictions == 1
+    assert cache.lookup('metal', cache.fingerprint(render_value("1")))[0] is False
+    assert cache.lookup('metal', cache.fingerprint(render_value("3"))) == (True, 3)
+    cache.invalidate('metal')
+    assert cache.lookup('metal', cache.fingerprint(render_value("3")))[0] is False
@@ -0,0 +1,127 @@
+import ctypes
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+from utils.capture import CapturePlan, FastCapture
+
+
+class FakeDuplicator:
+    def __init__(self):
+        self.updated = False
+        self.pending = None
+        self.texture = None
+
+    def update_frame(self):
+        self.updated = self.pending is not None
+        if self.updated:
+            self.texture, self.pending = self.pending, None
+        return True
+
+    def release_frame(self):
+        pass
+
+
+class FakeStageSurface:
+    """Staging texture with a row pitch wider than the screen, like a real GPU surface."""
+
+    def __init__(self, width, height, pad=16):
+        self.texture = np.zeros((height, width + pad, 4), np.uint8)
+        self.mapped = 0
+
+    def map(self):
+        self.mapped += 1
+        pointer = ctypes.cast(self.texture.ctypes.data, ctypes.POINTER(ctypes.c_ubyte))
+        return SimpleNamespace(Pitch=self.texture.shape[1] * 4, pBits=pointer)
+
+    def unmap(self):
+        pass
+
+
+class FakeBetterCam:
+    """BetterCam's duplication internals: a frame can be acquired once, then AcquireNextFrame times out."""
+
+    def __init__(self, width=300, height=200):
+        self.width, self.height = width, height
+        self.rotation_angle = 0
+        self._duplicator = FakeDuplicator()
+        self._stagesurf = FakeStageSurface(width, height)
+        stagesurf = self._stagesurf
+
+        def copy_resource(dst, src):
+            stagesurf.texture[:, :width] = src
+
+        self._device = SimpleNamespace(im_context=SimpleNamespace(CopyResource=copy_resource))
+
+    def present(self, screen_bgr):
+        self._duplicator.pending = cv2.cvtColor(screen_bgr, cv2.COLOR_BGR2BGRA)
+
+
+class GrabOnlyCamera:
+    """A camera without duplication internals: grab() returns None until a new frame is presented."""
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.height, self.width = screen.shape[:2]
+        self.fresh = True
+
+    def grab(self, region=None):
+        if not self.fresh:
+            return None
+        self.fresh = False
+        return self.screen.copy()
+
+
+def make_capture(camera):
+    capture = FastCapture()
+    capture.camera = camera
+    capture._initialized = True
+    return capture
+
+
+def make_screen(seed):
+    return np.random.default_rng(seed).integers(0, 255, (200, 300, 3), dtype=np.uint8)
+
+
+PLAN = CapturePlan.from_boxes([(10, 20, 30, 10), (200, 150, 40, 30), (5, 170, 20, 20)], merge_gap=0)
+
+
+def assert_boxes(frame, screen):
+    for x, y, w, h in PLAN.boxes:
+        assert np.array_equal(frame[y:y + h, x:x + w], screen[y:y + h, x:x + w])
+
+
+def test_capture_plan_reads_only_the_boxes_of_one_frame():
+    camera = FakeBetterCam()
+    screen = make_screen(0)
+    camera.present(screen)
+    frame = make_capture(camera).capture_plan(PLAN)
+    assert camera._stagesurf.mapped == 1
+    assert_boxes(frame, screen)
+    assert frame.nbytes == sum(w * h * 3 for _, _, w, h in PLAN.boxes)
+
+
+def test_capture_plan_reuses_boxes_until_next_frame():
+    camera = FakeBetterCam()
+    first, second = make_screen(1), make_screen(2)
+    capture = make_capture(camera)
+    camera.present(first)
+    capture.capture_plan(PLAN)
+    unchanged = capture.capture_plan(PLAN)
+    assert camera._stagesurf.mapped == 1
+    assert_boxes(unchanged, first)
+    camera.present(second)
+    assert_boxes(capture.capture_plan(PLAN), second)
+
+
+def test_capture_plan_without_any_frame_returns_none():
+    assert make_capture(FakeBetterCam()).capture_plan(PLAN) is None
+
+
+def test_capture_plan_falls_back_to_a_full_grab():
+    screen = make_screen(3)
+    camera = GrabOnlyCamera(screen)
+    capture = make_capture(camera)
+    assert_boxes(capture.capture_plan(PLAN), screen)
+    assert_boxes(capture.capture_plan(PLAN), screen)
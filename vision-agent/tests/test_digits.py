@@ -0,0 +1,58 @@
+import cv2
+import numpy as np
+
+from utils.digits import DigitRecognizer
+
+
+def render_binary(text, scale=0.6, font=cv2.FONT_HERSHEY_SIMPLEX):
+    canvas = np.zeros((30, 20 * len(text) + 8), np.uint8)
+    cv2.putText(canvas, text, (4, 24), font, scale, 255, 1, cv2.LINE_AA)
+    _, binary = cv2.threshold(canvas, 127, 255, cv2.THRESH_BINARY)
+    return cv2.dilate(binary, np.ones((2, 2), np.uint8), iterations=1)
+
+
+def test_recognizes_rendered_number():
+    text, confidence = DigitRecognizer().recognize(render_binary("145", font=cv2.FONT_HERSHEY_DUPLEX))
+    assert text == "145"
+    assert confidence > 0.6
+
+
+def test_single_misread_does_not_change_templates():
+    recognizer = DigitRecognizer()
+    before = recognizer._templates.copy()
+    assert recognizer.learn(render_binary("8"), "3") is False
+    assert np.array_equal(recognizer._templates[:len(before)], before)
+    assert len(recognizer._templates) == len(before)
+    assert recognizer.recognize(render_binary("8"))[0] == "8"
+
+
+def test_agreeing_reads_move_template_by_capped_weight():
+    recognizer = DigitRecognizer(confirm_reads=3, max_sample_weight=0.2)
+    default_count = len(recognizer._templates)
+    results = [recognizer.learn(render_binary("7"), "7") for _ in range(3)]
+    assert results == [False, False, True]
+    learned = recognizer._templates[default_count]
+    default = recognizer._templates[np.flatnonzero(recognizer._labels == 7)[-2]]
+    glyph = recognizer.segment(render_binary("7"))[0][1]
+    # Capped blend: still closer to the rendered default than a straight copy of the sample
+    assert learned @ glyph < 0.999
+    assert learned @ default > 0.9
+
+
+def test_disagreeing_reads_are_not_learned():
+    recognizer = DigitRecognizer(confirm_reads=3)
+    count = len(recognizer._templates)
+    for text in ("1", "8", "1"):
+        assert recognizer.learn(render_binary(text), "1") is False
+    assert len(recognizer._templates) == count
+
+
+def test_save_needs_a_configured_path(tmp_path):
+    recognizer = DigitRecognizer()
+    assert recognizer.save() is False
+    path = tmp_path / "templates.npz"
+    for _ in range(3):
+        recognizer.learn(render_binary("5"), "5")
+    assert recognizer.save(str(path)) is True
+    reloaded = DigitRecognizer(str(path))
+    assert reloaded._counts[5] == 1
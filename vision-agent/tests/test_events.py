@@ -0,0 +1,44 @@
+from utils.events import EventDetector
+from utils.state import GameState
+
+
+def run(detector, states):
+    return [[event_type for event_type, _ in detector.detect(state)] for state in states]
+
+
+def test_hp_drop_needs_confirmation():
+    detector = EventDetector({'confirm_frames': 2, 'hp_drop': 30, 'low_hp': 0})
+    fired = run(detector, [GameState(hp=100, shield=50, timestamp=0.0),
+                           GameState(hp=100, shield=10, timestamp=0.3),
+                           GameState(hp=100, shield=10, timestamp=0.6)])
+    assert fired == [[], [], ['hp_drop']]
+
+
+def test_single_misread_fires_nothing():
+    detector = EventDetector({'confirm_frames': 2})
+    fired = run(detector, [GameState(hp=100, shield=100, wood=500, timestamp=0.0),
+                           GameState(hp=5, shield=0, wood=5, timestamp=0.3),
+                           GameState(hp=100, shield=100, wood=500, timestamp=0.6)])
+    assert fired == [[], [], []]
+
+
+def test_low_mats_rearms_past_hysteresis():
+    detector = EventDetector({'confirm_frames': 1, 'low_mats': 300, 'mats_hysteresis': 100})
+    totals = [500, 250, 320, 250, 450, 250]
+    fired = run(detector, [GameState(wood=total, brick=0, metal=0, timestamp=float(i))
+                           for i, total in enumerate(totals)])
+    assert [events.count('low_mats') for events in fired] == [0, 1, 0, 0, 0, 1]
+
+
+def test_alive_thresholds_fire_once_per_match():
+    detector = EventDetector({'confirm_frames': 1, 'alive_thresholds': [50, 25]})
+    counts = [60, 48, 47, 20, 99, 45]
+    fired = run(detector, [GameState(alive_players=n, timestamp=float(i)) for i, n in enumerate(counts)])
+    assert [events.count('alive_threshold') for events in fired] == [0, 1, 0, 1, 0, 1]
+
+
+def test_unchanged_states_are_throttled_until_heartbeat():
+    detector = EventDetector({'heartbeat': 2.0})
+    sent = [detector.process(GameState(hp=100, timestamp=t)) for t in (0.0, 0.5, 1.0, 2.1)]
+    assert sent == [True, False, False, True]
+    assert detector.process(GameState(hp=90, timestamp=2.2)) is True
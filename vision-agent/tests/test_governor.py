@@ -0,0 +1,117 @@
+from types import SimpleNamespace
+
+import pytest
+
+from utils import governor as governor_module
+from utils.governor import ResourceGovernor
+
+
+class FakeProcess:
+    def __init__(self, pid=1, rss_mb=100.0, cpu=0.0):
+        self.pid = pid
+        self.rss_mb = rss_mb
+        self.cpu = cpu
+        self.kids = []
+
+    def cpu_percent(self, interval=None):
+        return self.cpu
+
+    def memory_info(self):
+        return SimpleNamespace(rss=int(self.rss_mb * 1024 * 1024))
+
+    def children(self, recursive=False):
+        return list(self.kids)
+
+
+class FakeCache:
+    def __init__(self):
+        self.invalidations = 0
+
+    def invalidate(self, name=None):
+        self.invalidations += 1
+
+
+class FakeExtractor:
+    def __init__(self):
+        self.capture = SimpleNamespace()
+        self.cache = FakeCache()
+        self.scheduler = None
+        self.tier = 0
+        self.unloads = 0
+        self.fallback_loaded = True
+
+    def set_preprocess_tier(self, tier):
+        self.tier = tier
+
+    def unload_fallback(self):
+        self.unloads += 1
+        loaded, self.fallback_loaded = self.fallback_loaded, False
+        return loaded
+
+
+@pytest.fixture
+def governor(monkeypatch):
+    process = FakeProcess()
+    fake_psutil = SimpleNamespace(cpu_percent=lambda interval=None: 0.0, cpu_count=lambda: 4,
+                                  Process=lambda pid: process, Error=Exception)
+    monkeypatch.setattr(governor_module, 'psutil', fake_psutil)
+    return ResourceGovernor({'max_memory_mb': 600, 'memory_hysteresis': 0.9,
+                             'max_cpu_percent': 8, 'governor_smoothing': 1.0}, FakeExtractor())
+
+
+def test_memory_measures_escalate_once_per_crossing(governor):
+    extractor = governor.extractor
+    governor._process.rss_mb = 900
+    governor.step()
+    assert extractor.cache.invalidations == 1 and extractor.unloads == 0
+    governor.step()
+    assert extractor.unloads == 1
+    for _ in range(5):
+        governor.step()
+    assert extractor.cache.invalidations == 1 and extractor.unloads == 1
+    assert governor.over_budget
+
+    # Dipping just under the cap is inside the hysteresis band and does not re-arm
+    governor._process.rss_mb = 580
+    governor.step()
+    governor._process.rss_mb = 900
+    governor.step()
+    assert extractor.cache.invalidations == 1
+
+    governor._process.rss_mb = 500
+    governor.step()
+    assert not governor.over_budget
+    governor._process.rss_mb = 900
+    governor.step()
+    assert extractor.cache.invalidations == 2
+
+
+def test_worker_processes_count_towards_the_caps(governor):
+    governor._process.rss_mb = 300
+    governor._process.kids = [FakeProcess(pid=2, rss_mb=250, cpu=20.0), FakeProcess(pid=3, rss_mb=250, cpu=20.0)]
+    governor.step()
+    assert governor.memory_mb == pytest.approx(800)
+    assert governor.cpu_percent == pytest.approx(10.0)
+    assert governor.level == 1
+    assert governor.extractor.cache.invalidations == 1
+
+
+def test_levels_reach_the_extractor_tier(governor):
+    governor._set_level(3)
+    assert governor.extractor.tier == 2
+
+
+def test_default_memory_cap_is_the_configured_budget():
+    extractor = SimpleNamespace(capture=SimpleNamespace(), cache=None, scheduler=None)
+    assert ResourceGovernor({}, extractor).max_memory_mb == 600
+
+
+def test_unloading_the_fallback_leaves_digits_only():
+    from utils.ocr import FortniteOCR
+    released = []
+    ocr = FortniteOCR(gpu=False)
+    ocr.reader = SimpleNamespace(release=lambda: released.append(True))
+    assert ocr.unload_fallback() is True
+    assert released and ocr.reader is None
+    assert ocr.status == 'digits_only' and not ocr.fallback
+    assert ocr.unload_fallback() is False
@@ -0,0 +1,42 @@
+from utils.scheduler import FieldScheduler
+
+
+def make_scheduler(budget_ms=150):
+    return FieldScheduler(['hp', 'wood', 'storm_phase'], {
+        'budget_ms': budget_ms,
+        'fields': {
+            'hp': {'interval': 0.0, 'priority': 10},
+            'wood': {'interval': 3.0, 'priority': 4},
+            'storm_phase': {'interval': 5.0, 'priority': 3},
+        },
+    })
+
+
+def refresh(scheduler, fields, now, elapsed=0.01):
+    for name in fields:
+        scheduler.record(name, now, elapsed)
+
+
+def test_fields_refresh_on_their_intervals():
+    scheduler = make_scheduler()
+    now = 100.0
+    assert scheduler.plan(now) == ['hp', 'wood', 'storm_phase']
+    refresh(scheduler, ['hp', 'wood', 'storm_phase'], now)
+    assert scheduler.plan(now + 1.0) == ['hp']
+    assert scheduler.plan(now + 3.0) == ['hp', 'wood']
+
+
+def test_budget_keeps_the_most_urgent_field():
+    scheduler = make_scheduler(budget_ms=50)
+    refresh(scheduler, ['hp', 'wood', 'storm_phase'], 0.0, elapsed=0.04)
+    assert scheduler.plan(10.0) == ['hp']
+    assert scheduler.skipped == 2
+
+
+def test_load_factor_stretches_intervals():
+    scheduler = make_scheduler()
+    refresh(scheduler, ['hp', 'wood', 'storm_phase'], 0.0)
+    scheduler.set_load_factor(2.0, floor=0.5)
+    assert 'wood' not in scheduler.plan(4.0)
+    assert scheduler.plan(0.2) == []
+    assert 'wood' in scheduler.plan(6.0)
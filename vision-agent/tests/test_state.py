@@ -0,0 +1,49 @@
+import pickle
+
+from utils.state import GameState, StateArray
+
+
+def sample_states():
+    return [
+        GameState(hp=100, shield=50, wood=500, brick=300, metal=200, storm_phase=1, storm_timer="2:00",
+                  storm_seconds=120, alive_players=99, eliminations=0, timestamp=1.0, stream_id="main"),
+        GameState(hp=None, surge_active=True, surge_text="STORM SURGE", timestamp=2.5, confidence=0.4),
+        GameState(timestamp=3.0),
+    ]
+
+
+def test_dict_roundtrip():
+    for state in sample_states():
+        assert GameState.from_dict(state.to_dict()) == state
+
+
+def test_state_array_roundtrip():
+    states = sample_states()
+    array = StateArray.from_states(states)
+    assert len(array) == len(states)
+    assert list(array) == states
+    assert array.to_dicts() == [state.to_dict() for state in states]
+
+
+def test_state_array_grows_and_concatenates():
+    array = StateArray(capacity=1)
+    array.extend(sample_states())
+    combined = StateArray.concatenate([array, StateArray.from_states(sample_states()[:1])])
+    assert len(combined) == 4
+    assert combined[-1] == sample_states()[0]
+    assert list(combined.rows['hp']) == [100, -1, -1, 100]
+
+
+def test_state_array_pickles():
+    array = StateArray.from_states(sample_states())
+    assert list(pickle.loads(pickle.dumps(array))) == sample_states()
+
+
+def test_state_array_stores_out_of_range_misreads_as_unset():
+    array = StateArray.from_states([GameState(wood=40000, brick=-5, metal=32767, storm_seconds=100000,
+                                              timestamp=1.0)])
+    state = array[0]
+    assert state.wood is None
+    assert state.brick is None
+    assert state.metal == 32767
+    assert state.storm_seconds == 100000
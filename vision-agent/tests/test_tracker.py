@@ -0,0 +1,82 @@
+from utils.scheduler import FieldScheduler
+from utils.state import GameState
+from utils.tracker import StateTracker
+
+
+MATERIAL_INTERVAL = 3.0
+
+
+def feed_materials(tracker, readings, fps=3.0):
+    """Feeds wood readings at the material refresh schedule; returns what was published."""
+    published = []
+    for frame, wood in enumerate(readings):
+        now = frame / fps
+        fresh = frame % int(MATERIAL_INTERVAL * fps) == 0
+        refreshed = ['hp', 'wood'] if fresh else ['hp']
+        state = GameState(hp=100, wood=wood, timestamp=now)
+        published.append(tracker.update(state, refreshed).wood)
+    return published
+
+
+def test_default_publishes_material_changes_on_the_refresh_that_reads_them():
+    tracker = StateTracker({})
+    truth = [500] * 9 + [460] * 9 + [430] * 9
+    assert feed_materials(tracker, truth) == truth
+
+
+def test_opt_in_smoothing_ignores_readings_older_than_max_age():
+    tracker = StateTracker({'smooth_fields': ['wood'], 'smooth_window': 3, 'smooth_max_age': 1.0})
+    truth = [500] * 9 + [460] * 9 + [430] * 9
+    assert feed_materials(tracker, truth) == truth
+
+
+def test_opt_in_smoothing_filters_a_spike_within_max_age():
+    tracker = StateTracker({'smooth_fields': ['wood'], 'smooth_window': 3, 'smooth_max_age': 1.0})
+    published = [tracker.update(GameState(wood=wood, timestamp=i * 0.2)).wood
+                 for i, wood in enumerate([500, 500, 800, 500])]
+    assert published == [500, 500, 500, 500]
+
+
+def test_out_of_range_reading_keeps_previous_value():
+    tracker = StateTracker({})
+    tracker.update(GameState(hp=80, timestamp=0.0))
+    assert tracker.update(GameState(hp=180, timestamp=0.3)).hp == 80
+    assert tracker.rejected == 1
+
+
+def test_monotonic_reversal_needs_confirmation():
+    tracker = StateTracker({'confirm_frames': 3})
+    tracker.update(GameState(alive_players=40, timestamp=0.0))
+    published = [tracker.update(GameState(alive_players=100, timestamp=t)).alive_players
+                 for t in (0.3, 0.6, 0.9)]
+    assert published == [40, 40, 100]
+
+
+def test_storm_timer_is_extrapolated_between_reads():
+    scheduler = FieldScheduler(['storm_timer'], {'fields': {'storm_timer': {'interval': 1.0}}})
+    tracker = StateTracker({}, scheduler=scheduler)
+    tracker.update(GameState(storm_seconds=90, timestamp=100.0), ['storm_timer'])
+    tracked = tracker.update(GameState(storm_seconds=None, timestamp=104.0), [])
+    assert tracked.storm_seconds == 86
+    assert tracked.storm_timer == "1:26"
+
+
+def test_dropped_digit_misread_is_not_published():
+    tracker = StateTracker({'confirm_frames': 3})
+    published = [tracker.update(GameState(alive_players=alive, timestamp=i * 2.0)).alive_players
+                 for i, alive in enumerate([60, 60, 6, 60, 60, 60])]
+    assert published == [60, 60, 60, 60, 60, 60]
+
+
+def test_extra_digit_misread_is_not_published():
+    tracker = StateTracker({'confirm_frames': 3})
+    published = [tracker.update(GameState(eliminations=elims, timestamp=i * 3.0)).eliminations
+                 for i, elims in enumerate([3, 38, 3, 4])]
+    assert published == [3, 3, 3, 4]
+
+
+def test_large_forward_jump_is_published_once_confirmed():
+    tracker = StateTracker({'confirm_frames': 2})
+    published = [tracker.update(GameState(alive_players=alive, timestamp=float(i))).alive_players
+                 for i, alive in enumerate([80, 55, 55, 54])]
+    assert published == [80, 80, 55, 54]
@@ -0,0 +1,71 @@
+import pytest
+
+from utils.state import GameState
+from utils.wire import HEADER, StateDecoder, StateEncoder
+
+
+def full_state(**changes):
+    state = GameState(hp=100, shield=50, wood=500, brick=300, metal=200, storm_phase=2,
+                      storm_timer="1:30", storm_seconds=90, alive_players=60, eliminations=3,
+                      surge_text="", timestamp=1000.25, capture_fps=3.0, confidence=0.5)
+    for name, value in changes.items():
+        setattr(state, name, value)
+    return state.to_dict()
+
+
+def test_keyframe_roundtrip():
+    data = full_state()
+    decoded, sent_at = StateDecoder().decode(StateEncoder().encode(data, 5.0))
+    assert sent_at == 5.0
+    assert decoded == data
+
+
+def test_delta_carries_only_changed_fields():
+    encoder, decoder = StateEncoder(keyframe_interval=30), StateDecoder()
+    keyframe = encoder.encode(full_state(), 1.0)
+    decoder.decode(keyframe)
+    changed = full_state(hp=70, storm_seconds=89, storm_timer="1:29", timestamp=1000.5)
+    delta = encoder.encode(changed, 2.0)
+    assert len(delta) < len(keyframe)
+    decoded, _ = decoder.decode(delta)
+    assert decoded == changed
+
+
+def test_none_values_survive_deltas():
+    encoder, decoder = StateEncoder(), StateDecoder()
+    decoder.decode(encoder.encode(full_state(), 1.0))
+    decoded, _ = decoder.decode(encoder.encode(full_state(hp=None, storm_seconds=None, storm_timer=None), 2.0))
+    assert decoded['hp'] is None
+    assert decoded['storm_timer'] is None
+
+
+def test_delta_without_keyframe_is_skipped_until_reset():
+    encoder = StateEncoder()
+    encoder.encode(full_state(), 1.0)
+    decoder = StateDecoder()
+    assert decoder.decode(encoder.encode(full_state(hp=10), 2.0)) is None
+    encoder.reset()
+    decoded, _ = decoder.decode(encoder.encode(full_state(hp=10), 3.0))
+    assert decoded['hp'] == 10
+
+
+def test_keyframe_every_interval():
+    encoder = StateEncoder(keyframe_interval=2)
+    sizes = [len(encoder.encode(full_state(), float(i))) for i in range(4)]
+    assert sizes[0] == sizes[3] > sizes[1] == sizes[2]
+
+
+def test_streams_are_decoded_separately():
+    decoder = StateDecoder()
+    encoders = {name: StateEncoder() for name in ('a', 'b')}
+    for name, hp in (('a', 10), ('b', 20)):
+        decoder.decode(encoders[name].encode(full_state(stream_id=name, hp=hp), 1.0))
+    decoded, _ = decoder.decode(encoders['a'].encode(full_state(stream_id='a', hp=11), 2.0))
+    assert decoded['hp'] == 11
+    decoded, _ = decoder.decode(encoders['b'].encode(full_state(stream_id='b', hp=20), 2.0))
+    assert decoded['hp'] == 20
+
+
+def test_rejects_foreign_frames():
+    with pytest.raises(ValueError):
+        StateDecoder().decode(b'\x00' * HEADER.size)
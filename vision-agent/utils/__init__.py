@@ -1,16 +1,65 @@
 # Vision Agent Utils Package
 # Fortnite IGL System - 100% Free Local AI
 
-from .capture import FastCapture, AdaptiveCapture
+from .capture import FastCapture, AdaptiveCapture, CapturePlan, RegionFrame
 from .ocr import FortniteOCR
-from .extractor import GameState, StateExtractor
+from .digits import DigitRecognizer
+from .state import GameState, StateArray
+from .extractor import StateExtractor
 from .bridge import VisionBridge
+from .cache import RegionCache
+from .pipeline import StatePipeline
+from .scheduler import FieldScheduler
+from .tracker import StateTracker
+from .wire import StateEncoder, StateDecoder
+from .recorder import FrameRecorder, ReplayCapture
+from .synthetic import SyntheticHUD, SyntheticCapture
+from .metrics import MetricsRegistry, MetricsServer
+from .preprocess import NumberPreprocessor, TextPreprocessor, SurgePreprocessor, SurgeGate, GrayConverter
+from .governor import ResourceGovernor
+from .regions import RegionPlan, CompiledRegion
+from .workers import OCRWorkerPool
+from .multistream import MultiStreamExtractor
+from .video import VideoCapture
+from .backends import OCRBackend, EasyOCRBackend, ONNXBackend
+from .events import EventDetector
 
 __all__ = [
       'FastCapture',
       'AdaptiveCapture',
+      'CapturePlan',
+      'RegionFrame',
       'FortniteOCR',
+      'DigitRecognizer',
       'GameState',
+      'StateArray',
       'StateExtractor',
-      'VisionBridge'
+      'VisionBridge',
+      'RegionCache',
+      'StatePipeline',
+      'FieldScheduler',
+      'StateTracker',
+      'StateEncoder',
+      'StateDecoder',
+      'FrameRecorder',
+      'ReplayCapture',
+      'SyntheticHUD',
+      'SyntheticCapture',
+      'MetricsRegistry',
+      'MetricsServer',
+      'NumberPreprocessor',
+      'TextPreprocessor',
+      'SurgePreprocessor',
+      'SurgeGate',
+      'GrayConverter',
+      'ResourceGovernor',
+      'RegionPlan',
+      'CompiledRegion',
+      'OCRWorkerPool',
+      'MultiStreamExtractor',
+      'VideoCapture',
+      'OCRBackend',
+      'EasyOCRBackend',
+      'ONNXBackend',
+      'EventDetector'
 ]
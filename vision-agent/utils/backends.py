@@ -0,0 +1,285 @@
+"""
+OCR Backend Module
+Recognizer engines behind FortniteOCR's fallback: EasyOCR (PyTorch) or
+exported, int8-quantized models on ONNX Runtime's CPU provider
+"""
+
+import abc
+import json
+import math
+import importlib.util
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+import cv2
+import logging
+
+logger = logging.getLogger(__name__)
+
+# EasyOCR's english_g2 recognizer alphabet; class 0 is the CTC blank
+EASYOCR_EN_CHARSET = ("0123456789!\"#$%&'()*+,-./:;<=>?@[\\]^_`{|}~ €"
+                      "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz")
+
+
+class OCRBackend(abc.ABC):
+    """
+    What FortniteOCR needs from a recognizer: readtext() with EasyOCR's
+    result shapes. detail=0 gives a list of strings; detail=1 gives
+    (box points, text, confidence) tuples; paragraph=True joins the
+    detections in reading order.
+    """
+
+    name = 'base'
+    module: Optional[str] = None  # import that must be available for load()
+
+    @classmethod
+    def available(cls) -> bool:
+        return cls.module is None or importlib.util.find_spec(cls.module) is not None
+
+    @abc.abstractmethod
+    def load(self):
+        """Import the runtime and load the models; raises ImportError when the runtime is missing."""
+
+    @abc.abstractmethod
+    def readtext(self, image: np.ndarray, detail: int = 0, paragraph: bool = False,
+                 batch_size: int = 1) -> List[Any]:
+        """Recognize text in a BGR or gray image."""
+
+    def release(self):
+        pass
+
+
+class EasyOCRBackend(OCRBackend):
+    """easyocr.Reader; pulls in PyTorch and uses CUDA when gpu is set."""
+
+    name = 'easyocr'
+    module = 'easyocr'
+
+    def __init__(self, languages: Sequence[str] = ('en',), gpu: bool = True):
+        self.languages = list(languages)
+        self.gpu = gpu
+        self._reader = None
+
+    def load(self):
+        # torch comes in with easyocr, so nothing heavy is imported until here
+        import easyocr
+        self._reader = easyocr.Reader(self.languages, gpu=self.gpu, verbose=False)
+
+    def readtext(self, image: np.ndarray, detail: int = 0, paragraph: bool = False,
+                 batch_size: int = 1) -> List[Any]:
+        return self._reader.readtext(image, detail=detail, paragraph=paragraph, batch_size=batch_size)
+
+    def release(self):
+        self._reader = None
+
+
+class ONNXBackend(OCRBackend):
+    """
+    A CTC recognizer (and optionally a CRAFT detector) exported to ONNX, run
+    on the CPU provider with fixed intra-op threads. Without a detector,
+    text lines are found by row/column projection, which is enough for the
+    binarized, padded HUD tiles FortniteOCR sends.
+
+    A '<recognizer>.json' sidecar written by export_onnx.py supplies the
+    charset and input height when present.
+    """
+
+    name = 'onnx'
+    module = 'onnxruntime'
+
+    MEAN = np.array([0.485, 0.456, 0.406], np.float32) * 255.0
+    STD = np.array([0.229, 0.224, 0.225], np.float32) * 255.0
+
+    def __init__(self, recognizer: str, detector: Optional[str] = None, charset: Optional[str] = None,
+                 input_height: int = 64, max_width: int = 800, intra_op_threads: int = 2,
+                 inter_op_threads: int = 1, text_threshold: float = 0.7, low_text: float = 0.4,
+                 link_threshold: float = 0.4, canvas_size: int = 1280, word_gap: float = 1.0):
+        self.recognizer_path = recognizer
+        self.detector_path = detector
+        self.charset = charset
+        self.input_height = input_height
+        self.max_width = max_width
+        self.intra_op_threads = intra_op_threads
+        self.inter_op_threads = inter_op_threads
+        self.text_threshold = text_threshold
+        self.low_text = low_text
+        self.link_threshold = link_threshold
+        self.canvas_size = canvas_size
+        self.word_gap = word_gap  # column gap, in line heights, that splits a line into words
+        self._recognizer = None
+        self._detector = None
+        self._labels: List[str] = []
+
+    def load(self):
+        import onnxruntime as ort
+        sidecar = Path(self.recognizer_path).with_suffix('.json')
+        if sidecar.exists():
+            with open(sidecar) as f:
+                meta = json.load(f)
+            self.charset = self.charset or meta.get('charset')
+            self.input_height = meta.get('input_height', self.input_height)
+        self._labels = [''] + list(self.charset or EASYOCR_EN_CHARSET)
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = self.intra_op_threads
+        options.inter_op_num_threads = self.inter_op_threads
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        providers = ['CPUExecutionProvider']
+        self._recognizer = ort.InferenceSession(self.recognizer_path, options, providers=providers)
+        if self.detector_path:
+            self._detector = ort.InferenceSession(self.detector_path, options, providers=providers)
+        logger.info(f"ONNX OCR backend: recognizer {self.recognizer_path}, "
+                    f"detector {self.detector_path or 'projection'}, {self.intra_op_threads} threads")
+
+    def readtext(self, image: np.ndarray, detail: int = 0, paragraph: bool = False,
+                 batch_size: int = 1) -> List[Any]:
+        gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        boxes = self._detect(image) if self._detector is not None else self._project(gray)
+        crops = [gray[y0:y1, x0:x1] for x0, y0, x1, y1 in boxes]
+        lines = self._recognize(crops, max(batch_size, 1))
+        results = [([[x0, y0], [x1, y0], [x1, y1], [x0, y1]], text, confidence)
+                   for (x0, y0, x1, y1), (text, confidence) in zip(boxes, lines) if text]
+        if paragraph and results:
+            results.sort(key=lambda r: (r[0][0][1] // max(self.input_height // 2, 1), r[0][0][0]))
+            xs = [p[0] for r in results for p in r[0]]
+            ys = [p[1] for r in results for p in r[0]]
+            box = [[min(xs), min(ys)], [max(xs), min(ys)], [max(xs), max(ys)], [min(xs), max(ys)]]
+            results = [(box, " ".join(r[1] for r in results), min(r[2] for r in results))]
+        if detail == 0:
+            return [text for _, text, _ in results]
+        return results
+
+    def release(self):
+        self._recognizer = None
+        self._detector = None
+
+    def _project(self, gray: np.ndarray) -> List[Tuple[int, int, int, int]]:
+        """Text line boxes from runs of inked rows, split at wide column gaps."""
+        if gray.size == 0:
+            return []
+        # Text is the minority polarity; binarized HUD tiles are white on black
+        _, ink = cv2.threshold(gray, 0, 1, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        if ink.mean() > 0.5:
+            ink = 1 - ink
+        boxes = []
+        for y0, y1 in self._runs(ink.any(axis=1), 1):
+            for x0, x1 in self._runs(ink[y0:y1].any(axis=0), int(self.word_gap * (y1 - y0)) + 1):
+                pad = max((y1 - y0) // 8, 1)
+                boxes.append((max(x0 - pad, 0), max(y0 - pad, 0),
+                              min(x1 + pad, gray.shape[1]), min(y1 + pad, gray.shape[0])))
+        return boxes
+
+    @staticmethod
+    def _runs(mask: np.ndarray, gap: int) -> List[Tuple[int, int]]:
+        """[start, end) runs of True, merging runs separated by fewer than gap False entries."""
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], mask.view(np.int8), [0]))))
+        runs = []
+        for start, end in zip(edges[::2], edges[1::2]):
+            if runs and start - runs[-1][1] < gap:
+                runs[-1] = (runs[-1][0], int(end))
+            else:
+                runs.append((int(start), int(end)))
+        return runs
+
+    def _detect(self, image: np.ndarray) -> List[Tuple[int, int, int, int]]:
+        """CRAFT: region/affinity score maps at half resolution to axis-aligned word boxes."""
+        rgb = cv2.cvtColor(image, cv2.COLOR_GRAY2RGB if image.ndim == 2 else cv2.COLOR_BGR2RGB)
+        height, width = rgb.shape[:2]
+        ratio = min(self.canvas_size / max(height, width), 1.0)
+        target_h, target_w = int(height * ratio), int(width * ratio)
+        canvas = np.zeros((int(math.ceil(target_h / 32) * 32), int(math.ceil(target_w / 32) * 32), 3), np.float32)
+        canvas[:target_h, :target_w] = cv2.resize(rgb, (target_w, target_h), interpolation=cv2.INTER_LINEAR)
+        canvas = (canvas - self.MEAN) / self.STD
+        inputs = {self._detector.get_inputs()[0].name: canvas.transpose(2, 0, 1)[np.newaxis]}
+        scores = self._detector.run(None, inputs)[0][0]
+        text_map, link_map = scores[..., 0], scores[..., 1]
+
+        combined = ((text_map > self.low_text) | (link_map > self.link_threshold)).astype(np.uint8)
+        count, labels, stats, _ = cv2.connectedComponentsWithStats(combined, connectivity=4)
+        scale = 2.0 / ratio  # score maps are half the network input
+        boxes = []
+        for label in range(1, count):
+            x, y, w, h, area = stats[label]
+            if area < 10 or text_map[labels == label].max() < self.text_threshold:
+                continue
+            grow = int(math.sqrt(area * min(w, h) / (w * h)) * 2)
+            x0, y0 = max(x - grow, 0), max(y - grow, 0)
+            x1, y1 = x + w + grow, y + h + grow
+            boxes.append((int(x0 * scale), int(y0 * scale),
+                          min(int(x1 * scale), width), min(int(y1 * scale), height)))
+        return sorted(boxes, key=lambda b: (b[1], b[0]))
+
+    def _recognize(self, crops: List[np.ndarray], batch_size: int) -> List[Tuple[str, float]]:
+        lines: List[Tuple[str, float]] = [('', 0.0)] * len(crops)
+        prepared = []
+        for index, crop in enumerate(crops):
+            if crop.size == 0:
+                continue
+            h, w = crop.shape[:2]
+            width = min(max(int(math.ceil(self.input_height * w / h)), 1), self.max_width)
+            prepared.append((width, index, cv2.resize(crop, (width, self.input_height),
+                                                      interpolation=cv2.INTER_AREA if h > self.input_height
+                                                      else cv2.INTER_CUBIC)))
+        # Similar widths per batch keep the right padding, and wasted work, small
+        prepared.sort(key=lambda p: p[0])
+        input_name = self._recognizer.get_inputs()[0].name
+        for start in range(0, len(prepared), batch_size):
+            chunk = prepared[start:start + batch_size]
+            width = chunk[-1][0]
+            batch = np.empty((len(chunk), 1, self.input_height, width), np.float32)
+            for row, (w, _, resized) in enumerate(chunk):
+                batch[row, 0, :, :w] = resized
+                batch[row, 0, :, w:] = resized[:, -1:]  # EasyOCR pads by repeating the last column
+            batch = (batch / 255.0 - 0.5) / 0.5
+            logits = self._recognizer.run(None, {input_name: batch})[0]
+            for (_, index, _), row in zip(chunk, logits):
+                lines[index] = self._decode(row)
+        return lines
+
+    def _decode(self, logits: np.ndarray) -> Tuple[str, float]:
+        """Greedy CTC: collapse repeats, drop blanks; confidence as EasyOCR scores it."""
+        shifted = np.exp(logits - logits.max(axis=1, keepdims=True))
+        probs = shifted / shifted.sum(axis=1, keepdims=True)
+        best = probs.argmax(axis=1)
+        keep = (best != 0) & np.concatenate(([True], best[1:] != best[:-1]))
+        if not keep.any():
+            return '', 0.0
+        text = "".join(self._labels[i] for i in best[keep] if i < len(self._labels))
+        peaks = probs.max(axis=1)[keep]
+        confidence = float(np.prod(peaks) ** (2.0 / math.sqrt(len(peaks))))
+        return text, confidence
+
+
+BACKENDS = {
+    EasyOCRBackend.name: EasyOCRBackend,
+    ONNXBackend.name: ONNXBackend,
+}
+
+
+def backend_available(name: str) -> bool:
+    backend = BACKENDS.get(name)
+    return backend is not None and backend.available()
+
+
+def create_backend(name: str, languages: Sequence[str] = ('en',), gpu: bool = True,
+                   options: Optional[Dict[str, Any]] = None) -> OCRBackend:
+    """Backend named in ocr.backend, built from its options section (ocr.onnx for 'onnx')."""
+    options = options or {}
+    if name == EasyOCRBackend.name:
+        return EasyOCRBackend(languages, gpu=gpu)
+    if name == ONNXBackend.name:
+        if not options.get('recognizer'):
+            raise ValueError("ocr.onnx.recognizer must point to an exported recognizer model")
+        return ONNXBackend(
+            recognizer=options['recognizer'],
+            detector=options.get('detector'),
+            charset=options.get('charset'),
+            input_height=options.get('input_height', 64),
+            intra_op_threads=options.get('intra_op_threads', 2),
+            inter_op_threads=options.get('inter_op_threads', 1),
+            text_threshold=options.get('text_threshold', 0.7),
+            low_text=options.get('low_text', 0.4),
+            link_threshold=options.get('link_threshold', 0.4)
+        )
+    raise ValueError(f"Unknown OCR backend '{name}' (expected one of {', '.join(BACKENDS)})")
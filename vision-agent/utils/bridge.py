@@ -5,74 +5,263 @@ Sends real-time game state via localhost connection
 import json
 import time
 import threading
-import queue
 import logging
+from collections import deque
+
+from .wire import StateEncoder, WIRE_FORMAT
 
 logger = logging.getLogger(__name__)
 
 class VisionBridge:
-      def __init__(self, host="localhost", port=8765):
-                self.host = host
-                self.port = port
-                self.uri = f"ws://{host}:{port}"
-                self.ws = None
-                self._connected = False
-                self._send_queue = queue.Queue(maxsize=100)
-                self.reconnect_delay = 5
-
-      def connect(self):
-                try:
-                              import websocket
-                              self.ws = websocket.WebSocket()
-                              self.ws.connect(self.uri, timeout=10)
-                              self._connected = True
-                              logger.info(f"Connected to vision server at {self.uri}")
-                              return True
-except Exception as e:
-            logger.warning(f"Could not connect: {e}")
-            return False
+    """
+    Non-blocking bridge. send_state/send_event only enqueue; a background
+    sender thread owns the socket, coalesces queued states so only the
+    latest of each stream is sent, and reconnects with exponential backoff.
+    Events are queued in order; one that fails to send goes back to the
+    front, and events older than event_ttl are dropped instead of replayed
+    after a reconnect.
+    """
+
+    def __init__(self, host="localhost", port=8765, reconnect_delay=1.0,
+                 max_reconnect_delay=30.0, queue_size=100, timeout=5.0,
+                 wire_format="json", keyframe_interval=30, event_ttl=10.0, metrics=None):
+        self.host = host
+        self.port = port
+        self.uri = f"ws://{host}:{port}"
+        self.ws = None
+        self.timeout = timeout
+        self.wire_format = wire_format
+        self.negotiated_format = "json"
+        self.keyframe_interval = keyframe_interval
+        self._encoders = {}  # stream_id -> StateEncoder; deltas are per stream
+        self._connected = False
+        self.queue_size = queue_size
+        self.event_ttl = event_ttl  # seconds; None replays events of any age
+        self._events = deque()
+        self._event_lock = threading.Lock()
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self._next_delay = reconnect_delay
+        self._state_lock = threading.Lock()
+        self._latest_states = {}
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self.states_sent = 0
+        self.states_coalesced = 0
+        self.events_sent = 0
+        self.events_dropped = 0
+        self.events_expired = 0
+        self.send_errors = 0
+        self.reconnects = 0
+        self.bytes_sent = 0
+        self.metrics = metrics
+        if metrics is not None:
+            metrics.register_collector(self._collect_metrics)
+
+    def connect(self):
+        """Try to connect once, then hand the socket to the background sender."""
+        ok = self._open()
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._sender_loop, name="bridge-sender", daemon=True)
+            self._thread.start()
+        return ok
 
     def disconnect(self):
-              self._connected = False
-              if self.ws:
-                            try:
-                                              self.ws.close()
-                                          except:
-                pass
-                        logger.info("Disconnected from vision server")
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        self._close()
+        logger.info("Disconnected from vision server")
 
     def send_state(self, state_data):
-              if not self._connected or not self.ws:
-                            return False
-                        try:
-                                      message = {'type': 'game_state', 'data': state_data, 'timestamp': time.time()}
-                                      self.ws.send(json.dumps(message))
-                                      return True
-except Exception as e:
-            logger.error(f"Send failed: {e}")
-            self._connected = False
-            return False
+        """
+        state_data is a GameState or its to_dict(). A GameState is only
+        serialized on the sender thread, so states coalesced away never are.
+        Returns whether the bridge is connected: while it is down or backing
+        off the state is only kept as the latest for after the reconnect.
+        """
+        message = {'type': 'game_state', 'data': state_data, 'timestamp': time.time()}
+        stream = state_data.get('stream_id') if isinstance(state_data, dict) else state_data.stream_id
+        with self._state_lock:
+            if stream in self._latest_states:
+                self.states_coalesced += 1
+            self._latest_states[stream] = message
+        self._wake.set()
+        return self._connected
 
     def send_event(self, event_type, event_data):
-              if not self._connected:
-                            return False
-                        try:
-                                      message = {'type': event_type, 'data': event_data, 'timestamp': time.time()}
-                                      self.ws.send(json.dumps(message))
-                                      return True
-                                  except:
-            return False
+        """
+        Queue an event, dropping the oldest when the queue is full. Returns
+        whether the bridge is connected, like send_state.
+        """
+        message = {'type': event_type, 'data': event_data, 'timestamp': time.time()}
+        with self._event_lock:
+            while len(self._events) >= self.queue_size:
+                self._events.popleft()
+                self.events_dropped += 1
+            self._events.append(message)
+        self._wake.set()
+        return self._connected
 
     @property
     def is_connected(self):
-              return self._connected
+        return self._connected
+
+    def stats(self):
+        return {
+            'connected': self._connected,
+            'states_sent': self.states_sent,
+            'states_coalesced': self.states_coalesced,
+            'events_sent': self.events_sent,
+            'events_dropped': self.events_dropped,
+            'events_expired': self.events_expired,
+            'send_errors': self.send_errors,
+            'reconnects': self.reconnects,
+            'bytes_sent': self.bytes_sent,
+            'wire_format': self.negotiated_format,
+        }
+
+    def _open(self):
+        try:
+            import websocket
+            ws = websocket.WebSocket()
+            ws.connect(self.uri, timeout=self.timeout)
+            self.ws = ws
+            self.negotiated_format = self._negotiate(ws)
+            for encoder in self._encoders.values():
+                encoder.reset()
+            self._connected = True
+            self._next_delay = self.reconnect_delay
+            logger.info(f"Connected to vision server at {self.uri} ({self.negotiated_format})")
+            return True
+        except Exception as e:
+            logger.warning(f"Could not connect: {e}")
+            self._connected = False
+            return False
+
+    def _negotiate(self, ws):
+        """Offer the binary format; servers that do not answer get JSON."""
+        if self.wire_format == "json":
+            return "json"
+        ws.send(json.dumps({'type': 'hello', 'data': {'formats': [WIRE_FORMAT, 'json']}}))
+        deadline = time.time() + 1.0
+        try:
+            while time.time() < deadline:
+                ws.settimeout(max(deadline - time.time(), 0.01))
+                reply = json.loads(ws.recv())
+                if reply.get('type') == 'hello_ack':
+                    return reply.get('data', {}).get('format', 'json')
+        except Exception:
+            pass
+        finally:
+            ws.settimeout(self.timeout)
+        return "json"
+
+    def _close(self):
+        self._connected = False
+        if self.ws:
+            try:
+                self.ws.close()
+            except:
+                pass
+            self.ws = None
+
+    def _sender_loop(self):
+        while not self._stop.is_set():
+            if not self._connected:
+                if self._stop.wait(self._next_delay):
+                    break
+                self._next_delay = min(self._next_delay * 2, self.max_reconnect_delay)
+                if self._open():
+                    self.reconnects += 1
+                continue
+
+            self._wake.wait(timeout=1.0)
+            self._wake.clear()
+            try:
+                self._flush()
+            except Exception as e:
+                logger.error(f"Send failed: {e}")
+                self.send_errors += 1
+                self._close()
+
+    def _flush(self):
+        while True:
+            with self._event_lock:
+                if not self._events:
+                    break
+                message = self._events.popleft()
+            if self.event_ttl is not None and time.time() - message['timestamp'] > self.event_ttl:
+                self.events_expired += 1
+                continue
+            try:
+                payload = self._timed('serialize', json.dumps, message)
+                self._timed('send', self.ws.send, payload)
+            except Exception:
+                # Back to the front so event order survives the reconnect
+                with self._event_lock:
+                    self._events.appendleft(message)
+                raise
+            self.events_sent += 1
+            self.bytes_sent += len(payload)
+
+        with self._state_lock:
+            pending = self._latest_states
+            self._latest_states = {}
+        for stream in list(pending):
+            message = pending[stream]
+            if not isinstance(message['data'], dict):
+                message['data'] = message['data'].to_dict()
+            try:
+                if self.negotiated_format == WIRE_FORMAT:
+                    encoder = self._encoders.get(stream)
+                    if encoder is None:
+                        encoder = self._encoders[stream] = StateEncoder(self.keyframe_interval)
+                    payload = self._timed('serialize', encoder.encode, message['data'], message['timestamp'])
+                    self._timed('send', self.ws.send_binary, payload)
+                else:
+                    payload = self._timed('serialize', json.dumps, message)
+                    self._timed('send', self.ws.send, payload)
+                self.states_sent += 1
+                self.bytes_sent += len(payload)
+            except Exception:
+                # Keep what was not sent for after the reconnect unless newer states arrive first
+                with self._state_lock:
+                    for unsent, kept in pending.items():
+                        self._latest_states.setdefault(unsent, kept)
+                raise
+            del pending[stream]
+
+    def _timed(self, stage, func, *args):
+        if self.metrics is None:
+            return func(*args)
+        with self.metrics.timer(f'vision_{stage}_seconds'):
+            return func(*args)
+
+    def _collect_metrics(self):
+        return [
+            ('vision_bridge_connected', 'gauge', {}, int(self._connected)),
+            ('vision_states_sent_total', 'counter', {}, self.states_sent),
+            ('vision_states_coalesced_total', 'counter', {}, self.states_coalesced),
+            ('vision_events_sent_total', 'counter', {}, self.events_sent),
+            ('vision_events_dropped_total', 'counter', {}, self.events_dropped),
+            ('vision_events_expired_total', 'counter', {}, self.events_expired),
+            ('vision_errors_total', 'counter', {'stage': 'send'}, self.send_errors),
+            ('vision_reconnects_total', 'counter', {}, self.reconnects),
+            ('vision_bytes_sent_total', 'counter', {}, self.bytes_sent),
+        ]
 
 class MockBridge:
-      def __init__(self):
-                self._connected = True
-            def connect(self): return True
-                  def disconnect(self): pass
-                        def send_state(self, data): return True
-                              def send_event(self, t, d): return True
-                                    @property
+    def __init__(self):
+        self._connected = True
+    def connect(self): return True
+    def disconnect(self): pass
+    def send_state(self, data): return True
+    def send_event(self, t, d): return True
+    def stats(self): return {}
+    @property
     def is_connected(self): return True
@@ -0,0 +1,91 @@
+"""
+Region Cache Module
+Skips OCR for HUD regions whose text has not changed
+Keyed on a bit-packed mask of each ROI's bright (glyph) pixels
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import cv2
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# Bits set in each byte value, for counting differing mask pixels
+_POPCOUNT = np.array([bin(value).count('1') for value in range(256)], np.uint8)
+
+
+class RegionCache:
+    """
+    Per-region LRU cache of decoded values keyed on ROI fingerprints.
+    The fingerprint is the ROI thresholded like NumberPreprocessor's
+    cheapest tier and packed to one bit a pixel (100 bytes for a 40x20
+    ROI): the white HUD glyphs survive, the scenery behind them does not,
+    so the cache still hits while the background moves. A lookup hits on
+    an exact key, or when at most `tolerance` mask pixels differ from a
+    stored fingerprint; a changed digit flips far more than that.
+    """
+
+    def __init__(self, max_entries: int = 8, tolerance: int = 3, threshold: int = 180):
+        self.max_entries = max_entries
+        self.tolerance = tolerance
+        self.threshold = threshold
+        self._entries: Dict[str, OrderedDict] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def fingerprint(self, roi: np.ndarray) -> np.ndarray:
+        gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY) if roi.ndim == 3 else roi
+        return np.packbits(gray > self.threshold, axis=1)
+
+    def lookup(self, name: str, fingerprint: np.ndarray) -> Tuple[bool, Any]:
+        entries = self._entries.get(name)
+        if entries:
+            key = self._key(fingerprint)
+            if key in entries:
+                entries.move_to_end(key)
+                self.hits += 1
+                return True, entries[key][1]
+            for key, (stored, value) in reversed(entries.items()):
+                if (stored.shape == fingerprint.shape
+                        and int(_POPCOUNT[stored ^ fingerprint].sum()) <= self.tolerance):
+                    entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+        self.misses += 1
+        return False, None
+
+    def store(self, name: str, fingerprint: np.ndarray, value: Any):
+        entries = self._entries.setdefault(name, OrderedDict())
+        key = self._key(fingerprint)
+        entries[key] = (fingerprint, value)
+        entries.move_to_end(key)
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, name: Optional[str] = None):
+        if name is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(name, None)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round(self.hit_rate, 3),
+            'regions': len(self._entries),
+        }
+
+    def _key(self, fingerprint: np.ndarray) -> bytes:
+        return fingerprint.tobytes() + bytes(str(fingerprint.shape), 'ascii')
@@ -5,96 +5,245 @@ Optimized for minimal CPU/GPU impact during Fortnite gameplay
 """
 
 import time
+import ctypes
+import cv2
 import numpy as np
-from typing import Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+Box = Tuple[int, int, int, int]  # (x, y, width, height)
+
+
+class CapturePlan:
+    """Minimal set of screen boxes covering the configured HUD regions."""
+
+    def __init__(self, boxes: List[Box], screen_size: Optional[Tuple[int, int]] = None):
+        self.boxes = boxes
+        self.screen_size = screen_size
+
+    @classmethod
+    def from_regions(cls, regions: Iterable[Dict], merge_gap: int = 32,
+                     screen_size: Optional[Tuple[int, int]] = None) -> 'CapturePlan':
+        boxes = [(r.get('x', 0), r.get('y', 0), r.get('width', 100), r.get('height', 50))
+                 for r in regions if r]
+        return cls.from_boxes(boxes, merge_gap, screen_size)
+
+    @classmethod
+    def from_boxes(cls, boxes: Iterable[Box], merge_gap: int = 32,
+                   screen_size: Optional[Tuple[int, int]] = None) -> 'CapturePlan':
+        boxes = [tuple(int(v) for v in box) for box in boxes]
+        merged = True
+        while merged:
+            merged = False
+            for i in range(len(boxes)):
+                for j in range(i + 1, len(boxes)):
+                    if cls._near(boxes[i], boxes[j], merge_gap):
+                        boxes[i] = cls._union(boxes[i], boxes[j])
+                        del boxes[j]
+                        merged = True
+                        break
+                if merged:
+                    break
+        return cls(sorted(boxes, key=lambda b: (b[1], b[0])), screen_size)
+
+    @property
+    def pixel_count(self) -> int:
+        return sum(w * h for _, _, w, h in self.boxes)
+
+    @staticmethod
+    def _near(a: Box, b: Box, gap: int) -> bool:
+        return (a[0] - gap <= b[0] + b[2] and b[0] - gap <= a[0] + a[2] and
+                a[1] - gap <= b[1] + b[3] and b[1] - gap <= a[1] + a[3])
+
+    @staticmethod
+    def _union(a: Box, b: Box) -> Box:
+        x, y = min(a[0], b[0]), min(a[1], b[1])
+        return (x, y, max(a[0] + a[2], b[0] + b[2]) - x, max(a[1] + a[3], b[1] + b[3]) - y)
+
+
+class RegionFrame:
+    """
+    Sparse frame made of the boxes of a CapturePlan.
+    Supports frame[y0:y1, x0:x1] in full-screen coordinates like an ndarray,
+    as long as the slice falls inside one captured box.
+    """
+
+    def __init__(self, boxes: List[Box], images: List[np.ndarray],
+                 screen_size: Optional[Tuple[int, int]] = None):
+        self.boxes = boxes
+        self.images = images
+        self.screen_size = screen_size
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        if self.screen_size:
+            return (self.screen_size[1], self.screen_size[0], 3)
+        return (max(y + h for _, y, _, h in self.boxes), max(x + w for x, _, w, _ in self.boxes), 3)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(image.nbytes for image in self.images)
+
+    def crop(self, x: int, y: int, width: int, height: int) -> np.ndarray:
+        for (bx, by, bw, bh), image in zip(self.boxes, self.images):
+            if bx <= x and by <= y and x + width <= bx + bw and y + height <= by + bh:
+                return image[y - by:y - by + height, x - bx:x - bx + width]
+        return np.empty((0, 0, 3), dtype=np.uint8)
+
+    def __getitem__(self, key) -> np.ndarray:
+        rows, cols = key[0], key[1]
+        y, x = rows.start or 0, cols.start or 0
+        return self.crop(x, y, cols.stop - x, rows.stop - y)
+
 
 class FastCapture:
-      """
-          High-performance screen capture using BetterCam.
-              Desktop Duplication API captures directly from GPU framebuffer.
-                  """
+    """
+    High-performance screen capture using BetterCam.
+    Desktop Duplication API captures directly from GPU framebuffer.
+    """
 
     def __init__(self, monitor: int = 0, target_fps: int = 3):
-              self.monitor = monitor
-              self.target_fps = target_fps
-              self.frame_time = 1.0 / target_fps
-              self.camera = None
-              self.last_capture = 0
-              self._initialized = False
+        self.monitor = monitor
+        self.target_fps = target_fps
+        self.frame_time = 1.0 / target_fps
+        self.camera = None
+        self.last_capture = 0
+        self._initialized = False
+        self._plan_boxes = None
+        self._plan_images = []
 
     def initialize(self) -> bool:
-              try:
-                            import bettercam
-                            self.camera = bettercam.create(output_idx=self.monitor, output_color="BGR")
-                            self._initialized = True
-                            logger.info(f"FastCapture initialized on monitor {self.monitor}")
-                            return True
-except ImportError:
+        try:
+            import bettercam
+            self.camera = bettercam.create(output_idx=self.monitor, output_color="BGR")
+            self._initialized = True
+            logger.info(f"FastCapture initialized on monitor {self.monitor}")
+            return True
+        except ImportError:
             logger.error("BetterCam not installed. Run: pip install bettercam")
             return False
-except Exception as e:
+        except Exception as e:
             logger.error(f"Failed to initialize capture: {e}")
             return False
 
+    @property
+    def screen_size(self) -> Optional[Tuple[int, int]]:
+        if self.camera is None:
+            return None
+        return (self.camera.width, self.camera.height)
+
     def capture(self) -> Optional[np.ndarray]:
-              if not self._initialized:
-                            if not self.initialize():
-                                              return None
-                                      try:
-                                                    frame = self.camera.grab()
-                                                    if frame is not None:
-                                                                      self.last_capture = time.time()
-                                                                  return frame
-except Exception as e:
+        if not self._initialized:
+            if not self.initialize():
+                return None
+        try:
+            frame = self.camera.grab()
+            if frame is not None:
+                self.last_capture = time.time()
+            return frame
+        except Exception as e:
             logger.error(f"Capture error: {e}")
             return None
 
     def capture_region(self, x: int, y: int, width: int, height: int) -> Optional[np.ndarray]:
-              if not self._initialized:
-                            if not self.initialize():
-                                              return None
-                                      try:
-                                                    region = (x, y, x + width, y + height)
-                                                    frame = self.camera.grab(region=region)
-                                                    return frame
-except Exception as e:
+        if not self._initialized:
+            if not self.initialize():
+                return None
+        try:
+            region = (x, y, x + width, y + height)
+            frame = self.camera.grab(region=region)
+            return frame
+        except Exception as e:
             logger.error(f"Region capture error: {e}")
             return None
 
+    def capture_plan(self, plan: CapturePlan) -> Optional[RegionFrame]:
+        """
+        Read only the boxes of a capture plan, all from the same desktop frame.
+        BetterCam's grab(region) returns None for every grab after the first
+        on a frame, and one camera exists per output, so the boxes cannot be
+        grabbed one by one. Instead the new frame is acquired and mapped once
+        and each box is converted out of the mapped surface, touching only
+        the box pixels. When no new frame was presented the boxes of the
+        previous frame are still current and are reused.
+        """
+        if not self._initialized:
+            if not self.initialize():
+                return None
+        if self._plan_boxes != plan.boxes:
+            self._plan_boxes = plan.boxes
+            self._plan_images = []
+        try:
+            images = self._grab_boxes(plan.boxes)
+        except Exception as e:
+            logger.error(f"Plan capture error: {e}")
+            images = None
+        if images is not None:
+            self._plan_images = images
+        elif not self._plan_images:
+            return None
+        self.last_capture = time.time()
+        return RegionFrame(plan.boxes, list(self._plan_images), plan.screen_size)
+
+    def _grab_boxes(self, boxes: List[Box]) -> Optional[List[np.ndarray]]:
+        camera = self.camera
+        if not hasattr(camera, '_duplicator') or getattr(camera, 'rotation_angle', 0) != 0:
+            # No access to the duplication surface (or a rotated output): full grab and slice
+            frame = camera.grab()
+            if frame is None:
+                return None
+            return [frame[y:y + h, x:x + w].copy() for x, y, w, h in boxes]
+
+        # BetterCam's own _grab, with the mapped surface read once per box
+        duplicator = camera._duplicator
+        if not duplicator.update_frame():
+            camera._on_output_change()
+            return None
+        if not duplicator.updated:
+            return None
+        camera._device.im_context.CopyResource(camera._stagesurf.texture, duplicator.texture)
+        duplicator.release_frame()
+        rect = camera._stagesurf.map()
+        try:
+            pitch = int(rect.Pitch)
+            buffer = (ctypes.c_ubyte * (pitch * camera.height)).from_address(ctypes.addressof(rect.pBits.contents))
+            surface = np.ndarray((camera.height, pitch // 4, 4), np.uint8, buffer=buffer)
+            return [cv2.cvtColor(surface[y:y + h, x:x + w], cv2.COLOR_BGRA2BGR) for x, y, w, h in boxes]
+        finally:
+            camera._stagesurf.unmap()
+
     def capture_with_throttle(self) -> Optional[np.ndarray]:
-              current_time = time.time()
-              elapsed = current_time - self.last_capture
-              if elapsed < self.frame_time:
-                            return None
-                        return self.capture()
+        current_time = time.time()
+        elapsed = current_time - self.last_capture
+        if elapsed < self.frame_time:
+            return None
+        return self.capture()
 
     def release(self):
-              if self.camera:
-                            try:
-                                              self.camera.release()
-                                          except:
+        if self.camera:
+            try:
+                self.camera.release()
+            except:
                 pass
             self.camera = None
         self._initialized = False
         logger.info("FastCapture released")
 
     def __enter__(self):
-              self.initialize()
+        self.initialize()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-              self.release()
+        self.release()
 
 
 class AdaptiveCapture(FastCapture):
-      """Adaptive capture that adjusts FPS based on system load."""
+    """Adaptive capture that adjusts FPS based on system load."""
 
     def __init__(self, monitor: int = 0, min_fps: int = 1, max_fps: int = 5):
-              super().__init__(monitor, target_fps=max_fps)
+        super().__init__(monitor, target_fps=max_fps)
         self.min_fps = min_fps
         self.max_fps = max_fps
         self.current_fps = max_fps
@@ -102,49 +251,54 @@ class AdaptiveCapture(FastCapture):
         self._max_samples = 10
 
     def update_fps_from_load(self, cpu_percent: float, gpu_percent: float):
-              load = max(cpu_percent, gpu_percent) / 100.0
+        load = max(cpu_percent, gpu_percent) / 100.0
         self._load_samples.append(load)
         if len(self._load_samples) > self._max_samples:
-                      self._load_samples.pop(0)
-                  avg_load = sum(self._load_samples) / len(self._load_samples)
+            self._load_samples.pop(0)
+        avg_load = sum(self._load_samples) / len(self._load_samples)
         if avg_load > 0.8:
-                      self.current_fps = self.min_fps
-elif avg_load > 0.6:
+            self.current_fps = self.min_fps
+        elif avg_load > 0.6:
             self.current_fps = max(self.min_fps, self.max_fps // 2)
-else:
+        else:
             self.current_fps = self.max_fps
         self.target_fps = self.current_fps
         self.frame_time = 1.0 / self.current_fps
 
     def get_current_fps(self) -> int:
-              return self.current_fps
+        return self.current_fps
 
 
 class MockCapture:
-      """Mock capture for testing without a display."""
+    """Mock capture for testing without a display."""
 
     def __init__(self, width: int = 1920, height: int = 1080):
-              self.width = width
+        self.width = width
         self.height = height
+        self.screen_size = (width, height)
         self._initialized = True
 
     def initialize(self) -> bool:
-              return True
+        return True
 
     def capture(self) -> np.ndarray:
-              return np.random.randint(0, 255, (self.height, self.width, 3), dtype=np.uint8)
+        return np.random.randint(0, 255, (self.height, self.width, 3), dtype=np.uint8)
 
     def capture_region(self, x: int, y: int, width: int, height: int) -> np.ndarray:
-              return np.random.randint(0, 255, (height, width, 3), dtype=np.uint8)
+        return np.random.randint(0, 255, (height, width, 3), dtype=np.uint8)
+
+    def capture_plan(self, plan: CapturePlan) -> RegionFrame:
+        images = [self.capture_region(*box) for box in plan.boxes]
+        return RegionFrame(plan.boxes, images, (self.width, self.height))
 
     def capture_with_throttle(self) -> np.ndarray:
-              return self.capture()
+        return self.capture()
 
     def release(self):
-              pass
+        pass
 
     def __enter__(self):
-              return self
+        return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-              pass
+        pass
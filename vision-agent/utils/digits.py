@@ -0,0 +1,219 @@
+"""
+Digit Recognizer Module
+Template-matching recognizer for short numeric Fortnite HUD fields
+Runs in well under a millisecond on CPU; EasyOCR remains the fallback
+"""
+
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+import cv2
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+DIGITS = "0123456789"
+
+
+class DigitRecognizer:
+    """
+    Segments a binarized HUD field into glyphs and matches each glyph
+    against per-digit templates by normalized correlation.
+    """
+
+    GLYPH_SIZE = (12, 16)  # (width, height) of the normalized glyph
+    # (font scale, thickness) pairs the default templates are rendered at
+    RENDER_STYLES = ((0.35, 1), (0.45, 1), (0.6, 1), (0.8, 2), (1.0, 2))
+
+    def __init__(self, templates_path: Optional[str] = None, min_glyph_height: int = 6,
+                 min_margin: float = 0.08, confirm_reads: int = 3, min_agreement: float = 0.85,
+                 max_sample_weight: float = 0.2):
+        self.templates_path = templates_path
+        self.min_glyph_height = min_glyph_height
+        self.min_margin = min_margin
+        self.confirm_reads = confirm_reads
+        self.min_agreement = min_agreement
+        self.max_sample_weight = max_sample_weight
+        self._pending: Dict[int, deque] = {}
+        self._templates = np.zeros((0, self.GLYPH_SIZE[0] * self.GLYPH_SIZE[1]), np.float32)
+        self._labels = np.zeros(0, np.int32)
+        self._counts = np.zeros(len(DIGITS), np.int32)
+        self._render_default_templates()
+        if templates_path:
+            self.load(templates_path)
+
+    def recognize(self, binary: np.ndarray, allow_colon: bool = False) -> Tuple[str, float]:
+        """
+        Returns (text, confidence). Confidence is the weakest glyph's
+        correlation with its best template, scaled down when the runner-up
+        digit is within min_margin. 0.0 when nothing was found.
+        """
+        glyphs = self.segment(binary)
+        if not glyphs:
+            return "", 0.0
+        text = []
+        confidence = 1.0
+        for kind, vector in glyphs:
+            if kind == ':':
+                if not allow_colon:
+                    return "", 0.0
+                text.append(':')
+                continue
+            scores = self._templates @ vector
+            best = int(np.argmax(scores))
+            label = self._labels[best]
+            others = scores[self._labels != label]
+            margin = float(scores[best] - others.max()) if others.size else 1.0
+            score = float(scores[best]) * min(1.0, margin / self.min_margin)
+            text.append(DIGITS[label])
+            confidence = min(confidence, score)
+        return "".join(text), max(confidence, 0.0)
+
+    def segment(self, binary: np.ndarray) -> List[Tuple[str, np.ndarray]]:
+        if binary.ndim == 3:
+            binary = cv2.cvtColor(binary, cv2.COLOR_BGR2GRAY)
+        count, _, stats, _ = cv2.connectedComponentsWithStats((binary > 127).astype(np.uint8), connectivity=8)
+        boxes = [tuple(stats[i, :4]) for i in range(1, count) if stats[i, cv2.CC_STAT_AREA] >= 2]
+        if not boxes:
+            return []
+        tallest = max(h for _, _, _, h in boxes)
+        if tallest < self.min_glyph_height:
+            return []
+
+        digits = []
+        dots = []
+        for x, y, w, h in sorted(boxes):
+            if h >= tallest * 0.6:
+                if digits and x < digits[-1][0] + digits[-1][2] - 1:
+                    # Overlaps the previous glyph horizontally: a broken stroke
+                    px, py, pw, ph = digits[-1]
+                    nx, ny = min(px, x), min(py, y)
+                    digits[-1] = (nx, ny, max(px + pw, x + w) - nx, max(py + ph, y + h) - ny)
+                else:
+                    digits.append((x, y, w, h))
+            elif h <= tallest * 0.35 and w <= tallest * 0.35:
+                dots.append((x, y, w, h))
+
+        digits = self._split_wide(digits, tallest)
+
+        glyphs = []
+        previous_right = None
+        for x, y, w, h in digits:
+            if previous_right is not None and any(previous_right <= dx < x for dx, _, _, _ in dots):
+                glyphs.append((':', None))
+            glyphs.append(('digit', self._normalize(binary[y:y + h, x:x + w])))
+            previous_right = x + w
+        return glyphs
+
+    def learn(self, binary: np.ndarray, text: str) -> bool:
+        """
+        Queue glyphs from a trusted read (e.g. EasyOCR) for the templates.
+        A digit's learned template only moves once confirm_reads queued
+        glyphs agree with each other, and then by at most max_sample_weight,
+        so one misread can never replace a template. Returns True when a
+        template changed.
+        """
+        digits_only = [c for c in text if c.isdigit()]
+        glyphs = [vector for kind, vector in self.segment(binary) if kind == 'digit']
+        if not digits_only or len(glyphs) != len(digits_only):
+            return False
+        changed = False
+        for char, vector in zip(digits_only, glyphs):
+            idx = DIGITS.index(char)
+            pending = self._pending.setdefault(idx, deque(maxlen=self.confirm_reads))
+            pending.append(vector)
+            if len(pending) < self.confirm_reads:
+                continue
+            samples = np.array(pending)
+            centroid = samples.mean(axis=0)
+            centroid /= np.linalg.norm(centroid) or 1.0
+            if (samples @ centroid).min() < self.min_agreement:
+                continue  # a disagreeing read ages out of the buffer
+            pending.clear()
+            self._counts[idx] += 1
+            row = self._learned_row(idx)
+            weight = min(1.0 / self._counts[idx], self.max_sample_weight)
+            blended = (1.0 - weight) * self._templates[row] + weight * centroid
+            self._templates[row] = blended / (np.linalg.norm(blended) or 1.0)
+            changed = True
+        return changed
+
+    def save(self, path: Optional[str] = None) -> bool:
+        path = path or self.templates_path
+        if not path:
+            return False
+        try:
+            learned = [self._learned_row(idx) for idx in range(len(DIGITS)) if self._counts[idx]]
+            np.savez_compressed(path, templates=self._templates[learned],
+                                labels=self._labels[learned], counts=self._counts)
+            return True
+        except Exception as e:
+            logger.warning(f"Could not save digit templates: {e}")
+            return False
+
+    def load(self, path: str) -> bool:
+        try:
+            data = np.load(path)
+            templates = data['templates'].astype(np.float32)
+            if templates.ndim != 2 or templates.shape[1] != self._templates.shape[1]:
+                return False
+            self._templates = np.vstack([self._templates, templates])
+            self._labels = np.concatenate([self._labels, data['labels'].astype(np.int32)])
+            self._counts = data['counts'].astype(np.int32)
+            logger.info(f"Loaded digit templates from {path}")
+            return True
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.warning(f"Could not load digit templates: {e}")
+            return False
+
+    def _split_wide(self, boxes, tallest: int):
+        # Touching glyphs come out of dilation as one wide component
+        expected = tallest * self.GLYPH_SIZE[0] / self.GLYPH_SIZE[1]
+        split = []
+        for x, y, w, h in boxes:
+            pieces = int(round(w / expected)) if w > expected * 1.5 else 1
+            step = w / pieces
+            for i in range(pieces):
+                left = x + int(round(i * step))
+                right = x + int(round((i + 1) * step))
+                split.append((left, y, right - left, h))
+        return split
+
+    def _normalize(self, glyph: np.ndarray) -> np.ndarray:
+        h, w = glyph.shape[:2]
+        target_w = max(w, int(round(h * self.GLYPH_SIZE[0] / self.GLYPH_SIZE[1])))
+        if target_w > w:
+            left = (target_w - w) // 2
+            glyph = cv2.copyMakeBorder(glyph, 0, 0, left, target_w - w - left, cv2.BORDER_CONSTANT, value=0)
+        resized = cv2.resize(glyph, self.GLYPH_SIZE, interpolation=cv2.INTER_AREA).astype(np.float32).ravel()
+        resized -= resized.mean()
+        norm = np.linalg.norm(resized)
+        return resized / norm if norm > 0 else resized
+
+    def _learned_row(self, idx: int) -> int:
+        # Rows learned from real HUD glyphs sit after the rendered defaults
+        rows = np.flatnonzero(self._labels == idx)
+        if rows.size > len(self.RENDER_STYLES):
+            return int(rows[-1])
+        self._templates = np.vstack([self._templates, self._templates[rows[-1]]])
+        self._labels = np.append(self._labels, np.int32(idx))
+        return len(self._labels) - 1
+
+    def _render_default_templates(self):
+        # Rendered the way preprocess_for_numbers sees HUD text: binarized, 2x2 dilated
+        kernel = np.ones((2, 2), np.uint8)
+        templates, labels = [], []
+        for scale, thickness in self.RENDER_STYLES:
+            for idx, char in enumerate(DIGITS):
+                canvas = np.zeros((48, 40), np.uint8)
+                cv2.putText(canvas, char, (4, 38), cv2.FONT_HERSHEY_DUPLEX, scale, 255, thickness, cv2.LINE_AA)
+                _, binary = cv2.threshold(canvas, 127, 255, cv2.THRESH_BINARY)
+                binary = cv2.dilate(binary, kernel, iterations=1)
+                glyphs = [vector for kind, vector in self.segment(binary) if kind == 'digit']
+                if glyphs:
+                    templates.append(glyphs[0])
+                    labels.append(idx)
+        self._templates = np.array(templates, np.float32)
+        self._labels = np.array(labels, np.int32)
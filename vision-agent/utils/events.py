@@ -0,0 +1,229 @@
+"""
+Event Detection Module
+Derives discrete, debounced game events from consecutive GameStates and
+throttles full states while nothing on the HUD changes
+"""
+
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+from .state import GameState
+
+logger = logging.getLogger(__name__)
+
+Event = Tuple[str, Dict[str, Any]]  # (type, data)
+
+# A state is worth publishing when one of these differs from the last one sent;
+# timestamp, capture_fps and confidence change every frame and do not count
+PUBLISH_FIELDS = ('hp', 'shield', 'wood', 'brick', 'metal', 'storm_phase', 'storm_timer',
+                'alive_players', 'eliminations', 'surge_active', 'surge_text')
+
+
+class _StreamMemory:
+    """What the detector remembers about one stream between states."""
+
+    def __init__(self):
+        self.health = deque()  # (timestamp, hp + shield) inside the drop window
+        self.streaks: Dict[str, int] = {}
+        self.confirmed: Dict[str, Any] = {}
+        self.candidates: Dict[str, tuple] = {}
+        self.armed = {'low_hp': True, 'low_mats': True}
+        self.alive_fired = set()
+        self.surge_since: Optional[float] = None
+        self.surge_seen: Optional[float] = None
+        self.published_key: Optional[tuple] = None
+        self.published_at = 0.0
+
+
+class EventDetector:
+    """
+    Turns the state stream into typed events for the bot: hp_drop, low_hp,
+    storm_phase, surge_warning, surge_end, low_mats, alive_threshold and
+    elimination. A condition must hold for confirm_frames states before it
+    fires, and threshold events re-arm only past a hysteresis band, so one
+    misread frame or a value hovering at a threshold does not spam the bot.
+
+    process() sends the events over the bridge and tells the caller whether
+    the full state is worth sending too: only when it changed, when an event
+    fired, or every heartbeat seconds as a keep-alive.
+    """
+
+    def __init__(self, config: Dict[str, Any] = None, bridge=None, metrics=None):
+        config = config or {}
+        self.bridge = bridge
+        self.confirm_frames = max(config.get('confirm_frames', 2), 1)
+        self.hp_drop = config.get('hp_drop', 30)
+        self.hp_drop_window = config.get('hp_drop_window', 2.0)
+        # Defaults follow GameState.is_low_hp / is_low_mats
+        self.low_hp = config.get('low_hp', 100)
+        self.hp_hysteresis = config.get('hp_hysteresis', 20)
+        self.low_mats = config.get('low_mats', 300)
+        self.mats_hysteresis = config.get('mats_hysteresis', 100)
+        self.alive_thresholds = sorted(config.get('alive_thresholds', [50, 25, 10, 5]), reverse=True)
+        self.surge_clear = config.get('surge_clear', 2.0)
+        self.throttle_states = config.get('throttle_states', True)
+        self.heartbeat = config.get('heartbeat', 2.0)
+        self._streams: Dict[Optional[str], _StreamMemory] = {}
+        self.events_detected: Dict[str, int] = {}
+        self.states_throttled = 0
+        if metrics is not None:
+            metrics.register_collector(self._collect_metrics)
+
+    def reset(self, stream_id: Optional[str] = None):
+        self._streams.pop(stream_id, None)
+
+    def process(self, state: GameState) -> bool:
+        """Publish the events state triggers; True when the state itself should be sent."""
+        events = self.detect(state)
+        if self.bridge is not None:
+            for event_type, data in events:
+                self.bridge.send_event(event_type, data)
+        return self._should_publish(state, bool(events))
+
+    def detect(self, state: GameState) -> List[Event]:
+        memory = self._streams.get(state.stream_id)
+        if memory is None:
+            memory = self._streams[state.stream_id] = _StreamMemory()
+        events: List[Event] = []
+        self._detect_health(memory, state, events)
+        self._detect_counts(memory, state, events)
+        self._detect_surge(memory, state, events)
+        self._detect_mats(memory, state, events)
+        for event_type, data in events:
+            data['stream_id'] = state.stream_id
+            data['timestamp'] = state.timestamp
+            self.events_detected[event_type] = self.events_detected.get(event_type, 0) + 1
+            logger.debug(f"Event {event_type}: {data}")
+        return events
+
+    def stats(self) -> Dict[str, Any]:
+        return {'events': dict(self.events_detected), 'states_throttled': self.states_throttled}
+
+    def _held(self, memory: _StreamMemory, key: str, condition: bool) -> bool:
+        """True once condition has been true for confirm_frames states in a row."""
+        streak = memory.streaks.get(key, 0) + 1 if condition else 0
+        memory.streaks[key] = streak
+        return streak >= self.confirm_frames
+
+    def _change(self, memory: _StreamMemory, name: str, value: Optional[int]) -> Optional[tuple]:
+        """(previous, value) once a new value of name has been read confirm_frames times."""
+        if value is None:
+            return None
+        previous = memory.confirmed.get(name)
+        if previous is None or value == previous:
+            memory.confirmed[name] = value
+            memory.candidates.pop(name, None)
+            return None
+        candidate, count = memory.candidates.get(name, (None, 0))
+        count = count + 1 if candidate == value else 1
+        if count < self.confirm_frames:
+            memory.candidates[name] = (value, count)
+            return None
+        memory.candidates.pop(name, None)
+        memory.confirmed[name] = value
+        return previous, value
+
+    def _detect_health(self, memory: _StreamMemory, state: GameState, events: List[Event]):
+        if state.hp is None:
+            return
+        health = state.effective_hp
+        now = state.timestamp
+        memory.health.append((now, health))
+        while memory.health and now - memory.health[0][0] > self.hp_drop_window:
+            memory.health.popleft()
+        peak = max(value for _, value in memory.health)
+        if self._held(memory, 'hp_drop', peak - health >= self.hp_drop):
+            started = next(t for t, value in memory.health if value == peak)
+            events.append(('hp_drop', {'hp': state.hp, 'shield': state.shield, 'lost': peak - health,
+                                       'seconds': round(now - started, 2)}))
+            # Damage after this counts towards a new drop
+            memory.health.clear()
+            memory.health.append((now, health))
+            memory.streaks['hp_drop'] = 0
+
+        if memory.armed['low_hp']:
+            if self._held(memory, 'low_hp', health < self.low_hp):
+                events.append(('low_hp', {'hp': state.hp, 'shield': state.shield, 'effective_hp': health}))
+                memory.armed['low_hp'] = False
+        elif health >= self.low_hp + self.hp_hysteresis:
+            memory.armed['low_hp'] = True
+            memory.streaks['low_hp'] = 0
+
+    def _detect_counts(self, memory: _StreamMemory, state: GameState, events: List[Event]):
+        alive = self._change(memory, 'alive_players', state.alive_players)
+        eliminations = self._change(memory, 'eliminations', state.eliminations)
+        if (alive and alive[1] > alive[0]) or (eliminations and eliminations[1] < eliminations[0]):
+            # Counts only move one way within a match: this is a new one
+            self._new_match(memory)
+            alive = eliminations = None
+
+        alive_players = memory.confirmed.get('alive_players')
+        if alive_players is not None:
+            crossed = [t for t in self.alive_thresholds if alive_players <= t and t not in memory.alive_fired]
+            if crossed:
+                memory.alive_fired.update(crossed)
+                events.append(('alive_threshold', {'alive_players': alive_players, 'threshold': crossed[-1]}))
+
+        if eliminations:
+            events.append(('elimination', {'eliminations': eliminations[1],
+                                           'gained': eliminations[1] - eliminations[0]}))
+
+        phase = self._change(memory, 'storm_phase', state.storm_phase)
+        if phase and phase[1] > phase[0]:
+            events.append(('storm_phase', {'phase': phase[1], 'previous': phase[0],
+                                           'storm_timer': state.storm_timer}))
+
+    def _new_match(self, memory: _StreamMemory):
+        logger.info("Counts went backwards; treating it as a new match")
+        memory.alive_fired.clear()
+        memory.armed = {'low_hp': True, 'low_mats': True}
+        memory.health.clear()
+        memory.streaks.clear()
+        memory.confirmed.pop('storm_phase', None)
+        memory.candidates.clear()
+
+    def _detect_surge(self, memory: _StreamMemory, state: GameState, events: List[Event]):
+        now = state.timestamp
+        if memory.surge_since is None:
+            if self._held(memory, 'surge', state.surge_active):
+                memory.surge_since = memory.surge_seen = now
+                events.append(('surge_warning', {'text': state.surge_text}))
+            return
+        if state.surge_active:
+            memory.surge_seen = now
+        elif now - memory.surge_seen >= self.surge_clear:
+            # The banner flickers with the HUD; it has to stay gone to end the surge
+            events.append(('surge_end', {'duration': round(memory.surge_seen - memory.surge_since, 2)}))
+            memory.surge_since = memory.surge_seen = None
+            memory.streaks['surge'] = 0
+
+    def _detect_mats(self, memory: _StreamMemory, state: GameState, events: List[Event]):
+        if state.wood is None and state.brick is None and state.metal is None:
+            return
+        total = state.total_mats
+        if memory.armed['low_mats']:
+            if self._held(memory, 'low_mats', total < self.low_mats):
+                events.append(('low_mats', {'total': total, 'wood': state.wood, 'brick': state.brick,
+                                            'metal': state.metal}))
+                memory.armed['low_mats'] = False
+        elif total >= self.low_mats + self.mats_hysteresis:
+            memory.armed['low_mats'] = True
+            memory.streaks['low_mats'] = 0
+
+    def _should_publish(self, state: GameState, evented: bool) -> bool:
+        memory = self._streams[state.stream_id]
+        key = tuple(getattr(state, name) for name in PUBLISH_FIELDS)
+        if (self.throttle_states and not evented and key == memory.published_key
+                and state.timestamp - memory.published_at < self.heartbeat):
+            self.states_throttled += 1
+            return False
+        memory.published_key = key
+        memory.published_at = state.timestamp
+        return True
+
+    def _collect_metrics(self):
+        samples = [('vision_states_throttled_total', 'counter', {}, self.states_throttled)]
+        for event_type, count in self.events_detected.items():
+            samples.append(('vision_events_detected_total', 'counter', {'type': event_type}, count))
+        return samples
@@ -5,191 +5,521 @@ Provides structured data for the Discord bot analyzer
 """
 
 import time
-import json
-from dataclasses import dataclass, asdict, field
-from typing import Optional, Dict, Any
+from collections import deque
+from typing import Callable, Optional, Dict, Any
 import numpy as np
 import logging
 
-from .capture import FastCapture, AdaptiveCapture
+from .capture import FastCapture, AdaptiveCapture, CapturePlan, RegionFrame
 from .ocr import FortniteOCR
+from .cache import RegionCache
+from .scheduler import FieldScheduler
+from .preprocess import GrayConverter
+from .recorder import FrameRecorder, ReplayCapture
+from .regions import FIELD_REGIONS, RegionPlan
+from .state import GameState
+from .workers import OCRWorkerPool
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
-class GameState:
-      """Complete Fortnite game state extracted from screen."""
-      hp: Optional[int] = None
-      shield: Optional[int] = None
-      wood: Optional[int] = None
-      brick: Optional[int] = None
-      metal: Optional[int] = None
-      storm_phase: Optional[int] = None
-      storm_timer: Optional[str] = None
-      storm_seconds: Optional[int] = None
-      alive_players: Optional[int] = None
-      eliminations: Optional[int] = None
-      surge_active: bool = False
-      surge_text: str = ""
-      timestamp: float = field(default_factory=time.time)
-      capture_fps: float = 0.0
-      confidence: float = 0.0
-
-    def to_dict(self) -> Dict[str, Any]:
-              return asdict(self)
-
-    def to_json(self) -> str:
-              return json.dumps(self.to_dict())
-
-    @property
-    def total_mats(self) -> int:
-              return (self.wood or 0) + (self.brick or 0) + (self.metal or 0)
-
-    @property
-    def effective_hp(self) -> int:
-              return (self.hp or 0) + (self.shield or 0)
-
-    @property
-    def is_low_hp(self) -> bool:
-              return self.effective_hp < 100
-
-    @property
-    def is_low_mats(self) -> bool:
-              return self.total_mats < 300
-
-
 class StateExtractor:
-      """Extracts game state from Fortnite screen."""
-
-    def __init__(self, config: Dict[str, Any]):
-              self.config = config
-              self.regions = config.get('regions', {})
-              capture_config = config.get('capture', {})
-              ocr_config = config.get('ocr', {})
-
-        if capture_config.get('adaptive_fps', True):
-                      self.capture = AdaptiveCapture(
-                                        monitor=capture_config.get('monitor_index', 0),
-                                        min_fps=capture_config.get('min_fps', 1),
-                                        max_fps=capture_config.get('max_fps', 5)
-                      )
-else:
-              self.capture = FastCapture(
-                                monitor=capture_config.get('monitor_index', 0),
-                                target_fps=capture_config.get('target_fps', 3)
-              )
-
-        self.ocr = FortniteOCR(
-                      gpu=ocr_config.get('gpu', True),
-                      languages=ocr_config.get('languages', ['en'])
-        )
+    """Extracts game state from Fortnite screen."""
+
+    FIELD_REGIONS = FIELD_REGIONS
+
+    def __init__(self, config: Dict[str, Any], capture=None, metrics=None,
+                 ocr: Optional[FortniteOCR] = None, stream_id: Optional[str] = None):
+        self.config = config
+        self.metrics = metrics
+        self.stream_id = stream_id
+        self.regions = config.get('regions', {})
+        capture_config = config.get('capture', {})
+        # Resolution pixel regions were authored at; None means use them as-is
+        self.base_resolution = capture_config.get('base_resolution')
+        self.region_capture = capture_config.get('region_capture', False)
+        self.merge_gap = capture_config.get('merge_gap', 32)
+        ocr_config = config.get('ocr', {})
+        detection_config = config.get('detection', {})
+
+        if capture is not None:
+            self.capture = capture
+        elif capture_config.get('replay'):
+            self.capture = ReplayCapture(
+                capture_config['replay'],
+                realtime=capture_config.get('replay_realtime', True),
+                loop=capture_config.get('replay_loop', False)
+            )
+        elif capture_config.get('adaptive_fps', True):
+            self.capture = AdaptiveCapture(
+                monitor=capture_config.get('monitor_index', 0),
+                min_fps=capture_config.get('min_fps', 1),
+                max_fps=capture_config.get('max_fps', 5)
+            )
+        else:
+            self.capture = FastCapture(
+                monitor=capture_config.get('monitor_index', 0),
+                target_fps=capture_config.get('target_fps', 3)
+            )
+
+        # With worker processes the EasyOCR model lives in the workers only; the
+        # in-process engine reads digits until the first worker is up
+        worker_count = ocr_config.get('workers', 0) if ocr is None else 0
+        self.pool: Optional[OCRWorkerPool] = None
+        if worker_count > 0 and not ocr_config.get('fallback', True):
+            logger.warning("ocr.workers ignored: worker processes only run the EasyOCR fallback")
+        elif worker_count > 0:
+            self.pool = OCRWorkerPool(config, workers=worker_count,
+                                      timeout=ocr_config.get('worker_timeout', 2.0))
+        # An engine passed in is shared with other extractors and owned by the caller
+        self._owns_ocr = ocr is None
+        self.ocr = ocr or FortniteOCR.from_config(config, metrics=metrics,
+                                                  fallback=False if self.pool is not None else None)
+        self.batch_mode = ocr_config.get('batch_mode', False)
+        self.background_load = ocr_config.get('background_load', True)
+        self.warmup = ocr_config.get('warmup', True)
+        self.recorder = FrameRecorder(capture_config['record']) if capture_config.get('record') else None
+
+        cache_config = config.get('cache', {})
+        self.cache: Optional[RegionCache] = None
+        if cache_config.get('enabled', True):
+            self.cache = RegionCache(
+                max_entries=cache_config.get('max_entries', 8),
+                tolerance=cache_config.get('tolerance', 3)
+            )
+
+        schedule_config = config.get('schedule', {})
+        self.scheduler: Optional[FieldScheduler] = None
+        if schedule_config.get('enabled', False):
+            self.scheduler = FieldScheduler([name for name, _, _ in self.FIELD_REGIONS], schedule_config)
+
+        keywords = detection_config.get('surge_keywords', ['SURGE', 'DAMAGE'])
+        self._surge_keywords = keywords
+        self._readers = {
+            'number': lambda image, region: self.ocr.read_number(image, region=region),
+            'time': lambda image, region: self.ocr.read_time(image, region=region),
+            'surge': lambda image, region: self.ocr.detect_surge_warning(image, keywords, region=region),
+        }
+
+        self.plan: Optional[RegionPlan] = None
+        self.capture_plan: Optional[CapturePlan] = None
+        self._compile(self._screen_size())
 
         self.last_state: Optional[GameState] = None
-        self._frame_times = []
+        self.last_refreshed = frozenset()
+        # Confidence of the read behind each field's current value; carried fields keep theirs
+        self._confidences: Dict[str, float] = {}
+        # Called with readiness() whenever the OCR engine's status changes
+        self.on_readiness: Optional[Callable[[Dict[str, Any]], None]] = None
+        self._ocr_status = self._ocr_engine_status()
+        self._capture_times = deque(maxlen=30)
+        if metrics is not None:
+            metrics.register_collector(self._collect_metrics)
 
     def initialize(self) -> bool:
-              capture_ok = self.capture.initialize()
-              ocr_ok = self.ocr.initialize()
-              if capture_ok and ocr_ok:
-                            logger.info("StateExtractor initialized successfully")
-                            return True
-                        logger.error("StateExtractor initialization failed")
+        capture_ok = self.capture.initialize()
+        screen_size = self._screen_size()
+        if screen_size != self.plan.frame_size:
+            self._compile(screen_size)
+        warmup_shapes = self.plan.roi_shapes if self.warmup else []
+        ocr_ok = True
+        if self._owns_ocr:
+            ocr_ok = self.ocr.initialize(background=self.background_load, warmup_shapes=warmup_shapes)
+        if self.pool is not None:
+            ocr_ok = self.pool.start(warmup_shapes)
+        self._ocr_status = self._ocr_engine_status()
+        if capture_ok and ocr_ok:
+            logger.info("StateExtractor initialized successfully")
+            return True
+        logger.error("StateExtractor initialization failed")
         return False
 
-    def extract_state(self) -> Optional[GameState]:
-              start_time = time.time()
-        frame = self.capture.capture()
-        if frame is None:
-                      return None
-
-        state = GameState()
-        state.timestamp = start_time
-        state.hp = self._extract_number(frame, 'hp')
-        state.shield = self._extract_number(frame, 'shield')
-
-        mat_regions = self.regions.get('materials', {})
-        if mat_regions:
-                      state.wood = self._extract_number_from_config(frame, mat_regions.get('wood'))
-                      state.brick = self._extract_number_from_config(frame, mat_regions.get('brick'))
-                      state.metal = self._extract_number_from_config(frame, mat_regions.get('metal'))
-
-        storm_timer_text = self._extract_time(frame, 'storm_timer')
-        if storm_timer_text:
-                      state.storm_timer = storm_timer_text
-                      state.storm_seconds = self._timer_to_seconds(storm_timer_text)
-
-        state.storm_phase = self._extract_number(frame, 'storm_phase')
-        state.alive_players = self._extract_number(frame, 'player_count')
-        state.eliminations = self._extract_number(frame, 'elimination_count')
-
-        surge_result = self._check_surge(frame)
-        state.surge_active = surge_result.get('detected', False)
-        state.surge_text = surge_result.get('text', '')
+    def _screen_size(self):
+        size = getattr(self.capture, 'screen_size', None) or self.base_resolution or (1920, 1080)
+        return (int(size[0]), int(size[1]))
+
+    def _compile(self, frame_size):
+        """Resolve the regions for one frame size; the hot loop only touches the result."""
+        self.plan = RegionPlan.compile(self.regions, frame_size, self.base_resolution)
+        self._region_readers = tuple(self._readers[region.kind] for region in self.plan.regions)
+        self.capture_plan = None
+        if self.region_capture:
+            self.capture_plan = CapturePlan.from_boxes(self.plan.boxes, self.merge_gap, frame_size)
+            logger.info(f"Region capture: {len(self.capture_plan.boxes)} boxes, "
+                        f"{self.capture_plan.pixel_count} px per frame at {frame_size[0]}x{frame_size[1]}")
+
+        # Digit regions are read from one gray conversion per capture box per frame
+        gray_plan = self.capture_plan or CapturePlan.from_boxes(
+            [region.box for region in self.plan.regions if region.kind != 'surge'],
+            self.merge_gap, frame_size
+        )
+        self.gray = GrayConverter(gray_plan)
+        self._gray_slots = self.plan.bind(gray_plan.boxes)
+        self._frame_slots = self.plan.bind(self.capture_plan.boxes) if self.capture_plan else None
+        if self.pool is not None:
+            self.pool.configure([shape + (3,) if region.kind == 'surge' else shape
+                                 for region, shape in zip(self.plan.regions, self.plan.roi_shapes)])
+        if self.cache is not None:
+            self.cache.invalidate()
+
+    def set_preprocess_tier(self, tier: int):
+        self.ocr.set_preprocess_tier(tier)
+        if self.pool is not None:
+            self.pool.set_preprocess_tier(tier)
+
+    def unload_fallback(self) -> bool:
+        """Stop the OCR workers or drop the in-process fallback model; digits only from then on."""
+        if self.pool is not None and self.pool.ready_workers:
+            self.pool.stop()
+            self.pool.status = 'digits_only'
+            logger.warning("Stopped the OCR worker pool; reading digits only")
+            return True
+        return self.ocr.unload_fallback()
+
+    def _frame_size(self, frame):
+        if isinstance(frame, RegionFrame):
+            return frame.screen_size and tuple(frame.screen_size)
+        return (frame.shape[1], frame.shape[0])
+
+    def readiness(self) -> Dict[str, Any]:
+        """
+        'partial' while EasyOCR loads (digit-recognizer fields and the surge
+        gate are live), 'ready' once it is up or not needed, 'degraded' if
+        it failed to load.
+        """
+        status = self._ocr_engine_status()
+        if status == 'loading':
+            agent = 'partial'
+        elif status == 'failed':
+            agent = 'degraded'
+        elif status in ('ready', 'digits_only'):
+            agent = 'ready'
+        else:
+            agent = 'starting'
+        return {
+            'status': agent,
+            'ocr': status,
+            'ocr_load_seconds': round((self.pool or self.ocr).load_seconds, 2),
+        }
+
+    def _ocr_engine_status(self) -> str:
+        if self.pool is not None:
+            self.pool.poll()
+            return self.pool.status
+        return self.ocr.status
+
+    def _check_readiness(self):
+        status = self._ocr_engine_status()
+        if status == self._ocr_status:
+            return
+        self._ocr_status = status
+        if status == 'ready' and self.cache is not None:
+            # Entries stored while loading hold digit-only misses the fallback can now read
+            self.cache.invalidate()
+        if self.on_readiness is not None:
+            self.on_readiness(self.readiness())
+
+    def grab_frame(self):
+        """Full-screen frame, or a RegionFrame of just the HUD boxes in region_capture mode."""
+        started = time.perf_counter()
+        if self.capture_plan is not None:
+            frame = self.capture.capture_plan(self.capture_plan)
+        else:
+            frame = self.capture.capture()
+        if self.metrics is not None:
+            if frame is not None:
+                self.metrics.observe('vision_capture_seconds', time.perf_counter() - started)
+            elif not self.capture_exhausted:
+                self.metrics.inc('vision_capture_misses_total')
+        if frame is not None and self.recorder is not None:
+            self.recorder.write(frame, self.capture_time())
+        return frame
+
+    def capture_time(self) -> float:
+        """Timestamp of the last grabbed frame; recorded time when replaying."""
+        return getattr(self.capture, 'last_capture', 0) or time.time()
 
-        elapsed = time.time() - start_time
-        self._frame_times.append(elapsed)
-        if len(self._frame_times) > 30:
-                      self._frame_times.pop(0)
+    @property
+    def capture_exhausted(self) -> bool:
+        return getattr(self.capture, 'exhausted', False)
 
-        avg_time = sum(self._frame_times) / len(self._frame_times)
-        state.capture_fps = 1.0 / avg_time if avg_time > 0 else 0
+    def extract_state(self) -> Optional[GameState]:
+        frame = self.grab_frame()
+        if frame is None:
+            return None
+        return self.extract_frame(frame, self.capture_time())
+
+    def extract_frame(self, frame: np.ndarray, captured_at: Optional[float] = None) -> GameState:
+        """Extract state from an already captured frame (used by the pipelined mode)."""
+        started = time.perf_counter()
+        state, gray, fields = self.begin_frame(frame, captured_at)
+        if self.pool is not None and self.pool.ready:
+            self._extract_parallel(frame, gray, state, fields)
+        elif self.batch_mode:
+            self._extract_batched(frame, gray, state, fields)
+        else:
+            self._extract_sequential(frame, gray, state, fields)
+        return self.finish_frame(state, fields, started)
+
+    def begin_frame(self, frame, captured_at: Optional[float] = None):
+        """
+        First half of extract_frame: (state, gray, fields), with the fields the
+        scheduler skips this frame already carried forward. fields is None
+        when every field is read.
+        """
+        self._check_readiness()
+        frame_size = self._frame_size(frame)
+        if frame_size and frame_size != self.plan.frame_size:
+            logger.info(f"Frame size changed to {frame_size[0]}x{frame_size[1]}, recompiling regions")
+            self._compile(frame_size)
+        state = GameState(stream_id=self.stream_id)
+        state.timestamp = captured_at if captured_at is not None else time.time()
+
+        fields = None
+        if self.scheduler is not None:
+            fields = set(self.scheduler.plan(state.timestamp))
+            self._carry_forward(state, fields)
+
+        if self.metrics is not None:
+            with self.metrics.timer('vision_preprocess_seconds', region='frame'):
+                gray = self.gray.convert(frame)
+        else:
+            gray = self.gray.convert(frame)
+        return state, gray, fields
+
+    def finish_frame(self, state: GameState, fields, started: float) -> GameState:
+        self.last_refreshed = frozenset(fields if fields is not None else
+                                        (name for name, _, _ in self.FIELD_REGIONS))
+        if self._confidences:
+            state.confidence = round(sum(self._confidences.values()) / len(self._confidences), 3)
+
+        # Rate frames actually arrive at, over the last 30 captures
+        self._capture_times.append(state.timestamp)
+        span = self._capture_times[-1] - self._capture_times[0]
+        state.capture_fps = (len(self._capture_times) - 1) / span if span > 0 else 0.0
+        if self.metrics is not None:
+            self.metrics.observe('vision_extract_seconds', time.perf_counter() - started)
 
         self.last_state = state
         return state
 
-    def _extract_number(self, frame: np.ndarray, region_name: str) -> Optional[int]:
-              region = self.regions.get(region_name)
-        if not region:
-                      return None
-                  return self._extract_number_from_config(frame, region)
-
-    def _extract_number_from_config(self, frame: np.ndarray, region: Dict) -> Optional[int]:
-              if not region:
-                            return None
-                        x, y = region.get('x', 0), region.get('y', 0)
-        w, h = region.get('width', 100), region.get('height', 50)
-        roi = frame[y:y+h, x:x+w]
-        if roi.size == 0:
-                      return None
-                  return self.ocr.read_number(roi)
-
-    def _extract_time(self, frame: np.ndarray, region_name: str) -> Optional[str]:
-              region = self.regions.get(region_name)
-        if not region:
-                      return None
-                  x, y = region.get('x', 0), region.get('y', 0)
-        w, h = region.get('width', 100), region.get('height', 50)
-        roi = frame[y:y+h, x:x+w]
-        if roi.size == 0:
-                      return None
-                  time_result = self.ocr.read_time(roi)
-        if time_result:
-                      return f"{time_result[0]}:{time_result[1]:02d}"
-                  return None
+    def _extract_sequential(self, frame: np.ndarray, gray, state: GameState, fields=None):
+        for index, region in enumerate(self.plan.regions):
+            if fields is not None and region.field not in fields:
+                continue
+            started = time.perf_counter()
+            roi = self._roi(frame, gray, index, region.kind)
+            if roi is not None:
+                value, confidence = self._read_cached(region.name, roi, self._region_readers[index], region.field)
+                self._apply_read(state, region.field, value, confidence)
+            if self.scheduler is not None:
+                self.scheduler.record(region.field, state.timestamp, time.perf_counter() - started)
+
+    def _extract_batched(self, frame: np.ndarray, gray, state: GameState, fields=None):
+        started = time.perf_counter()
+        batch = self.collect_batch(frame, gray, state, fields)
+        fresh = self.ocr.read_regions(batch[0], self._surge_keywords)
+        self.apply_batch(state, fresh, batch, fields, time.perf_counter() - started)
+
+    def collect_batch(self, frame, gray, state: GameState, fields=None):
+        """
+        ROIs of this frame that need the recognizer, as (rois, names,
+        fingerprints) with rois in read_regions form. Cache hits are applied
+        to state right away.
+        """
+        rois = {}
+        fingerprints = {}
+        names = {}
+        for index, region in enumerate(self.plan.regions):
+            if fields is not None and region.field not in fields:
+                continue
+            roi = self._roi(frame, gray, index, region.kind)
+            if roi is None:
+                continue
+            if self.cache is not None:
+                fingerprints[region.field] = self.cache.fingerprint(roi)
+                hit, cached = self.cache.lookup(region.name, fingerprints[region.field])
+                if hit:
+                    self._apply_read(state, region.field, *cached)
+                    continue
+            rois[region.field] = (roi, region.kind)
+            names[region.field] = region.name
+        return rois, names, fingerprints
+
+    def apply_batch(self, state: GameState, fresh: Dict[str, Any], batch, fields, elapsed: float,
+                    confidences: Optional[Dict[str, float]] = None):
+        """
+        Store and apply read_regions results for a collect_batch batch.
+        confidences defaults to the engine's, for ROIs read under their field name.
+        """
+        _, names, fingerprints = batch
+        if confidences is None:
+            confidences = self.ocr.last_confidence
+        for field_name, value in fresh.items():
+            confidence = confidences.get(field_name, 0.0)
+            if self.cache is not None:
+                self.cache.store(names[field_name], fingerprints[field_name], (value, confidence))
+            self._apply_read(state, field_name, value, confidence)
+
+        if self.scheduler is not None and fields:
+            # One recognizer call served every field; split its cost evenly
+            share = elapsed / len(fields)
+            for field_name in fields:
+                self.scheduler.record(field_name, state.timestamp, share)
+
+    def _extract_parallel(self, frame: np.ndarray, gray, state: GameState, fields=None):
+        started = time.perf_counter()
+        rois = []
+        names = {}
+        fingerprints = {}
+        fresh = {}
+        confidences = {}
+        for index, region in enumerate(self.plan.regions):
+            if fields is not None and region.field not in fields:
+                continue
+            roi = self._roi(frame, gray, index, region.kind)
+            if roi is None:
+                continue
+            if self.cache is not None:
+                fingerprints[region.field] = self.cache.fingerprint(roi)
+                hit, cached = self.cache.lookup(region.name, fingerprints[region.field])
+                if hit:
+                    self._apply_read(state, region.field, *cached)
+                    continue
+            # Confident digit reads and closed surge gates cost less than the round trip
+            if region.kind == 'surge':
+                value = None if self.ocr.surge_gate_open(roi, region.name) else {'detected': False, 'text': ''}
+                confidences[region.field] = 1.0
+            else:
+                value = self.ocr.read_digits(roi, region.kind, region.name)
+                confidences[region.field] = self.ocr.last_confidence.get(region.name, 0.0)
+            if value is not None:
+                fresh[region.field] = value
+            else:
+                rois.append((region.field, region.name, region.kind, index, roi))
+            names[region.field] = region.name
+        if rois and self.metrics is not None:
+            with self.metrics.timer('vision_ocr_seconds', region='pool', engine='workers'):
+                fresh.update(self.pool.read(rois))
+        elif rois:
+            fresh.update(self.pool.read(rois))
+        for field_name, _, _, _, _ in rois:
+            confidences[field_name] = self.pool.last_confidence.get(field_name, 0.0)
+        for field_name, value in fresh.items():
+            if self.cache is not None:
+                self.cache.store(names[field_name], fingerprints[field_name], (value, confidences[field_name]))
+            self._apply_read(state, field_name, value, confidences[field_name])
+
+        if self.scheduler is not None and fields:
+            # Workers decode concurrently; split the wall time like a batch
+            share = (time.perf_counter() - started) / len(fields)
+            for field_name in fields:
+                self.scheduler.record(field_name, state.timestamp, share)
+
+    def _apply_read(self, state: GameState, field_name: str, value: Any, confidence: float):
+        self._confidences[field_name] = confidence
+        self._apply_value(state, field_name, value)
+
+    def _apply_value(self, state: GameState, field_name: str, value: Any):
+        if field_name == 'surge':
+            state.surge_active = value.get('detected', False)
+            state.surge_text = value.get('text', '')
+        elif field_name == 'storm_timer':
+            if value:
+                state.storm_timer = f"{value[0]}:{value[1]:02d}"
+                state.storm_seconds = self._timer_to_seconds(state.storm_timer)
+        else:
+            setattr(state, field_name, value)
+
+    def _carry_forward(self, state: GameState, refreshed):
+        previous = self.last_state
+        if previous is None:
+            return
+        for field_name, _, _ in self.FIELD_REGIONS:
+            if field_name in refreshed:
+                continue
+            if field_name == 'surge':
+                state.surge_active = previous.surge_active
+                state.surge_text = previous.surge_text
+            elif field_name == 'storm_timer':
+                state.storm_timer = previous.storm_timer
+                state.storm_seconds = previous.storm_seconds
+            else:
+                setattr(state, field_name, getattr(previous, field_name))
+
+    def _roi(self, frame: np.ndarray, gray, index: int, kind: str) -> Optional[np.ndarray]:
+        """Gray view for digit regions, color crop for the surge banner."""
+        if kind != 'surge':
+            roi = self.plan.view(gray, index, self._gray_slots)
+            if roi is not None:
+                return roi
+        return self.plan.view(frame, index, self._frame_slots)
+
+    def _read_cached(self, name: Optional[str], roi: np.ndarray, read, field_name: Optional[str] = None):
+        """(value, confidence); the cache keeps the confidence of the read it stores."""
+        if self.cache is None or name is None:
+            value = read(roi, field_name)
+            return value, self.ocr.last_confidence.get(field_name, 0.0)
+        fingerprint = self.cache.fingerprint(roi)
+        hit, cached = self.cache.lookup(name, fingerprint)
+        if hit:
+            return cached
+        cached = (read(roi, field_name), self.ocr.last_confidence.get(field_name, 0.0))
+        self.cache.store(name, fingerprint, cached)
+        return cached
 
     def _timer_to_seconds(self, timer_str: str) -> Optional[int]:
-              try:
-                            parts = timer_str.split(':')
-                            if len(parts) == 2:
-                                              return int(parts[0]) * 60 + int(parts[1])
-                                      except:
+        try:
+            parts = timer_str.split(':')
+            if len(parts) == 2:
+                return int(parts[0]) * 60 + int(parts[1])
+        except:
             pass
         return None
 
-    def _check_surge(self, frame: np.ndarray) -> Dict[str, Any]:
-              region = self.regions.get('surge_warning')
-        if not region:
-                      return {'detected': False, 'text': ''}
-        x, y = region.get('x', 0), region.get('y', 0)
-        w, h = region.get('width', 100), region.get('height', 50)
-        roi = frame[y:y+h, x:x+w]
-        if roi.size == 0:
-                      return {'detected': False, 'text': ''}
-        keywords = self.config.get('detection', {}).get('surge_keywords', ['SURGE', 'DAMAGE'])
-        return self.ocr.detect_surge_warning(roi, keywords)
+    def _collect_metrics(self):
+        samples = [
+            ('vision_ocr_ready', 'gauge', {}, int(self.ocr.ready)),
+            ('vision_digit_reads_total', 'counter', {'result': 'hit'}, self.ocr.digit_hits),
+            ('vision_digit_reads_total', 'counter', {'result': 'fallback'}, self.ocr.digit_fallbacks),
+            ('vision_digit_escalations_total', 'counter', {}, self.ocr.escalations),
+        ]
+        for tier, count in self.ocr.tier_hits.items():
+            samples.append(('vision_digit_tier_hits_total', 'counter', {'tier': str(tier)}, count))
+        if self.last_state is not None:
+            samples.append(('vision_state_confidence', 'gauge', {}, self.last_state.confidence))
+        if self.ocr.surge_gate is not None:
+            samples += [
+                ('vision_surge_gate_total', 'counter', {'result': 'open'}, self.ocr.surge_gate.opened),
+                ('vision_surge_gate_total', 'counter', {'result': 'closed'}, self.ocr.surge_gate.closed),
+            ]
+        if self.cache is not None:
+            samples += [
+                ('vision_cache_hits_total', 'counter', {}, self.cache.hits),
+                ('vision_cache_misses_total', 'counter', {}, self.cache.misses),
+                ('vision_cache_evictions_total', 'counter', {}, self.cache.evictions),
+            ]
+        if self.pool is not None:
+            samples += [
+                ('vision_ocr_workers_ready', 'gauge', {}, self.pool.ready_workers),
+                ('vision_ocr_worker_timeouts_total', 'counter', {}, self.pool.timeouts),
+            ]
+        if self.last_state is not None:
+            samples.append(('vision_capture_fps', 'gauge', {}, round(self.last_state.capture_fps, 2)))
+        return samples
+
+    def cache_stats(self) -> Dict[str, Any]:
+        return self.cache.stats() if self.cache is not None else {}
+
+    def schedule_stats(self) -> Dict[str, Any]:
+        return self.scheduler.stats() if self.scheduler is not None else {}
 
     def release(self):
-              self.capture.release()
-        self.ocr.release()
+        if self.recorder is not None:
+            self.recorder.close()
+        self.capture.release()
+        if self.pool is not None:
+            self.pool.stop()
+        if self._owns_ocr:
+            self.ocr.release()
         logger.info("StateExtractor released")
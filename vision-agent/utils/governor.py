@@ -0,0 +1,234 @@
+"""
+Resource Governor Module
+Closed-loop control that keeps the agent inside performance.max_cpu_percent
+and max_memory_mb by trading capture rate, refresh rate and preprocessing
+"""
+
+import gc
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+import logging
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+# Throttle levels, cheapest last:
+#   (capture FPS scale, field interval scale, min field interval s, preprocess tier)
+LEVELS = (
+    (1.0, 1.0, 0.0, 0),
+    (1.0, 1.0, 0.0, 1),
+    (0.75, 1.5, 0.0, 1),
+    (0.5, 2.0, 0.5, 2),
+    (0.34, 3.0, 1.0, 2),
+    (0.2, 4.0, 2.0, 2),
+)
+
+
+class ResourceGovernor:
+    """
+    Samples the CPU share of the machine and the resident memory of this
+    process and its OCR worker processes, and steps through LEVELS to stay
+    under the configured caps. Over the memory cap it sheds caches, then
+    unloads the OCR fallback model, then reports that the cap cannot be met. Also feeds
+    system load to AdaptiveCapture.update_fps_from_load so the agent backs
+    off when the game itself is busy.
+    """
+
+    def __init__(self, config: Dict[str, Any], extractor, bridge=None, metrics=None):
+        self.max_cpu_percent = config.get('max_cpu_percent', 8)
+        self.max_memory_mb = config.get('max_memory_mb', 600)
+        self.memory_hysteresis = config.get('memory_hysteresis', 0.9)
+        self.interval = config.get('governor_interval', 1.0)
+        self.headroom = config.get('governor_headroom', 0.7)
+        self.settle_samples = config.get('governor_settle', 5)
+        self.smoothing = config.get('governor_smoothing', 0.5)
+        self.report_interval = config.get('report_interval', 60.0)
+        self.extractor = extractor
+        self.bridge = bridge
+        self.level = 0
+        self.cpu_percent = 0.0
+        self.system_percent = 0.0
+        self.memory_mb = 0.0
+        self.over_budget = False
+        self.budget_violations = 0
+        self._calm = 0
+        self._memory_stage = 0  # 0 under the cap, 1 caches shed, 2 fallback unloaded, 3 given up
+        self._fallback_unloaded = False
+        self._children: Dict[int, Any] = {}
+        self._last_report = 0.0
+        self._process = psutil.Process(os.getpid()) if psutil is not None else None
+        self._cpu_count = (psutil.cpu_count() or 1) if psutil is not None else 1
+        capture = extractor.capture
+        self._base_fps = getattr(capture, 'target_fps', None)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if metrics is not None:
+            metrics.register_collector(self._collect_metrics)
+
+    @property
+    def available(self) -> bool:
+        return self._process is not None
+
+    def start(self) -> bool:
+        if not self.available:
+            logger.warning("psutil not installed; resource caps are not enforced")
+            return False
+        self._process.cpu_percent(None)
+        psutil.cpu_percent(None)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="resource-governor", daemon=True)
+        self._thread.start()
+        logger.info(f"Resource governor: CPU <= {self.max_cpu_percent}%, memory <= {self.max_memory_mb} MB")
+        return True
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'level': self.level,
+            'cpu_percent': round(self.cpu_percent, 1),
+            'system_percent': round(self.system_percent, 1),
+            'memory_mb': round(self.memory_mb, 1),
+            'over_budget': self.over_budget,
+            'budget_violations': self.budget_violations,
+        }
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.step()
+            except Exception as e:
+                logger.debug(f"Governor step failed: {e}")
+
+    def step(self):
+        """Take one sample and adjust; public so callers can drive it without the thread."""
+        # Process percent is per core; the cap is a share of the whole machine
+        cpu, memory = self._sample()
+        self.cpu_percent += self.smoothing * (cpu / self._cpu_count - self.cpu_percent)
+        self.system_percent = psutil.cpu_percent(None)
+        self.memory_mb = memory
+
+        if self.cpu_percent > self.max_cpu_percent:
+            self._calm = 0
+            if self.level < len(LEVELS) - 1:
+                self._set_level(self.level + 1)
+        elif self.cpu_percent < self.max_cpu_percent * self.headroom:
+            self._calm += 1
+            if self._calm >= self.settle_samples and self.level > 0:
+                self._calm = 0
+                self._set_level(self.level - 1)
+        else:
+            self._calm = 0
+
+        if self.memory_mb > self.max_memory_mb:
+            self._shed_memory()
+        elif self.memory_mb < self.max_memory_mb * self.memory_hysteresis:
+            self._memory_stage = 0
+        self._apply_capture_rate()
+
+        cpu_over = self.cpu_percent > self.max_cpu_percent and self.level == len(LEVELS) - 1
+        memory_over = self.memory_mb > self.max_memory_mb
+        self.over_budget = cpu_over or memory_over
+        if self.over_budget:
+            self.budget_violations += 1
+            self._report(cpu_over, memory_over)
+
+    def _set_level(self, level: int):
+        logger.info(f"Governor level {self.level} -> {level} (CPU {self.cpu_percent:.1f}%)")
+        self.level = level
+        _, interval_scale, interval_floor, tier = LEVELS[level]
+        if self.extractor.scheduler is not None:
+            self.extractor.scheduler.set_load_factor(interval_scale, interval_floor)
+        self.extractor.set_preprocess_tier(tier)
+
+    def _apply_capture_rate(self):
+        capture = self.extractor.capture
+        if self._base_fps is None:
+            return  # replay and synthetic sources are not paced by us
+        fps = self._base_fps
+        if hasattr(capture, 'update_fps_from_load'):
+            # GPU load is not sampled; system CPU is the best proxy for the game's load
+            capture.update_fps_from_load(self.system_percent, 0.0)
+            fps = capture.current_fps
+        capture.frame_time = 1.0 / max(fps * LEVELS[self.level][0], 0.2)
+
+    def _sample(self):
+        """(CPU percent of one core, RSS in MB) summed over this process and its children."""
+        processes = [self._process]
+        try:
+            children = self._process.children(recursive=True)
+        except psutil.Error:
+            children = []
+        # cpu_percent measures since the previous call on the same Process object
+        self._children = {child.pid: self._children.get(child.pid, child) for child in children}
+        processes.extend(self._children.values())
+        cpu = rss = 0.0
+        for process in processes:
+            try:
+                cpu += process.cpu_percent(None)
+                rss += process.memory_info().rss
+            except psutil.Error:
+                pass  # a worker exited between listing and sampling
+        return cpu, rss / (1024 * 1024)
+
+    def _shed_memory(self):
+        # One measure per step, each once per crossing of the cap: repeating
+        # them every step would keep wiping caches to free nothing
+        before = self.memory_mb
+        if self._memory_stage == 0:
+            self._memory_stage = 1
+            cache = self.extractor.cache
+            if cache is not None:
+                cache.invalidate()
+            gc.collect()
+            action = "shed caches"
+        elif self._memory_stage == 1:
+            self._memory_stage = 2
+            if self._fallback_unloaded or not self.extractor.unload_fallback():
+                return self._shed_memory()
+            self._fallback_unloaded = True
+            gc.collect()
+            action = "unloaded the OCR fallback model"
+        elif self._memory_stage == 2:
+            self._memory_stage = 3
+            logger.warning(f"Memory cap cannot be met: {self.memory_mb:.0f} MB > {self.max_memory_mb} MB "
+                           f"with caches shed and the OCR fallback unloaded; the loaded runtime "
+                           f"(torch/onnxruntime) alone may exceed it. Raise performance.max_memory_mb "
+                           f"or use ocr.backend 'onnx'")
+            return
+        else:
+            return
+        _, self.memory_mb = self._sample()
+        logger.info(f"Memory {before:.0f} MB > {self.max_memory_mb} MB: {action}, now {self.memory_mb:.0f} MB")
+
+    def _report(self, cpu_over: bool, memory_over: bool):
+        now = time.time()
+        if now - self._last_report < self.report_interval:
+            return
+        self._last_report = now
+        reasons = []
+        if cpu_over:
+            reasons.append(f"CPU {self.cpu_percent:.1f}% > {self.max_cpu_percent}% at the lowest quality level")
+        if memory_over:
+            reasons.append(f"memory {self.memory_mb:.0f} MB > {self.max_memory_mb} MB")
+        logger.warning("Resource budget cannot be met: " + "; ".join(reasons))
+        if self.bridge is not None:
+            self.bridge.send_event('resource_budget', dict(self.stats(), reasons=reasons))
+
+    def _collect_metrics(self):
+        return [
+            ('vision_governor_level', 'gauge', {}, self.level),
+            ('vision_process_cpu_percent', 'gauge', {}, round(self.cpu_percent, 2)),
+            ('vision_process_memory_mb', 'gauge', {}, round(self.memory_mb, 1)),
+            ('vision_budget_violations_total', 'counter', {}, self.budget_violations),
+        ]
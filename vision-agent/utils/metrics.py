@@ -0,0 +1,217 @@
+"""
+Metrics Module
+Fixed-memory latency histograms and counters for the capture/OCR/publish
+path, exposed as Prometheus text over HTTP and as a stats snapshot
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Seconds; covers sub-0.1 ms digit reads up to multi-second OCR stalls
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                   0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+Labels = Tuple[Tuple[str, str], ...]
+Sample = Tuple[str, str, Dict[str, Any], float]  # (name, type, labels, value)
+
+
+class Histogram:
+    """Bucketed latency histogram; memory is fixed by the bucket count."""
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.bounds = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+            if value > self.max:
+                self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Estimate by linear interpolation inside the bucket holding the q-th sample."""
+        with self._lock:
+            counts = list(self.counts)
+            total = self.count
+            peak = self.max
+        if not total:
+            return 0.0
+        rank = q * total
+        seen = 0
+        for index, count in enumerate(counts):
+            if count and seen + count >= rank:
+                low = self.bounds[index - 1] if index > 0 else 0.0
+                high = self.bounds[index] if index < len(self.bounds) else peak
+                return min(low + (high - low) * (rank - seen) / count, peak)
+            seen += count
+        return peak
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'mean_ms': round(self.sum / self.count * 1000, 3) if self.count else 0.0,
+            'p50_ms': round(self.quantile(0.5) * 1000, 3),
+            'p95_ms': round(self.quantile(0.95) * 1000, 3),
+            'p99_ms': round(self.quantile(0.99) * 1000, 3),
+            'max_ms': round(self.max * 1000, 3),
+        }
+
+
+class MetricsRegistry:
+    """
+    Named histograms and counters with optional labels. Components that
+    already keep their own counters register a collector instead of
+    double counting.
+    """
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._collectors: List[Callable[[], Iterable[Sample]]] = []
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str, **labels) -> Histogram:
+        key = (name, self._labels(labels))
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, Histogram(self.buckets))
+        return histogram
+
+    def observe(self, name: str, seconds: float, **labels):
+        self.histogram(name, **labels).observe(seconds)
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.histogram(name, **labels).observe(time.perf_counter() - started)
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = (name, self._labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def register_collector(self, collector: Callable[[], Iterable[Sample]]):
+        self._collectors.append(collector)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Compact dict for the bridge 'stats' event."""
+        latency = {self._key(name, labels): hist.summary()
+                   for (name, labels), hist in list(self._histograms.items()) if hist.count}
+        counters = {self._key(name, labels): value for (name, labels), value in list(self._counters.items())}
+        for name, _kind, labels, value in self._collect():
+            counters[self._key(name, self._labels(labels))] = value
+        return {'latency': latency, 'counters': counters}
+
+    def render_prometheus(self) -> str:
+        lines = []
+        previous = None
+        for (name, labels), hist in sorted(self._histograms.items()):
+            if name != previous:
+                lines.append(f"# TYPE {name} histogram")
+                previous = name
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), list(hist.counts)):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f"{name}_bucket{self._format(labels + (('le', le),))} {cumulative}")
+            lines.append(f"{name}_sum{self._format(labels)} {hist.sum}")
+            lines.append(f"{name}_count{self._format(labels)} {hist.count}")
+
+        # Samples of one family must be contiguous under a single TYPE line
+        families: Dict[str, Tuple[str, List[str]]] = {}
+        samples = [(name, 'counter', labels, value) for (name, labels), value in list(self._counters.items())]
+        samples += [(name, kind, self._labels(labels), value) for name, kind, labels, value in self._collect()]
+        for name, kind, labels, value in samples:
+            families.setdefault(name, (kind, []))[1].append(f"{name}{self._format(labels)} {value}")
+        for name, (kind, family) in sorted(families.items()):
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(family)
+        return "\n".join(lines) + "\n"
+
+    def _collect(self) -> List[Sample]:
+        samples = []
+        for collector in self._collectors:
+            try:
+                samples.extend(collector())
+            except Exception as e:
+                logger.debug(f"Metrics collector failed: {e}")
+        return samples
+
+    @staticmethod
+    def _labels(labels: Dict[str, Any]) -> Labels:
+        return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    @staticmethod
+    def _format(labels: Labels) -> str:
+        if not labels:
+            return ""
+        return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
+
+    @classmethod
+    def _key(cls, name: str, labels: Labels) -> str:
+        return name + cls._format(labels)
+
+
+class MetricsServer:
+    """Serves GET /metrics in Prometheus text format from a daemon thread."""
+
+    def __init__(self, registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 9108):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> bool:
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = registry.render_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        try:
+            self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        except OSError as e:
+            logger.warning(f"Metrics endpoint unavailable on {self.host}:{self.port}: {e}")
+            return False
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True)
+        self._thread.start()
+        logger.info(f"Metrics on http://{self.host}:{self.port}/metrics")
+        return True
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
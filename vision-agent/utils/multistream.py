@@ -0,0 +1,157 @@
+"""
+Multi-Stream Module
+One agent extracting state for several frame sources (monitors, capture
+cards, recordings) with a single shared OCR engine
+"""
+
+import copy
+import time
+from typing import Any, Callable, Dict, List, Optional
+import logging
+
+from .extractor import StateExtractor
+from .state import GameState
+from .ocr import FortniteOCR
+from .tracker import StateTracker
+
+logger = logging.getLogger(__name__)
+
+
+class MultiStreamExtractor:
+    """
+    A StateExtractor per stream (own capture, region plan, cache, scheduler
+    and tracker) around one FortniteOCR, so the model is loaded once however
+    many squad members are added. Each tick the ROIs of every stream that
+    still need the recognizer go into a single read_regions mosaic.
+    """
+
+    def __init__(self, config: Dict[str, Any], captures: Optional[Dict[str, Any]] = None,
+                 metrics=None):
+        self.config = config
+        self.metrics = metrics
+        captures = captures or {}
+        ocr_config = config.get('ocr', {})
+        if ocr_config.get('workers', 0):
+            logger.warning("ocr.workers is not used in multi-stream mode; streams share one in-process engine")
+        self.background_load = ocr_config.get('background_load', True)
+        self.ocr = FortniteOCR.from_config(config, metrics=metrics)
+        self._surge_keywords = config.get('detection', {}).get('surge_keywords', ['SURGE', 'DAMAGE'])
+        tracker_config = config.get('tracker', {})
+
+        self.extractors: Dict[str, StateExtractor] = {}
+        self.trackers: Dict[str, Optional[StateTracker]] = {}
+        for index, stream_config in enumerate(config.get('streams', [])):
+            stream_id = str(stream_config.get('id', f"stream{index + 1}"))
+            extractor = StateExtractor(self._stream_config(stream_config), capture=captures.get(stream_id),
+                                       ocr=self.ocr, stream_id=stream_id)
+            self.extractors[stream_id] = extractor
+            self.trackers[stream_id] = None
+            if tracker_config.get('enabled', True):
+                self.trackers[stream_id] = StateTracker(tracker_config, scheduler=extractor.scheduler)
+        if not self.extractors:
+            raise ValueError("Multi-stream mode needs at least one entry in 'streams'")
+
+        # The engine is shared, so one stream reports readiness for all of them
+        first = next(iter(self.extractors.values()))
+        self.on_readiness: Optional[Callable[[Dict[str, Any]], None]] = None
+        first.on_readiness = lambda readiness: self.on_readiness and self.on_readiness(readiness)
+        self.ticks = 0
+        self.rois_batched = 0
+        if metrics is not None:
+            metrics.register_collector(self._collect_metrics)
+
+    def _stream_config(self, stream_config: Dict[str, Any]) -> Dict[str, Any]:
+        """Agent config with the stream's 'capture' keys and 'regions' laid over it."""
+        merged = copy.deepcopy(self.config)
+        merged.pop('streams', None)
+        merged.setdefault('capture', {}).update(stream_config.get('capture', {}))
+        if 'regions' in stream_config:
+            merged['regions'] = stream_config['regions']
+        return merged
+
+    def initialize(self) -> bool:
+        ok = all(extractor.initialize() for extractor in self.extractors.values())
+        warmup_shapes = set()
+        for extractor in self.extractors.values():
+            if extractor.warmup:
+                warmup_shapes.update(extractor.plan.roi_shapes)
+        ok = self.ocr.initialize(background=self.background_load, warmup_shapes=sorted(warmup_shapes)) and ok
+        logger.info(f"Multi-stream extractor: {len(self.extractors)} streams ({', '.join(self.extractors)})")
+        return ok
+
+    @property
+    def capture_exhausted(self) -> bool:
+        return all(extractor.capture_exhausted for extractor in self.extractors.values())
+
+    def readiness(self) -> Dict[str, Any]:
+        readiness = next(iter(self.extractors.values())).readiness()
+        readiness['streams'] = list(self.extractors)
+        return readiness
+
+    def extract(self) -> List[GameState]:
+        """One tick: a frame from every stream that has one, decoded in one batch."""
+        started = time.perf_counter()
+        frames = []
+        rois = {}
+        for stream_id, extractor in self.extractors.items():
+            frame = extractor.grab_frame()
+            if frame is None:
+                continue
+            frame_started = time.perf_counter()
+            state, gray, fields = extractor.begin_frame(frame, extractor.capture_time())
+            batch = extractor.collect_batch(frame, gray, state, fields)
+            # Stream-qualified names keep per-region preprocessing buffers apart
+            for field_name, roi in batch[0].items():
+                rois[f"{stream_id}/{field_name}"] = roi
+            frames.append((stream_id, extractor, state, fields, batch, frame_started))
+        if not frames:
+            return []
+
+        ocr_started = time.perf_counter()
+        fresh = self.ocr.read_regions(rois, self._surge_keywords) if rois else {}
+        ocr_elapsed = time.perf_counter() - ocr_started
+        self.ticks += 1
+        self.rois_batched += len(rois)
+
+        states = []
+        for stream_id, extractor, state, fields, batch, frame_started in frames:
+            prefix = f"{stream_id}/"
+            decoded = {name[len(prefix):]: value for name, value in fresh.items() if name.startswith(prefix)}
+            confidences = {name: self.ocr.last_confidence.get(prefix + name, 0.0) for name in decoded}
+            # The shared recognizer call is charged to each stream by its share of the ROIs
+            share = len(batch[0]) / len(rois) if rois else 0.0
+            extractor.apply_batch(state, decoded, batch, fields, ocr_elapsed * share, confidences)
+            state = extractor.finish_frame(state, fields, frame_started)
+            tracker = self.trackers[stream_id]
+            if tracker is not None:
+                state = tracker.update(state, extractor.last_refreshed)
+            states.append(state)
+        if self.metrics is not None:
+            self.metrics.observe('vision_extract_seconds', time.perf_counter() - started, stream='all')
+        return states
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'streams': len(self.extractors),
+            'ticks': self.ticks,
+            'rois_per_batch': round(self.rois_batched / self.ticks, 2) if self.ticks else 0.0,
+            'cache': {stream_id: extractor.cache_stats() for stream_id, extractor in self.extractors.items()},
+        }
+
+    def _collect_metrics(self):
+        samples = [
+            ('vision_digit_reads_total', 'counter', {'result': 'hit'}, self.ocr.digit_hits),
+            ('vision_digit_reads_total', 'counter', {'result': 'fallback'}, self.ocr.digit_fallbacks),
+            ('vision_ocr_ready', 'gauge', {}, int(self.ocr.ready)),
+        ]
+        for stream_id, extractor in self.extractors.items():
+            if extractor.last_state is not None:
+                samples.append(('vision_capture_fps', 'gauge', {'stream': stream_id},
+                                round(extractor.last_state.capture_fps, 2)))
+        return samples
+
+    def release(self):
+        for extractor in self.extractors.values():
+            extractor.release()
+        self.ocr.release()
+        logger.info("MultiStreamExtractor released")
@@ -1,135 +1,512 @@
 """
 Fortnite OCR Module
 GPU-accelerated text extraction optimized for Fortnite UI elements
-Uses EasyOCR with CUDA support for fast, accurate reading
+Uses a digit recognizer first and EasyOCR or ONNX Runtime as the fallback
 """
 
 import re
+import time
+import bisect
+import threading
+from contextlib import nullcontext
+from pathlib import Path
 import cv2
 import numpy as np
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, Iterable, List, Tuple
 import logging
 
+from .backends import create_backend
+from .digits import DigitRecognizer
+from .preprocess import NumberPreprocessor, TextPreprocessor, SurgePreprocessor, SurgeGate
+
 logger = logging.getLogger(__name__)
 
+# Relative paths in config.json resolve here, not against the working directory
+AGENT_DIR = Path(__file__).resolve().parent.parent
+
 
 class FortniteOCR:
-      """Specialized OCR for Fortnite UI elements."""
-
-    def __init__(self, gpu: bool = True, languages: List[str] = None):
-              self.gpu = gpu
-              self.languages = languages or ['en']
-              self.reader = None
-              self._initialized = False
-              self._number_pattern = re.compile(r'\d+')
-              self._time_pattern = re.compile(r'(\d+):(\d+)')
-
-    def initialize(self) -> bool:
-              try:
-                            import easyocr
-                            self.reader = easyocr.Reader(self.languages, gpu=self.gpu, verbose=False)
-                            self._initialized = True
-                            logger.info(f"FortniteOCR initialized (GPU: {self.gpu})")
-                            return True
-except ImportError:
-            logger.error("EasyOCR not installed. Run: pip install easyocr")
+    """
+    Specialized OCR for Fortnite UI elements.
+
+    status tracks the recognizer fallback (the ocr.backend engine, see
+    backends.py): 'not_loaded', 'loading', 'ready', 'failed', or
+    'digits_only' when the fallback is disabled. Until it is 'ready' only
+    the digit recognizer and the surge gate answer.
+
+    Digit regions are decoded cheapest first: the recognizer runs on the
+    cheapest preprocessing tier and only reads under digit_confidence are
+    retried on heavier tiers, then handed to the fallback. last_confidence
+    holds the confidence of the last read of every region, 0.0 to 1.0.
+    """
+
+    def __init__(self, gpu: bool = True, languages: List[str] = None,
+                 mosaic_padding: int = 24, batch_size: int = 16,
+                 digit_recognizer: bool = True, digit_confidence: float = 0.6,
+                 digit_templates: Optional[str] = None, fallback: bool = True, metrics=None,
+                 surge_gate: Optional[SurgeGate] = None, backend: str = 'easyocr',
+                 backend_options: Optional[Dict[str, Any]] = None, tiered: bool = True):
+        self.gpu = gpu
+        self.backend = backend
+        self.backend_options = backend_options or {}
+        self.languages = languages or ['en']
+        self.mosaic_padding = mosaic_padding
+        self.batch_size = batch_size
+        self.digits = DigitRecognizer(digit_templates) if digit_recognizer else None
+        self.digit_confidence = digit_confidence
+        # Without the fallback the digit recognizer's best guess is final
+        self.fallback = fallback or self.digits is None
+        self.metrics = metrics
+        self.surge_gate = surge_gate
+        self.preprocess_tier = 0
+        self.tiered = tiered
+        self.digit_hits = 0
+        self.digit_fallbacks = 0
+        self.tier_hits: Dict[int, int] = {}
+        self.escalations = 0
+        self.last_confidence: Dict[Optional[str], float] = {}
+        self._templates_dirty = False
+        self._preprocessors: Dict[Tuple[type, Optional[str]], Any] = {}
+        self.reader = None
+        self.status = 'not_loaded'
+        self.load_seconds = 0.0
+        self._initialized = False
+        self._loader: Optional[threading.Thread] = None
+        self._number_pattern = re.compile(r'\d+')
+        self._time_pattern = re.compile(r'(\d+):(\d+)')
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], metrics=None, fallback: Optional[bool] = None) -> 'FortniteOCR':
+        """Engine as configured by the 'ocr' and 'detection' sections of config.json."""
+        ocr_config = config.get('ocr', {})
+        gate_config = config.get('detection', {}).get('surge_gate', {})
+        backend = ocr_config.get('backend', 'easyocr')
+        # Learned templates persist only when a path is configured
+        templates = ocr_config.get('digit_templates')
+        # Model paths in config.json are relative to the agent directory, not the working directory
+        backend_options = dict(ocr_config.get(backend, {}))
+        for key in ('recognizer', 'detector'):
+            if backend_options.get(key):
+                backend_options[key] = str(AGENT_DIR / Path(backend_options[key]).expanduser())
+        return cls(
+            gpu=ocr_config.get('gpu', True),
+            languages=ocr_config.get('languages', ['en']),
+            digit_recognizer=ocr_config.get('digit_recognizer', True),
+            digit_confidence=ocr_config.get('digit_confidence', 0.6),
+            digit_templates=str(AGENT_DIR / Path(templates).expanduser()) if templates else None,
+            fallback=ocr_config.get('fallback', True) if fallback is None else fallback,
+            metrics=metrics,
+            surge_gate=SurgeGate(
+                min_red=gate_config.get('min_red', 0.3),
+                min_band=gate_config.get('min_band', 0.4),
+                min_white=gate_config.get('min_white', 0.02),
+                max_white=gate_config.get('max_white', 0.4),
+                min_text_span=gate_config.get('min_text_span', 0.3),
+                downsample=gate_config.get('downsample', 4)
+            ) if gate_config.get('enabled', True) else None,
+            backend=backend,
+            backend_options=backend_options,
+            tiered=ocr_config.get('tiered', True)
+        )
+
+    def initialize(self, background: bool = False,
+                   warmup_shapes: Iterable[Tuple[int, int]] = ()) -> bool:
+        """
+        Load the fallback backend and warm it up on dummy (height, width) tiles. With
+        background=True this returns at once and the model loads on a
+        daemon thread; reads that need it return None until it is ready.
+        """
+        if not self.fallback:
+            self.status = 'digits_only'
+            logger.info("FortniteOCR running digit recognizer only (fallback disabled)")
+            return True
+        if not background:
+            return self._load(list(warmup_shapes))
+        if self._loader is None:
+            self.status = 'loading'
+            self._loader = threading.Thread(target=self._load, args=(list(warmup_shapes),),
+                                            name="ocr-loader", daemon=True)
+            self._loader.start()
+            logger.info(f"Loading the {self.backend} OCR backend in the background")
+        return True
+
+    @property
+    def ready(self) -> bool:
+        return self._initialized
+
+    def _load(self, warmup_shapes: List[Tuple[int, int]]) -> bool:
+        started = time.perf_counter()
+        try:
+            # Backends import their runtime in load(), so nothing heavy is imported until here
+            reader = create_backend(self.backend, self.languages, self.gpu, self.backend_options)
+            reader.load()
+            self._warm_up(reader, warmup_shapes)
+        except ImportError as e:
+            self.status = 'failed'
+            logger.error(f"OCR backend '{self.backend}' unavailable: {e}. Run: pip install {e.name or self.backend}")
             return False
-except Exception as e:
+        except Exception as e:
+            self.status = 'failed'
             logger.error(f"Failed to initialize OCR: {e}")
             return False
+        self.load_seconds = time.perf_counter() - started
+        self.reader = reader
+        self._initialized = True
+        self.status = 'ready'
+        logger.info(f"FortniteOCR initialized in {self.load_seconds:.1f}s (backend: {self.backend}, GPU: {self.gpu})")
+        return True
+
+    def _warm_up(self, reader, shapes: List[Tuple[int, int]]):
+        """The first readtext calls pay for lazy kernel setup; pay it on HUD-sized dummies instead."""
+        tiles = []
+        for height, width in shapes:
+            tile = np.zeros((height, width), np.uint8)
+            cv2.putText(tile, "88", (2, height - max(2, height // 5)), cv2.FONT_HERSHEY_DUPLEX,
+                        height * 0.6 / 22.0, 255, 1)
+            tiles.append(('warmup', 'number', tile))
+        for _, _, tile in tiles:
+            reader.readtext(tile, detail=0, paragraph=False)
+        if tiles:
+            mosaic, _ = self._build_mosaic(tiles)
+            reader.readtext(mosaic, detail=1, paragraph=False, batch_size=self.batch_size)
+
+    # The preprocess_* methods return a per-region buffer that the next call
+    # for the same region overwrites; copy it to keep it across frames.
+
+    def preprocess_for_numbers(self, image: np.ndarray, region: Optional[str] = None) -> np.ndarray:
+        """BGR or already-gray ROI to a dilated binary image."""
+        return self._preprocessor(NumberPreprocessor, region)(image, self.preprocess_tier)
+
+    def preprocess_for_text(self, image: np.ndarray, region: Optional[str] = None) -> np.ndarray:
+        return self._preprocessor(TextPreprocessor, region)(image)
+
+    def preprocess_surge_warning(self, image: np.ndarray, region: Optional[str] = None) -> np.ndarray:
+        return self._preprocessor(SurgePreprocessor, region)(image)
+
+    def set_preprocess_tier(self, tier: int):
+        """
+        0 is full quality; higher tiers are cheaper (see NumberPreprocessor).
+        With tiered decoding this is the heaviest tier reads escalate to.
+        """
+        self.preprocess_tier = max(0, min(tier, NumberPreprocessor.TIERS - 1))
+
+    def unload_fallback(self) -> bool:
+        """
+        Drop the fallback backend and its model to free memory; the digit
+        recognizer's reads become final. False when there is nothing to drop.
+        """
+        if self.digits is None or not self.fallback:
+            return False
+        self.fallback = False
+        if self.reader is not None:
+            self.reader.release()
+        self.reader = None
+        self._initialized = False
+        self.status = 'digits_only'
+        logger.warning(f"Unloaded the {self.backend} OCR fallback; reading digits only")
+        return True
+
+    def decode_tiers(self) -> List[int]:
+        """Preprocessing tiers the digit recognizer tries, cheapest first."""
+        if not self.tiered:
+            return [self.preprocess_tier]
+        tiers = list(range(NumberPreprocessor.TIERS - 1, self.preprocess_tier - 1, -1))
+        if self.preprocess_tier == 0:
+            # Rescue is for hard frames; a governor holding the tier up wants none of it
+            tiers.append(NumberPreprocessor.RESCUE)
+        return tiers
+
+    def _preprocessor(self, kind: type, region: Optional[str]):
+        preprocessor = self._preprocessors.get((kind, region))
+        if preprocessor is None:
+            preprocessor = self._preprocessors[(kind, region)] = kind()
+        return preprocessor
+
+    def read_number(self, image: np.ndarray, preprocess: bool = True,
+                    region: Optional[str] = None) -> Optional[int]:
+        self.last_confidence[region] = 0.0
+        try:
+            text = self._read_digits(image, region=region, preprocess=preprocess)
+            if text:
+                return int(text)
+            if not self._ensure_reader():
+                return None
+            processed = self._fallback_image(image, region) if preprocess else image
+            texts = self._recognize(processed, region)
+            self._learn_digits(processed, texts)
+            return self._parse_number(texts)
+        except Exception as e:
+            logger.debug(f"Number extraction error: {e}")
+            self._count_error()
+            return None
+
+    def read_time(self, image: np.ndarray, region: Optional[str] = None) -> Optional[Tuple[int, int]]:
+        self.last_confidence[region] = 0.0
+        try:
+            text = self._read_digits(image, allow_colon=True, region=region)
+            if text:
+                return self._parse_time([text])
+            if not self._ensure_reader():
+                return None
+            processed = self._fallback_image(image, region)
+            texts = self._recognize(processed, region)
+            self._learn_digits(processed, texts)
+            return self._parse_time(texts)
+        except Exception as e:
+            logger.debug(f"Time extraction error: {e}")
+            self._count_error()
+            return None
 
-    def preprocess_for_numbers(self, image: np.ndarray) -> np.ndarray:
-              gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-              clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-              enhanced = clahe.apply(gray)
-              _, binary = cv2.threshold(enhanced, 180, 255, cv2.THRESH_BINARY)
-              kernel = np.ones((2, 2), np.uint8)
-              dilated = cv2.dilate(binary, kernel, iterations=1)
-              return dilated
-
-    def preprocess_for_text(self, image: np.ndarray) -> np.ndarray:
-              gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-              denoised = cv2.fastNlMeansDenoising(gray, None, 10, 7, 21)
-              clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
-              enhanced = clahe.apply(denoised)
-              return enhanced
-
-    def preprocess_surge_warning(self, image: np.ndarray) -> np.ndarray:
-              hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
-              lower_red1 = np.array([0, 100, 100])
-              upper_red1 = np.array([10, 255, 255])
-              lower_red2 = np.array([160, 100, 100])
-              upper_red2 = np.array([180, 255, 255])
-              mask1 = cv2.inRange(hsv, lower_red1, upper_red1)
-              mask2 = cv2.inRange(hsv, lower_red2, upper_red2)
-              red_mask = cv2.bitwise_or(mask1, mask2)
-              gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-              _, white_mask = cv2.threshold(gray, 200, 255, cv2.THRESH_BINARY)
-              combined = cv2.bitwise_or(red_mask, white_mask)
-              return combined
-
-    def read_number(self, image: np.ndarray, preprocess: bool = True) -> Optional[int]:
-              if not self._initialized:
-                            if not self.initialize():
-                                              return None
-                                      try:
-                                                    processed = self.preprocess_for_numbers(image) if preprocess else image
-                                                    results = self.reader.readtext(processed, detail=0, paragraph=False)
-                                                    for text in results:
-                                                                      matches = self._number_pattern.findall(text)
-                                                                      if matches:
-                                                                                            return int(matches[0])
-                                                                                    return None
-                            except Exception as e:
-                                          logger.debug(f"Number extraction error: {e}")
-                                          return None
-
-                    def read_time(self, image: np.ndarray) -> Optional[Tuple[int, int]]:
-                              if not self._initialized:
-                                            if not self.initialize():
-                                                              return None
-                                                      try:
-                                                                    processed = self.preprocess_for_numbers(image)
-                                                                    results = self.reader.readtext(processed, detail=0, paragraph=False)
-                                                                    for text in results:
-                                                                                      match = self._time_pattern.search(text)
-                                                                                      if match:
-                                                                                                            return (int(match.group(1)), int(match.group(2)))
-                                                                                                    return None
-                                            except Exception as e:
-                                                          logger.debug(f"Time extraction error: {e}")
-                                                          return None
-
-                                    def read_text(self, image: np.ndarray, preprocess: bool = True) -> str:
-                                              if not self._initialized:
-                                                            if not self.initialize():
-                                                                              return ""
-                                                                      try:
-                                                                                    processed = self.preprocess_for_text(image) if preprocess else image
-                                                                                    results = self.reader.readtext(processed, detail=0, paragraph=True)
-                                                                                    return " ".join(results)
-except Exception as e:
+    def read_digits(self, image: np.ndarray, kind: str = 'number', region: Optional[str] = None):
+        """
+        Digit-recognizer-only pass over a 'number' or 'time' ROI: the value
+        when it clears digit_confidence, else None (the ROI needs the fallback).
+        """
+        self.last_confidence[region] = 0.0
+        text = self._read_digits(image, allow_colon=(kind == 'time'), region=region, final=False)
+        if not text:
+            return None
+        if kind == 'time':
+            return self._parse_time([text])
+        return int(text)
+
+    def read_text(self, image: np.ndarray, preprocess: bool = True) -> str:
+        if not self._ensure_reader():
+            return ""
+        try:
+            processed = self.preprocess_for_text(image) if preprocess else image
+            results = self.reader.readtext(processed, detail=0, paragraph=True)
+            return " ".join(results)
+        except Exception as e:
             logger.debug(f"Text extraction error: {e}")
+            self._count_error()
             return ""
 
-    def detect_surge_warning(self, image: np.ndarray, keywords: List[str] = None) -> Dict[str, Any]:
-              keywords = keywords or ['SURGE', 'DAMAGE', 'BELOW', 'STORM SURGE']
-        if not self._initialized:
-                      if not self.initialize():
-                                        return {'detected': False, 'text': ''}
-                                try:
-                                              processed = self.preprocess_surge_warning(image)
-                                              results = self.reader.readtext(processed, detail=0, paragraph=True)
-                                              text = " ".join(results).upper()
-                                              for keyword in keywords:
-                                                                if keyword in text:
-                                                                                      return {'detected': True, 'text': text}
-                                                                              return {'detected': False, 'text': text}
-                                except Exception as e:
+    def detect_surge_warning(self, image: np.ndarray, keywords: List[str] = None,
+                             region: Optional[str] = None) -> Dict[str, Any]:
+        keywords = keywords or ['SURGE', 'DAMAGE', 'BELOW', 'STORM SURGE']
+        try:
+            if not self.surge_gate_open(image, region):
+                self.last_confidence[region] = 1.0
+                return {'detected': False, 'text': ''}
+            if not self._ensure_reader():
+                return self._unconfirmed_surge(region)
+            with self._timed('preprocess', region):
+                processed = self.preprocess_surge_warning(image, region)
+            return self._match_surge(" ".join(self._recognize(processed, region)), keywords)
+        except Exception as e:
             logger.debug(f"Surge detection error: {e}")
+            self._count_error()
+            self.last_confidence[region] = 0.0
             return {'detected': False, 'text': ''}
 
+    def read_regions(self, rois: Dict[str, Tuple[np.ndarray, str]],
+                     keywords: List[str] = None) -> Dict[str, Any]:
+        """
+        Read several HUD regions with a single recognizer call.
+
+        Each ROI is preprocessed for its kind ('number', 'time' or 'surge'),
+        stacked into one mosaic and passed to readtext once. Detections are
+        mapped back to the tile whose rows contain the box center.
+        """
+        keywords = keywords or ['SURGE', 'DAMAGE', 'BELOW', 'STORM SURGE']
+        decoded = {}
+        pending = []
+        for name, (image, kind) in rois.items():
+            self.last_confidence[name] = 0.0
+            if kind == 'surge':
+                if not self.surge_gate_open(image, name):
+                    self.last_confidence[name] = 1.0
+                    decoded[name] = {'detected': False, 'text': ''}
+                    continue
+                with self._timed('preprocess', name):
+                    pending.append((name, kind, self.preprocess_surge_warning(image, name)))
+                continue
+            text = self._read_digits(image, allow_colon=(kind == 'time'), region=name)
+            if text:
+                decoded[name] = self._parse_time([text]) if kind == 'time' else int(text)
+            else:
+                pending.append((name, kind, image))
+        if not pending:
+            return decoded
+        if not self._ensure_reader():
+            for name, kind, _ in pending:
+                if kind == 'surge':
+                    decoded[name] = self._unconfirmed_surge(name)
+            return decoded
+        # Only now are the unsure digit ROIs preprocessed the way the fallback expects
+        pending = [(name, kind, image if kind == 'surge' else self._fallback_image(image, name))
+                   for name, kind, image in pending]
+        try:
+            mosaic, tiles = self._build_mosaic(pending)
+            with self._timed('ocr', 'mosaic', self.backend):
+                results = self.reader.readtext(mosaic, detail=1, paragraph=False,
+                                               batch_size=self.batch_size)
+        except Exception as e:
+            logger.debug(f"Batched extraction error: {e}")
+            self._count_error()
+            return decoded
+
+        texts = {name: [] for name, _, _, _ in tiles}
+        starts = [top for _, _, top, _ in tiles]
+        for bbox, text, confidence in results:
+            ys = [point[1] for point in bbox]
+            xs = [point[0] for point in bbox]
+            center = (min(ys) + max(ys)) / 2.0
+            idx = max(bisect.bisect_right(starts, center) - 1, 0)
+            name, _, top, height = tiles[idx]
+            if center <= top + height:
+                texts[name].append((min(xs), text, confidence))
+
+        for name, kind, _, _ in tiles:
+            found = sorted(texts[name])
+            parts = [text for _, text, _ in found]
+            self.last_confidence[name] = self._mean_confidence(found)
+            if kind == 'time':
+                decoded[name] = self._parse_time(parts + ["".join(parts)])
+            elif kind == 'surge':
+                decoded[name] = self._match_surge(" ".join(parts), keywords)
+            else:
+                decoded[name] = self._parse_number(parts)
+        return decoded
+
+    def _build_mosaic(self, processed: List[Tuple[str, str, np.ndarray]]):
+        pad = self.mosaic_padding
+        width = max(img.shape[1] for _, _, img in processed) + 2 * pad
+        height = sum(img.shape[0] for _, _, img in processed) + pad * (len(processed) + 1)
+        mosaic = np.zeros((height, width), dtype=np.uint8)
+
+        tiles = []
+        top = pad
+        for name, kind, img in processed:
+            h, w = img.shape[:2]
+            mosaic[top:top + h, pad:pad + w] = img
+            tiles.append((name, kind, top, h))
+            top += h + pad
+        return mosaic, tiles
+
+    def _ensure_reader(self) -> bool:
+        if not self.fallback:
+            return False
+        if self._initialized:
+            return True
+        # A background load is never waited on from the hot path
+        return self._loader is None and self.initialize()
+
+    def surge_gate_open(self, image: np.ndarray, region: Optional[str] = None) -> bool:
+        if self.surge_gate is None:
+            return True
+        with self._timed('gate', region):
+            return self.surge_gate.check(image)
+
+    def _unconfirmed_surge(self, region: Optional[str] = None) -> Dict[str, Any]:
+        # No recognizer to confirm keywords with: an open gate is all the evidence there is
+        self.last_confidence[region] = 0.5 if self.surge_gate is not None else 0.0
+        return {'detected': self.surge_gate is not None, 'text': ''}
+
+    def _timed(self, stage: str, region: Optional[str], engine: Optional[str] = None):
+        if self.metrics is None:
+            return nullcontext()
+        labels = {'region': region or 'unknown'}
+        if engine:
+            labels['engine'] = engine
+        return self.metrics.timer(f'vision_{stage}_seconds', **labels)
+
+    def _count_error(self):
+        if self.metrics is not None:
+            self.metrics.inc('vision_errors_total', stage='ocr')
+
+    def _read_digits(self, image: np.ndarray, allow_colon: bool = False, region: Optional[str] = None,
+                     preprocess: bool = True, final: bool = True) -> Optional[str]:
+        """
+        Digit recognizer over decode_tiers(), stopping at the first read that
+        clears digit_confidence. Without a fallback (and final set) the most
+        confident guess is returned instead of None. Time reads must have a colon.
+        """
+        if self.digits is None:
+            return None
+        best_text, best_confidence = "", 0.0
+        tiers = self.decode_tiers() if preprocess else [None]
+        for step, tier in enumerate(tiers):
+            processed = image
+            if tier is not None:
+                with self._timed('preprocess', region):
+                    processed = self._preprocessor(NumberPreprocessor, region)(image, tier)
+            with self._timed('ocr', region, 'digits'):
+                text, confidence = self.digits.recognize(processed, allow_colon=allow_colon)
+            if not text or (allow_colon and ':' not in text):
+                continue
+            if confidence >= self.digit_confidence:
+                self.digit_hits += 1
+                self.tier_hits[tier] = self.tier_hits.get(tier, 0) + 1
+                if step:
+                    self.escalations += 1
+                self.last_confidence[region] = confidence
+                return text
+            if confidence > best_confidence:
+                best_text, best_confidence = text, confidence
+        if best_text and final and not self.fallback:
+            self.digit_hits += 1
+            self.last_confidence[region] = best_confidence
+            return best_text
+        self.digit_fallbacks += 1
+        return None
+
+    def _fallback_image(self, image: np.ndarray, region: Optional[str]) -> np.ndarray:
+        # The fallback always gets the governor's tier, whatever the digit pass ended on
+        with self._timed('preprocess', region):
+            return self.preprocess_for_numbers(image, region)
+
+    def _recognize(self, processed: np.ndarray, region: Optional[str]) -> List[str]:
+        """Fallback read of one ROI; records the mean confidence of what it found."""
+        with self._timed('ocr', region, self.backend):
+            results = self.reader.readtext(processed, detail=1, paragraph=False)
+        self.last_confidence[region] = self._mean_confidence(results)
+        return [text for _, text, _ in results]
+
+    @staticmethod
+    def _mean_confidence(results) -> float:
+        if not results:
+            return 0.0
+        return float(sum(result[-1] for result in results)) / len(results)
+
+    def _learn_digits(self, processed: np.ndarray, results: List[str]):
+        # Single clean fallback reads feed the digit templates; DigitRecognizer
+        # waits for several agreeing glyphs before it moves a template
+        if self.digits is None or len(results) != 1:
+            return
+        text = results[0].strip()
+        if re.fullmatch(r'\d+(:\d+)?', text) and self.digits.learn(processed, text):
+            self._templates_dirty = True
+
+    def _parse_number(self, texts: List[str]) -> Optional[int]:
+        for text in texts:
+            matches = self._number_pattern.findall(text)
+            if matches:
+                return int(matches[0])
+        return None
+
+    def _parse_time(self, texts: List[str]) -> Optional[Tuple[int, int]]:
+        for text in texts:
+            match = self._time_pattern.search(text)
+            if match:
+                return (int(match.group(1)), int(match.group(2)))
+        return None
+
+    def _match_surge(self, text: str, keywords: List[str]) -> Dict[str, Any]:
+        text = text.upper()
+        for keyword in keywords:
+            if keyword in text:
+                return {'detected': True, 'text': text}
+        return {'detected': False, 'text': text}
+
     def release(self):
-              self.reader = None
+        if self.digits is not None and self._templates_dirty:
+            if self.digits.save():
+                logger.info(f"Saved learned digit templates to {self.digits.templates_path}")
+            self._templates_dirty = False
+        if self.reader is not None:
+            self.reader.release()
+        self.reader = None
         self._initialized = False
         logger.info("FortniteOCR released")
@@ -0,0 +1,187 @@
+"""
+Pipelined Extraction Module
+Runs capture, OCR extraction and bridge publishing as overlapping stages
+Bounded drop-oldest queues keep the newest frame flowing to the bot
+"""
+
+import time
+import threading
+from collections import deque
+from typing import Any, Callable, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class LatestQueue:
+    """
+    Bounded queue that drops the oldest item when full, so the newest always
+    wins. With drop_oldest=False it blocks the producer instead (lossless
+    offline replay).
+    """
+
+    def __init__(self, maxsize: int = 1, drop_oldest: bool = True):
+        self._items = deque(maxlen=maxsize)
+        self._cond = threading.Condition()
+        self._closed = False
+        self.drop_oldest = drop_oldest
+        self.dropped = 0
+
+    def put(self, item: Any):
+        with self._cond:
+            if len(self._items) == self._items.maxlen:
+                if not self.drop_oldest:
+                    while len(self._items) == self._items.maxlen and not self._closed:
+                        self._cond.wait(0.5)
+                else:
+                    self.dropped += 1
+            self._items.append(item)
+            self._cond.notify_all()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        with self._cond:
+            if not self._items and not self._closed:
+                self._cond.wait(timeout)
+            if not self._items:
+                return None
+            item = self._items.popleft()
+            self._cond.notify_all()
+            return item
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class StatePipeline:
+    """
+    Three-stage pipeline: capture thread -> extraction thread -> publisher thread.
+    A slow OCR frame no longer delays the next capture, and a slow socket
+    write no longer delays OCR.
+    """
+
+    def __init__(self, extractor, bridge, target_fps: float = 3, queue_size: int = 1,
+                 on_state: Optional[Callable] = None, tracker=None, events=None, lossless: bool = False,
+                 metrics=None):
+        self.extractor = extractor
+        self.bridge = bridge
+        self.tracker = tracker
+        self.events = events  # EventDetector; publishes events and throttles unchanged states
+        self.target_fps = target_fps
+        self.on_state = on_state
+        self.frames = LatestQueue(queue_size, drop_oldest=not lossless)
+        self.states = LatestQueue(queue_size, drop_oldest=not lossless)
+        self._running = threading.Event()
+        self._extracting = False
+        self._threads = []
+        self.frames_captured = 0
+        self.states_extracted = 0
+        self.states_published = 0
+        self.metrics = metrics
+        if metrics is not None:
+            metrics.register_collector(self._collect_metrics)
+
+    def start(self):
+        self._running.set()
+        for name, target in (('capture', self._capture_loop),
+                             ('extract', self._extract_loop),
+                             ('publish', self._publish_loop)):
+            thread = threading.Thread(target=target, name=f"pipeline-{name}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"Pipeline started (target {self.target_fps} FPS)")
+
+    def stop(self, timeout: float = 2.0):
+        self._running.clear()
+        self.frames.close()
+        self.states.close()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        logger.info("Pipeline stopped")
+
+    @property
+    def is_running(self) -> bool:
+        return self._running.is_set()
+
+    @property
+    def idle(self) -> bool:
+        """True when no frame or state is queued or being processed."""
+        return not self.frames and not self.states and not self._extracting
+
+    def stats(self) -> dict:
+        return {
+            'frames_captured': self.frames_captured,
+            'frames_dropped': self.frames.dropped,
+            'states_extracted': self.states_extracted,
+            'states_dropped': self.states.dropped,
+            'states_published': self.states_published,
+        }
+
+    def _count_error(self, stage: str):
+        if self.metrics is not None:
+            self.metrics.inc('vision_errors_total', stage=stage)
+
+    def _collect_metrics(self):
+        return [
+            ('vision_frames_dropped_total', 'counter', {'queue': 'frames'}, self.frames.dropped),
+            ('vision_frames_dropped_total', 'counter', {'queue': 'states'}, self.states.dropped),
+        ]
+
+    def _frame_interval(self) -> float:
+        # AdaptiveCapture retunes frame_time from load; honour it when present
+        return getattr(self.extractor.capture, 'frame_time', 1.0 / self.target_fps)
+
+    def _capture_loop(self):
+        while self._running.is_set():
+            loop_start = time.time()
+            try:
+                frame = self.extractor.grab_frame()
+            except Exception as e:
+                logger.error(f"Pipeline capture error: {e}")
+                self._count_error('capture')
+                frame = None
+            if frame is not None:
+                self.frames_captured += 1
+                self.frames.put((self.extractor.capture_time(), frame))
+            elif self.extractor.capture_exhausted:
+                break
+            elapsed = time.time() - loop_start
+            interval = self._frame_interval()
+            if elapsed < interval:
+                time.sleep(interval - elapsed)
+
+    def _extract_loop(self):
+        while self._running.is_set():
+            self._extracting = False
+            item = self.frames.get(timeout=0.5)
+            if item is None:
+                continue
+            self._extracting = True
+            captured_at, frame = item
+            try:
+                state = self.extractor.extract_frame(frame, captured_at)
+                if self.tracker is not None:
+                    state = self.tracker.update(state, self.extractor.last_refreshed)
+            except Exception as e:
+                logger.error(f"Pipeline extraction error: {e}")
+                self._count_error('extract')
+                continue
+            self.states_extracted += 1
+            self.states.put(state)
+            if self.on_state:
+                self.on_state(state)
+
+    def _publish_loop(self):
+        while self._running.is_set():
+            state = self.states.get(timeout=0.5)
+            if state is None:
+                continue
+            if self.events is not None and not self.events.process(state):
+                continue
+            if self.bridge.send_state(state):
+                self.states_published += 1
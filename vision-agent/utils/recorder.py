@@ -0,0 +1,204 @@
+"""
+Frame Recorder Module
+Records captured frames (full screen or capture-plan boxes) with timestamps
+into a memory-mappable container, and replays them as a capture source
+"""
+
+import json
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+import numpy as np
+import logging
+
+from .capture import CapturePlan, RegionFrame
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"FNREC1\n"
+HEADER_SIZE = 4096
+
+# Container layout:
+#   [0, 4096)  MAGIC + JSON header, NUL padded
+#   records    fixed size: float64 timestamp + raw BGR pixels
+# Full-frame recordings store one (H, W, 3) image per record; region
+# recordings store the capture-plan boxes back to back.
+
+
+class FrameRecorder:
+    """Appends captured frames to a recording file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+        self._header: Optional[Dict[str, Any]] = None
+        self.frames_written = 0
+
+    def write(self, frame: Union[np.ndarray, RegionFrame], timestamp: Optional[float] = None):
+        timestamp = time.time() if timestamp is None else timestamp
+        if self._file is None:
+            self._open(frame)
+        if isinstance(frame, RegionFrame):
+            if [list(box) for box in frame.boxes] != self._header['boxes']:
+                raise ValueError("Capture plan changed during recording")
+            payload = b''.join(np.ascontiguousarray(image).tobytes() for image in frame.images)
+        else:
+            if list(frame.shape) != self._header['frame_shape']:
+                raise ValueError("Frame size changed during recording")
+            payload = np.ascontiguousarray(frame).tobytes()
+        self._file.write(np.float64(timestamp).tobytes())
+        self._file.write(payload)
+        self.frames_written += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            logger.info(f"Recorded {self.frames_written} frames to {self.path}")
+
+    def _open(self, frame):
+        if isinstance(frame, RegionFrame):
+            self._header = {
+                'mode': 'regions',
+                'boxes': [list(box) for box in frame.boxes],
+                'screen_size': list(frame.screen_size) if frame.screen_size else None,
+            }
+        else:
+            self._header = {'mode': 'full', 'frame_shape': list(frame.shape)}
+        encoded = MAGIC + json.dumps(self._header).encode('utf-8')
+        if len(encoded) > HEADER_SIZE:
+            raise ValueError("Recording header too large")
+        self._file = open(self.path, 'wb')
+        self._file.write(encoded.ljust(HEADER_SIZE, b'\0'))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class ReplayCapture:
+    """
+    Capture source that plays back a recording. Drop-in for FastCapture:
+    realtime=True paces frames by their recorded timestamps, realtime=False
+    returns them as fast as they are requested.
+    """
+
+    def __init__(self, path: str, realtime: bool = True, loop: bool = False, speed: float = 1.0):
+        self.path = path
+        self.realtime = realtime
+        self.loop = loop
+        self.speed = speed
+        self.frame_time = 0.0
+        self.last_capture = 0.0
+        self.exhausted = False
+        self._records = None
+        self._header: Dict[str, Any] = {}
+        self._boxes: List[tuple] = []
+        self._index = 0
+        self._started_at = 0.0
+        self._first_recorded = 0.0
+        self._initialized = False
+
+    def initialize(self) -> bool:
+        try:
+            with open(self.path, 'rb') as f:
+                raw = f.read(HEADER_SIZE)
+            if not raw.startswith(MAGIC):
+                logger.error(f"{self.path} is not a frame recording")
+                return False
+            self._header = json.loads(raw[len(MAGIC):].rstrip(b'\0'))
+            if self._header['mode'] == 'regions':
+                self._boxes = [tuple(box) for box in self._header['boxes']]
+                pixel_shape = (sum(w * h * 3 for _, _, w, h in self._boxes),)
+            else:
+                pixel_shape = tuple(self._header['frame_shape'])
+            dtype = np.dtype([('timestamp', '<f8'), ('pixels', np.uint8, pixel_shape)])
+            self._records = np.memmap(self.path, dtype=dtype, mode='r', offset=HEADER_SIZE)
+            self._index = 0
+            self.exhausted = len(self._records) == 0
+            self._initialized = True
+            logger.info(f"ReplayCapture loaded {len(self._records)} frames from {self.path}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to open recording: {e}")
+            return False
+
+    def __len__(self) -> int:
+        return len(self._records) if self._records is not None else 0
+
+    @property
+    def screen_size(self) -> Optional[Tuple[int, int]]:
+        if self._header.get('screen_size'):
+            return tuple(self._header['screen_size'])
+        if self._header.get('frame_shape'):
+            height, width = self._header['frame_shape'][:2]
+            return (width, height)
+        return None
+
+    def capture(self) -> Optional[Union[np.ndarray, RegionFrame]]:
+        if not self._initialized:
+            if not self.initialize():
+                return None
+        if self._index >= len(self._records):
+            if not self.loop or not len(self._records):
+                self.exhausted = True
+                return None
+            self._index = 0
+            self._started_at = 0.0
+        record = self._records[self._index]
+        self._index += 1
+        self._pace(float(record['timestamp']))
+        self.last_capture = float(record['timestamp'])
+        return self._unpack(record['pixels'])
+
+    def capture_region(self, x: int, y: int, width: int, height: int) -> Optional[np.ndarray]:
+        frame = self.capture()
+        if frame is None:
+            return None
+        return frame[y:y + height, x:x + width]
+
+    def capture_plan(self, plan: CapturePlan) -> Optional[RegionFrame]:
+        frame = self.capture()
+        if frame is None or isinstance(frame, RegionFrame):
+            return frame
+        images = [frame[y:y + h, x:x + w] for x, y, w, h in plan.boxes]
+        return RegionFrame(plan.boxes, images, (frame.shape[1], frame.shape[0]))
+
+    def capture_with_throttle(self):
+        return self.capture()
+
+    def release(self):
+        self._records = None
+        self._initialized = False
+
+    def _pace(self, recorded_at: float):
+        if not self.realtime:
+            return
+        if not self._started_at:
+            self._started_at = time.time()
+            self._first_recorded = recorded_at
+            return
+        due = self._started_at + (recorded_at - self._first_recorded) / self.speed
+        delay = due - time.time()
+        if delay > 0:
+            time.sleep(delay)
+
+    def _unpack(self, pixels: np.ndarray) -> Union[np.ndarray, RegionFrame]:
+        if self._header['mode'] != 'regions':
+            return pixels
+        images = []
+        offset = 0
+        for _, _, w, h in self._boxes:
+            size = w * h * 3
+            images.append(pixels[offset:offset + size].reshape(h, w, 3))
+            offset += size
+        screen_size = self._header.get('screen_size')
+        return RegionFrame(self._boxes, images, tuple(screen_size) if screen_size else None)
+
+    def __enter__(self):
+        self.initialize()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
@@ -0,0 +1,159 @@
+"""
+Region Plan Module
+Compiles the regions config once into immutable, frame-size-specific
+slices and decoder assignments for the extraction hot loop
+"""
+
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+import numpy as np
+import cv2
+import logging
+
+from .capture import Box, RegionFrame
+
+logger = logging.getLogger(__name__)
+
+# (GameState field, path into config regions, decoder kind)
+FIELD_REGIONS = (
+    ('hp', ('hp',), 'number'),
+    ('shield', ('shield',), 'number'),
+    ('wood', ('materials', 'wood'), 'number'),
+    ('brick', ('materials', 'brick'), 'number'),
+    ('metal', ('materials', 'metal'), 'number'),
+    ('storm_timer', ('storm_timer',), 'time'),
+    ('storm_phase', ('storm_phase',), 'number'),
+    ('alive_players', ('player_count',), 'number'),
+    ('eliminations', ('elimination_count',), 'number'),
+    ('surge', ('surge_warning',), 'surge'),
+)
+
+
+class CompiledRegion(NamedTuple):
+    field: str    # GameState field
+    name: str     # config key, also the cache key
+    kind: str     # decoder: 'number', 'time' or 'surge'
+    box: Box      # pixels at the plan's frame size
+    rows: slice
+    cols: slice
+    scale: float = 1.0  # downscale applied before OCR (calibrate.py --tighten picks it)
+
+
+class BoxSlots(NamedTuple):
+    """Per-region (box index, rows, cols) inside the images of one set of capture boxes."""
+    boxes: Sequence[Box]
+    slots: Tuple[Optional[Tuple[int, slice, slice]], ...]
+
+
+class RegionPlan:
+    """
+    The configured regions resolved for one frame size. A region is either
+    pixels authored at base_resolution (scaled to the frame) or, when all
+    four values are floats in [0, 1], fractions of the frame. An optional
+    'scale' below 1 shrinks the ROI before it reaches the OCR.
+    """
+
+    def __init__(self, regions: Tuple[CompiledRegion, ...], frame_size: Tuple[int, int]):
+        self.regions = regions
+        self.frame_size = frame_size
+        self.boxes = np.array([region.box for region in regions], np.int32).reshape(-1, 4)
+        self._scaled: Dict[Tuple[int, int], np.ndarray] = {}
+
+    @classmethod
+    def compile(cls, config: Dict[str, Any], frame_size: Tuple[int, int],
+                base_resolution: Optional[Sequence[int]] = None,
+                fields=FIELD_REGIONS) -> 'RegionPlan':
+        regions = []
+        for field_name, path, kind in fields:
+            region = config
+            for key in path:
+                region = region.get(key) if region else None
+            if not region:
+                continue
+            box = cls.resolve(region, frame_size, base_resolution)
+            if box is None:
+                logger.warning(f"Region {path[-1]} lies outside the {frame_size[0]}x{frame_size[1]} frame")
+                continue
+            x, y, w, h = box
+            scale = min(max(float(region.get('scale', 1.0)), 0.1), 1.0)
+            regions.append(CompiledRegion(field_name, path[-1], kind, box,
+                                          slice(y, y + h), slice(x, x + w), scale))
+        return cls(tuple(regions), tuple(frame_size))
+
+    @staticmethod
+    def resolve(region: Dict[str, Any], frame_size: Tuple[int, int],
+                base_resolution: Optional[Sequence[int]] = None) -> Optional[Box]:
+        """Pixel box of one region config on a frame_size frame, clipped to it."""
+        values = (region.get('x', 0), region.get('y', 0), region.get('width', 100), region.get('height', 50))
+        width, height = frame_size
+        if all(isinstance(v, float) and 0.0 <= v <= 1.0 for v in values):
+            sx, sy = width, height
+        elif base_resolution:
+            sx, sy = width / base_resolution[0], height / base_resolution[1]
+        else:
+            sx = sy = 1.0
+        x, y = int(round(values[0] * sx)), int(round(values[1] * sy))
+        x1 = min(int(round((values[0] + values[2]) * sx)), width)
+        y1 = min(int(round((values[1] + values[3]) * sy)), height)
+        x, y = max(x, 0), max(y, 0)
+        if x1 <= x or y1 <= y:
+            return None
+        return (x, y, x1 - x, y1 - y)
+
+    def bind(self, boxes: Sequence[Box]) -> BoxSlots:
+        """Precompute where each region sits inside RegionFrames made of these boxes."""
+        slots = []
+        for region in self.regions:
+            x, y, w, h = region.box
+            slot = None
+            for index, (bx, by, bw, bh) in enumerate(boxes):
+                if bx <= x and by <= y and x + w <= bx + bw and y + h <= by + bh:
+                    slot = (index, slice(y - by, y - by + h), slice(x - bx, x - bx + w))
+                    break
+            slots.append(slot)
+        return BoxSlots(boxes, tuple(slots))
+
+    def view(self, frame: Union[np.ndarray, RegionFrame], index: int,
+             bound: Optional[BoxSlots] = None) -> Optional[np.ndarray]:
+        """
+        ROI of region index as a view into frame, or None if it is not in the
+        frame. A scaled region comes back in a per-region buffer instead,
+        overwritten by the next view of that region.
+        """
+        region = self.regions[index]
+        if bound is not None and isinstance(frame, RegionFrame) and frame.boxes is bound.boxes:
+            slot = bound.slots[index]
+            if slot is None:
+                return None
+            roi = frame.images[slot[0]][slot[1], slot[2]]
+        else:
+            roi = frame[region.rows, region.cols]
+        if not roi.size:
+            return None
+        if region.scale < 1.0:
+            key = (index, roi.ndim)
+            height, width = self.roi_shape(index)
+            out = self._scaled.get(key)
+            if out is None or out.shape[:2] != (height, width):
+                out = self._scaled[key] = np.empty((height, width) + roi.shape[2:], roi.dtype)
+            roi = cv2.resize(roi, (width, height), dst=out, interpolation=cv2.INTER_AREA)
+        return roi
+
+    def roi_shape(self, index: int) -> Tuple[int, int]:
+        """(height, width) of the ROI view() returns for region index."""
+        region = self.regions[index]
+        _, _, w, h = region.box
+        if region.scale >= 1.0:
+            return (h, w)
+        return (max(int(round(h * region.scale)), 1), max(int(round(w * region.scale)), 1))
+
+    @property
+    def roi_shapes(self) -> List[Tuple[int, int]]:
+        return [self.roi_shape(index) for index in range(len(self.regions))]
+
+    @property
+    def pixel_count(self) -> int:
+        """Pixels handed to the OCR per frame, after any per-region scale."""
+        return sum(h * w for h, w in self.roi_shapes)
+
+    def __len__(self) -> int:
+        return len(self.regions)
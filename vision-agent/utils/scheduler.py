@@ -0,0 +1,97 @@
+"""
+Field Refresh Scheduler Module
+Decides which HUD fields to re-read each tick from per-field refresh
+intervals, priorities and a per-frame OCR time budget
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FieldSchedule:
+    """Refresh policy and running cost estimate for one GameState field."""
+    name: str
+    interval: float = 0.0
+    priority: int = 5
+    last_refresh: float = 0.0
+    cost: Optional[float] = None
+
+
+class FieldScheduler:
+    """Picks the fields to refresh each tick; the rest carry forward from the last state."""
+
+    def __init__(self, fields: Iterable[str], config: Dict[str, Any] = None):
+        config = config or {}
+        self.budget = config.get('budget_ms', 150) / 1000.0
+        self.cost_smoothing = config.get('cost_smoothing', 0.3)
+        self.max_aging = config.get('max_aging', 10.0)
+        field_config = config.get('fields', {})
+        self.fields: Dict[str, FieldSchedule] = {}
+        for name in fields:
+            options = field_config.get(name, {})
+            self.fields[name] = FieldSchedule(
+                name=name,
+                interval=options.get('interval', 0.0),
+                priority=options.get('priority', 5)
+            )
+        self.skipped = 0
+        # Set by the resource governor to thin out refreshes under load
+        self.interval_scale = 1.0
+        self.interval_floor = 0.0
+
+    def plan(self, now: float) -> List[str]:
+        """
+        Due fields ordered by priority, trimmed to the budget. Every second a
+        field is overdue adds one priority point, so low-priority fields
+        cannot starve; the most urgent due field is always kept.
+        """
+        due = []
+        for schedule in self.fields.values():
+            interval = max(schedule.interval * self.interval_scale, self.interval_floor)
+            overdue = now - schedule.last_refresh - interval
+            if overdue >= 0:
+                due.append((schedule.priority + min(overdue, self.max_aging), schedule))
+        due.sort(key=lambda item: item[0], reverse=True)
+
+        selected = []
+        spent = 0.0
+        for _, schedule in due:
+            cost = schedule.cost or 0.0
+            if selected and spent + cost > self.budget:
+                self.skipped += 1
+                continue
+            selected.append(schedule.name)
+            spent += cost
+        return selected
+
+    def record(self, name: str, now: float, elapsed: float):
+        schedule = self.fields.get(name)
+        if schedule is None:
+            return
+        schedule.last_refresh = now
+        if schedule.cost is None:
+            schedule.cost = elapsed
+        else:
+            schedule.cost += self.cost_smoothing * (elapsed - schedule.cost)
+
+    def set_interval(self, name: str, interval: float):
+        schedule = self.fields.get(name)
+        if schedule is not None:
+            schedule.interval = interval
+
+    def set_load_factor(self, scale: float, floor: float = 0.0):
+        """Stretch every refresh interval by scale, and refresh nothing more often than floor seconds."""
+        self.interval_scale = scale
+        self.interval_floor = floor
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'budget_ms': round(self.budget * 1000, 1),
+            'interval_scale': self.interval_scale,
+            'skipped': self.skipped,
+            'cost_ms': {name: round((s.cost or 0.0) * 1000, 2) for name, s in self.fields.items()},
+        }
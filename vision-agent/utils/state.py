@@ -0,0 +1,200 @@
+"""
+Game State Module
+Compact slotted GameState with a hand-written serializer, and a numpy
+structured-array layout for storing many states at once
+"""
+
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class GameState:
+    """Complete Fortnite game state extracted from screen."""
+    hp: Optional[int] = None
+    shield: Optional[int] = None
+    wood: Optional[int] = None
+    brick: Optional[int] = None
+    metal: Optional[int] = None
+    storm_phase: Optional[int] = None
+    storm_timer: Optional[str] = None
+    storm_seconds: Optional[int] = None
+    alive_players: Optional[int] = None
+    eliminations: Optional[int] = None
+    surge_active: bool = False
+    surge_text: str = ""
+    timestamp: float = field(default_factory=time.time)
+    capture_fps: float = 0.0
+    confidence: float = 0.0
+    stream_id: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        # Every field is a scalar, so a flat literal replaces asdict's recursive deep copy
+        return {
+            'hp': self.hp,
+            'shield': self.shield,
+            'wood': self.wood,
+            'brick': self.brick,
+            'metal': self.metal,
+            'storm_phase': self.storm_phase,
+            'storm_timer': self.storm_timer,
+            'storm_seconds': self.storm_seconds,
+            'alive_players': self.alive_players,
+            'eliminations': self.eliminations,
+            'surge_active': self.surge_active,
+            'surge_text': self.surge_text,
+            'timestamp': self.timestamp,
+            'capture_fps': self.capture_fps,
+            'confidence': self.confidence,
+            'stream_id': self.stream_id,
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'GameState':
+        return cls(**{name: data[name] for name in STATE_FIELDS if name in data})
+
+    @property
+    def total_mats(self) -> int:
+        return (self.wood or 0) + (self.brick or 0) + (self.metal or 0)
+
+    @property
+    def effective_hp(self) -> int:
+        return (self.hp or 0) + (self.shield or 0)
+
+    @property
+    def is_low_hp(self) -> bool:
+        return self.effective_hp < 100
+
+    @property
+    def is_low_mats(self) -> bool:
+        return self.total_mats < 300
+
+
+STATE_FIELDS = GameState.__slots__
+
+# Unset ints are stored as -1 and unset strings as b''; HUD values are never negative, so
+# negative or column-overflowing misreads are stored as unset too.
+# Strings are UTF-8 bytes: a U column would take 4 bytes a character.
+STATE_DTYPE = np.dtype([
+    ('hp', 'i2'),
+    ('shield', 'i2'),
+    ('wood', 'i2'),
+    ('brick', 'i2'),
+    ('metal', 'i2'),
+    ('storm_phase', 'i2'),
+    ('storm_timer', 'S8'),
+    ('storm_seconds', 'i4'),
+    ('alive_players', 'i2'),
+    ('eliminations', 'i2'),
+    ('surge_active', '?'),
+    ('surge_text', 'S64'),
+    ('timestamp', 'f8'),
+    ('capture_fps', 'f8'),
+    ('confidence', 'f8'),
+    ('stream_id', 'S16'),
+])
+_INT_FIELDS = tuple(name for name in STATE_FIELDS if STATE_DTYPE[name].kind == 'i')
+_STR_FIELDS = ('storm_timer', 'surge_text', 'stream_id')
+MISSING = -1
+
+
+I2_MAX = np.iinfo(np.int16).max
+I4_MAX = np.iinfo(np.int32).max
+
+
+def _int(value: Optional[int], high: int = I2_MAX) -> int:
+    # A misread that does not fit its column (or is negative) is stored as unset
+    return value if value is not None and 0 <= value <= high else MISSING
+
+
+def _bytes(value: Optional[str]) -> bytes:
+    return value.encode('utf-8') if value else b''
+
+
+class StateArray:
+    """
+    GameStates as rows of one preallocated STATE_DTYPE array, for bulk use
+    (VOD timelines, history buffers): 133 bytes a state, no per-state
+    objects, columns slice straight into numpy and pickling is a memory
+    copy. The capacity doubles when full. Strings longer than their
+    column are truncated.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self._rows = np.zeros(max(capacity, 1), STATE_DTYPE)
+        self._count = 0
+
+    @classmethod
+    def from_states(cls, states: Iterable[GameState]) -> 'StateArray':
+        states = list(states)
+        array = cls(len(states))
+        array.extend(states)
+        return array
+
+    @classmethod
+    def concatenate(cls, arrays: Iterable['StateArray']) -> 'StateArray':
+        rows = [array.rows for array in arrays]
+        total = sum(len(part) for part in rows)
+        combined = cls(total)
+        if total:
+            combined._rows[:total] = np.concatenate(rows)
+            combined._count = total
+        return combined
+
+    def append(self, state: GameState):
+        if self._count == len(self._rows):
+            self._rows = np.resize(self._rows, len(self._rows) * 2)
+        # One tuple store per row; setting fields one by one costs a numpy call each
+        self._rows[self._count] = (
+            _int(state.hp), _int(state.shield), _int(state.wood), _int(state.brick), _int(state.metal),
+            _int(state.storm_phase), _bytes(state.storm_timer), _int(state.storm_seconds, I4_MAX),
+            _int(state.alive_players), _int(state.eliminations), state.surge_active, _bytes(state.surge_text),
+            state.timestamp, state.capture_fps, state.confidence, _bytes(state.stream_id),
+        )
+        self._count += 1
+
+    def extend(self, states: Iterable[GameState]):
+        for state in states:
+            self.append(state)
+
+    @property
+    def rows(self) -> np.ndarray:
+        """The filled rows as a structured array view."""
+        return self._rows[:self._count]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> GameState:
+        return GameState.from_dict(self.row_dict(index))
+
+    def __iter__(self) -> Iterator[GameState]:
+        for index in range(self._count):
+            yield self[index]
+
+    def row_dict(self, index: int) -> Dict[str, Any]:
+        """Row index in GameState.to_dict form."""
+        if not -self._count <= index < self._count:
+            raise IndexError(index)
+        row = self._rows[index % self._count].item()
+        data = dict(zip(STATE_DTYPE.names, row))
+        for name in _INT_FIELDS:
+            if data[name] == MISSING:
+                data[name] = None
+        for name in _STR_FIELDS:
+            data[name] = data[name].decode('utf-8', 'ignore') or None
+        # surge_text is the one string that is never None
+        data['surge_text'] = data['surge_text'] or ''
+        return data
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return [self.row_dict(index) for index in range(self._count)]
@@ -0,0 +1,212 @@
+"""
+Synthetic HUD Module
+Renders Fortnite-style HUD frames with known ground truth at the
+coordinates in config.json, for headless benchmarks and accuracy checks
+"""
+
+import random
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
+import cv2
+import numpy as np
+
+from .capture import Box, CapturePlan, RegionFrame
+from .regions import RegionPlan
+
+
+@dataclass
+class HUDTruth:
+    """Ground-truth values drawn into a synthetic frame."""
+    hp: int = 100
+    shield: int = 100
+    wood: int = 500
+    brick: int = 300
+    metal: int = 200
+    storm_phase: int = 1
+    storm_seconds: int = 120
+    alive_players: int = 100
+    eliminations: int = 0
+    surge_active: bool = False
+    timestamp: float = 0.0
+
+    def as_fields(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in SCORED_FIELDS}
+
+
+SCORED_FIELDS = ('hp', 'shield', 'wood', 'brick', 'metal', 'storm_phase',
+                 'storm_seconds', 'alive_players', 'eliminations', 'surge_active')
+
+
+class SyntheticHUD:
+    """
+    Draws HUDTruth values into frames laid out by a regions config, resolved
+    for size the same way StateExtractor resolves it.
+
+    Values are drawn in a different Hershey font from the one
+    DigitRecognizer renders its default templates in, and with augment on
+    each value gets scale jitter, a slight blur and a JPEG round trip, so
+    template matching is not scored against its own glyphs. It is still not
+    the Fortnite HUD font: accuracy here is a regression signal, not a
+    measure of accuracy on the real HUD.
+    """
+
+    FONT = cv2.FONT_HERSHEY_SIMPLEX
+    JPEG_QUALITY = (60, 90)
+
+    def __init__(self, regions: Dict[str, Any], size: Tuple[int, int] = (1920, 1080),
+                 seed: Optional[int] = None, noise: float = 0.0,
+                 base_resolution: Optional[Sequence[int]] = None, augment: bool = True):
+        self.regions = regions
+        self.size = size
+        self.plan = RegionPlan.compile(regions, size, base_resolution)
+        self.noise = noise
+        self.augment = augment
+        self._rng = np.random.default_rng(seed)
+        self._random = random.Random(seed)
+        self._background = self._render_background()
+        self._pan = 0
+
+    def render(self, truth: HUDTruth) -> np.ndarray:
+        # Scenery pans under the HUD so cached regions still see background changes
+        self._pan = (self._pan + 7) % (self._background.shape[1] - self.size[0])
+        frame = self._background[:self.size[1], self._pan:self._pan + self.size[0]].copy()
+        if self.noise:
+            jitter = self._rng.normal(0, self.noise, (self.size[1], self.size[0], 1))
+            frame = np.clip(frame.astype(np.int16) + jitter.astype(np.int16), 0, 255).astype(np.uint8)
+        minutes, seconds = divmod(truth.storm_seconds, 60)
+        for region in self.plan.regions:
+            if region.kind == 'surge':
+                if truth.surge_active:
+                    self._draw_surge(frame, region.box)
+            elif region.field == 'storm_timer':
+                self._draw_value(frame, region.box, f"{minutes}:{seconds:02d}")
+            else:
+                self._draw_value(frame, region.box, str(getattr(truth, region.field)))
+        return frame
+
+    def match(self, frames: int, fps: float = 3.0, start: float = 0.0) -> Iterator[Tuple[HUDTruth, np.ndarray]]:
+        """A plausible match: HP/shield trade in fights, mats drift, players fall, timer counts down."""
+        truth = HUDTruth(timestamp=start)
+        remaining = float(truth.storm_seconds)
+        step = 1.0 / fps
+        for _ in range(frames):
+            yield truth, self.render(truth)
+            truth, remaining = self._advance(truth, step, remaining)
+
+    def _advance(self, truth: HUDTruth, step: float, remaining: float) -> Tuple[HUDTruth, float]:
+        rnd = self._random
+        nxt = replace(truth, timestamp=truth.timestamp + step)
+        if rnd.random() < 0.15:
+            damage = rnd.randint(5, 60)
+            absorbed = min(nxt.shield, damage)
+            nxt.shield -= absorbed
+            nxt.hp = max(1, nxt.hp - (damage - absorbed))
+        elif rnd.random() < 0.1:
+            nxt.shield = min(100, nxt.shield + 25)
+        for mat in ('wood', 'brick', 'metal'):
+            if rnd.random() < 0.1:
+                setattr(nxt, mat, max(0, min(999, getattr(nxt, mat) + rnd.randint(-40, 30))))
+        if rnd.random() < 0.08 and nxt.alive_players > 2:
+            nxt.alive_players -= rnd.randint(1, 3)
+        if rnd.random() < 0.03:
+            nxt.eliminations += 1
+        remaining -= step
+        if remaining <= 0:
+            nxt.storm_phase = min(12, nxt.storm_phase + 1)
+            remaining = float(rnd.randint(60, 150))
+        nxt.storm_seconds = int(np.ceil(remaining))
+        if rnd.random() < 0.05:
+            nxt.surge_active = not nxt.surge_active
+        return nxt, remaining
+
+    def _render_background(self) -> np.ndarray:
+        # Low-frequency colour blobs, wider than the screen so it can pan
+        width, height = self.size
+        coarse = self._rng.integers(30, 150, (height // 60 + 2, width // 40 + 2, 3), dtype=np.uint8)
+        return cv2.resize(coarse, (width + width // 4, height), interpolation=cv2.INTER_CUBIC)
+
+    def _draw_value(self, frame: np.ndarray, box: Box, text: str):
+        x, y, w, h = box
+        scale = self._fit_scale(text, w, h)
+        if self.augment:
+            scale *= self._random.uniform(0.85, 1.0)
+        # Glyph by glyph with a little tracking, like the HUD font
+        sizes = [cv2.getTextSize(char, self.FONT, scale, 1)[0] for char in text]
+        gap = max(1, int(round(scale * 4)))
+        total = sum(cw for cw, _ in sizes) + gap * (len(text) - 1)
+        th = max(ch for _, ch in sizes)
+        cx, baseline = x + max((w - total) // 2, 0), y + (h + th) // 2
+        for char, (cw, _) in zip(text, sizes):
+            cv2.putText(frame, char, (cx, baseline), self.FONT, scale, (0, 0, 0), 3, cv2.LINE_AA)
+            cv2.putText(frame, char, (cx, baseline), self.FONT, scale, (255, 255, 255), 1, cv2.LINE_AA)
+            cx += cw + gap
+        if self.augment:
+            self._degrade(frame, box)
+
+    def _degrade(self, frame: np.ndarray, box: Box):
+        # Blur and compression artifacts like a scaled, streamed HUD
+        x, y, w, h = box
+        roi = frame[y:y + h, x:x + w]
+        if self._random.random() < 0.5:
+            roi = cv2.GaussianBlur(roi, (3, 3), self._random.uniform(0.3, 0.8))
+        quality = self._random.randint(*self.JPEG_QUALITY)
+        _, encoded = cv2.imencode('.jpg', roi, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        frame[y:y + h, x:x + w] = cv2.imdecode(encoded, cv2.IMREAD_COLOR)
+
+    def _draw_surge(self, frame: np.ndarray, box: Box):
+        x, y, w, h = box
+        cv2.rectangle(frame, (x, y), (x + w, y + h), (20, 20, 200), -1)
+        text = "STORM SURGE"
+        scale = self._fit_scale(text, w, h)
+        (tw, th), _ = cv2.getTextSize(text, self.FONT, scale, 1)
+        cv2.putText(frame, text, (x + (w - tw) // 2, y + (h + th) // 2), self.FONT, scale,
+                    (255, 255, 255), 1, cv2.LINE_AA)
+
+    def _fit_scale(self, text: str, width: int, height: int) -> float:
+        (tw, th), _ = cv2.getTextSize(text, self.FONT, 1.0, 1)
+        tw += 4 * (len(text) - 1)
+        return min(width * 0.9 / tw, height * 0.7 / th)
+
+
+class SyntheticCapture:
+    """Capture source serving frames from a SyntheticHUD match, with the truth of the last frame."""
+
+    def __init__(self, hud: SyntheticHUD, frames: int, fps: float = 3.0):
+        self._match = hud.match(frames, fps)
+        self.size = hud.size
+        self.screen_size = hud.size
+        self.frame_time = 0.0
+        self.last_capture = 0.0
+        self.last_truth: Optional[HUDTruth] = None
+        self.render_time = 0.0  # drawing cost of the last frame, not part of capture latency
+        self.exhausted = False
+
+    def initialize(self) -> bool:
+        return True
+
+    def capture(self) -> Optional[np.ndarray]:
+        started = time.perf_counter()
+        try:
+            truth, frame = next(self._match)
+        except StopIteration:
+            self.exhausted = True
+            return None
+        self.render_time = time.perf_counter() - started
+        self.last_truth = truth
+        self.last_capture = truth.timestamp or 1e-6
+        return frame
+
+    def capture_region(self, x: int, y: int, width: int, height: int) -> Optional[np.ndarray]:
+        frame = self.capture()
+        return None if frame is None else frame[y:y + height, x:x + width]
+
+    def capture_plan(self, plan: CapturePlan) -> Optional[RegionFrame]:
+        frame = self.capture()
+        if frame is None:
+            return None
+        images = [frame[y:y + h, x:x + w].copy() for x, y, w, h in plan.boxes]
+        return RegionFrame(plan.boxes, images, self.size)
+
+    def release(self):
+        pass
@@ -0,0 +1,176 @@
+"""
+State Tracker Module
+Temporal layer between StateExtractor and the bridge: extrapolates the
+storm timer from the wall clock and filters implausible OCR readings
+"""
+
+from collections import deque
+from dataclasses import replace
+from typing import Any, Dict, Iterable, Optional
+import logging
+
+from .state import GameState
+
+logger = logging.getLogger(__name__)
+
+
+class StateTracker:
+    """Filters and extrapolates consecutive GameStates before they are published."""
+
+    # Hard limits; readings outside them are never accepted
+    FIELD_LIMITS = {
+        'hp': (0, 100),
+        'shield': (0, 100),
+        'wood': (0, 999),
+        'brick': (0, 999),
+        'metal': (0, 999),
+        'storm_phase': (0, 12),
+        'alive_players': (1, 100),
+        'eliminations': (0, 99),
+    }
+    # Within a match these only move one way (-1 down, +1 up)
+    MONOTONIC = {
+        'alive_players': -1,
+        'eliminations': 1,
+        'storm_phase': 1,
+    }
+    # Largest plausible forward move between two readings; a dropped or extra
+    # digit (60 -> 6, 3 -> 38) jumps much further
+    MAX_STEP = {
+        'alive_players': 10,
+        'eliminations': 3,
+        'storm_phase': 1,
+    }
+
+    def __init__(self, config: Dict[str, Any] = None, scheduler=None):
+        config = config or {}
+        self.scheduler = scheduler
+        self.confirm_frames = config.get('confirm_frames', 3)
+        self.timer_tolerance = config.get('timer_tolerance', 2.0)
+        self.timer_resync_interval = config.get('timer_resync_interval', 10.0)
+        # Median smoothing delays real changes by a refresh or more, so it is
+        # opt-in and only spans readings from the last smooth_max_age seconds
+        self.smooth_fields = set(config.get('smooth_fields', []))
+        self.smooth_window = config.get('smooth_window', 3)
+        self.smooth_max_age = config.get('smooth_max_age', 1.0)
+        self._timer_base_interval = None
+        if scheduler is not None and 'storm_timer' in scheduler.fields:
+            self._timer_base_interval = scheduler.fields['storm_timer'].interval
+
+        self._accepted: Dict[str, Any] = {}
+        self._pending: Dict[str, tuple] = {}
+        self._history: Dict[str, deque] = {}
+        self._timer_anchor: Optional[tuple] = None  # (seconds, wall time)
+        self._timer_pending: Optional[tuple] = None
+        self._timer_consistent = 0
+        self.rejected = 0
+
+    def reset(self):
+        self._accepted.clear()
+        self._pending.clear()
+        self._history.clear()
+        self._timer_anchor = None
+        self._timer_pending = None
+        self._timer_consistent = 0
+        self._set_timer_locked(False)
+
+    def update(self, state: GameState, refreshed: Optional[Iterable[str]] = None) -> GameState:
+        """
+        Returns a filtered copy of state. Only fields in refreshed (all when
+        None) are treated as new readings; the rest are carried values.
+        """
+        refreshed = set(refreshed) if refreshed is not None else None
+        tracked = replace(state)
+        for name in self.FIELD_LIMITS:
+            fresh = refreshed is None or name in refreshed
+            setattr(tracked, name, self._filter(name, getattr(state, name), fresh, state.timestamp))
+        self._track_timer(tracked, state, refreshed is None or 'storm_timer' in refreshed)
+        return tracked
+
+    @property
+    def timer_locked(self) -> bool:
+        return self._timer_consistent >= 2
+
+    def stats(self) -> Dict[str, Any]:
+        return {'rejected': self.rejected, 'timer_locked': self.timer_locked}
+
+    def _filter(self, name: str, value: Optional[int], fresh: bool, now: float) -> Optional[int]:
+        previous = self._accepted.get(name)
+        if value is None or not fresh:
+            return previous if previous is not None else value
+
+        low, high = self.FIELD_LIMITS[name]
+        if not low <= value <= high:
+            self.rejected += 1
+            return previous
+
+        direction = self.MONOTONIC.get(name)
+        if previous is not None and direction and not self._plausible(name, previous, value):
+            # A reversal or a jump is either OCR noise or a new match; only repetition confirms
+            # it, from readings that form a plausible sequence of their own
+            candidate, count = self._pending.get(name, (None, 0))
+            count = count + 1 if candidate is not None and self._plausible(name, candidate, value) else 1
+            self._pending[name] = (value, count)
+            if count < self.confirm_frames:
+                self.rejected += 1
+                return previous
+            self._history.pop(name, None)
+        self._pending.pop(name, None)
+
+        if name in self.smooth_fields:
+            history = self._history.setdefault(name, deque(maxlen=self.smooth_window))
+            while history and now - history[0][1] > self.smooth_max_age:
+                history.popleft()
+            history.append((value, now))
+            value = sorted(reading for reading, _ in history)[len(history) // 2]
+        self._accepted[name] = value
+        return value
+
+    def _plausible(self, name: str, previous: int, value: int) -> bool:
+        return 0 <= (value - previous) * self.MONOTONIC[name] <= self.MAX_STEP[name]
+
+    def _track_timer(self, tracked: GameState, state: GameState, fresh: bool):
+        now = state.timestamp
+        reading = state.storm_seconds if fresh else None
+        if reading is not None:
+            predicted = self._predict_timer(now)
+            if predicted is None or abs(reading - predicted) <= self.timer_tolerance:
+                self._timer_consistent = self._timer_consistent + 1 if predicted is not None else 1
+                self._timer_anchor = (reading, now)
+                self._timer_pending = None
+            elif self._timer_pending and self._agrees_with_pending(reading, now):
+                # Two readings agree with each other but not with us: the timer jumped (new phase)
+                self._timer_anchor = (reading, now)
+                self._timer_consistent = 2
+                self._timer_pending = None
+            else:
+                self._timer_pending = (reading, now)
+                self.rejected += 1
+
+        seconds = self._predict_timer(now)
+        if seconds is None:
+            self._set_timer_locked(False)
+            return
+        seconds = int(round(max(seconds, 0.0)))
+        if seconds == 0:
+            self._timer_consistent = 0
+        tracked.storm_seconds = seconds
+        tracked.storm_timer = f"{seconds // 60}:{seconds % 60:02d}"
+        self._set_timer_locked(self.timer_locked)
+
+    def _predict_timer(self, now: float) -> Optional[float]:
+        if self._timer_anchor is None:
+            return None
+        seconds, anchored_at = self._timer_anchor
+        return seconds - (now - anchored_at)
+
+    def _agrees_with_pending(self, reading: int, now: float) -> bool:
+        seconds, read_at = self._timer_pending
+        return abs(reading - (seconds - (now - read_at))) <= self.timer_tolerance
+
+    def _set_timer_locked(self, locked: bool):
+        # While the countdown is locked it only needs an occasional OCR resync
+        if self.scheduler is None or self._timer_base_interval is None:
+            return
+        interval = self.timer_resync_interval if locked else self._timer_base_interval
+        self.scheduler.set_interval('storm_timer', interval)
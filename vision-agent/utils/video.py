@@ -0,0 +1,155 @@
+"""
+Video Capture Module
+Frame source that samples a recorded match (MP4/MKV/...) at a fixed rate,
+skipping undecoded frames between samples, for offline VOD analysis
+"""
+
+import math
+from typing import Any, Dict, Optional, Tuple
+import numpy as np
+import cv2
+import logging
+
+from .capture import CapturePlan, RegionFrame
+
+logger = logging.getLogger(__name__)
+
+
+class VideoCapture:
+    """
+    Drop-in capture source over a video file. Serves one frame every
+    1 / sample_fps seconds of video between start and end; last_capture is
+    the position in the video in seconds, so the scheduler, tracker and
+    timeline all run on match time rather than wall time.
+
+    Frames between samples are skipped with grab(), which demuxes and
+    decodes but never converts to BGR; gaps longer than seek_frames are
+    crossed with a seek instead.
+    """
+
+    def __init__(self, path: str, sample_fps: float = 3.0, start: float = 0.0,
+                 end: Optional[float] = None, seek_frames: int = 90, threads: int = 0):
+        self.path = path
+        self.sample_fps = sample_fps
+        self.start = max(start, 0.0)
+        self.end = end
+        self.seek_frames = seek_frames
+        self.threads = threads  # decoder threads; 0 lets the backend choose
+        self.realtime = False
+        self.frame_time = 0.0
+        self.last_capture = 0.0
+        self.exhausted = False
+        self.frames_decoded = 0
+        self.frames_skipped = 0
+        self.fps = 0.0
+        self.frame_count = 0
+        self._size: Optional[Tuple[int, int]] = None
+        self._video = None
+        self._position = 0  # index of the next frame the decoder will return
+        # Samples sit on a grid anchored at 0s, so segments of one video line up
+        self._sample = int(math.ceil(self.start * sample_fps - 1e-6))
+        self._first_sample = self._sample
+        self._initialized = False
+
+    def initialize(self) -> bool:
+        params = [cv2.CAP_PROP_N_THREADS, self.threads] if self.threads else []
+        video = cv2.VideoCapture(self.path, cv2.CAP_ANY, params)
+        if not video.isOpened():
+            logger.error(f"Failed to open video {self.path}")
+            return False
+        self.fps = video.get(cv2.CAP_PROP_FPS) or 30.0
+        self.frame_count = int(video.get(cv2.CAP_PROP_FRAME_COUNT))
+        self._size = (int(video.get(cv2.CAP_PROP_FRAME_WIDTH)), int(video.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+        self._video = video
+        self._position = 0
+        self._sample = self._first_sample
+        self.exhausted = False
+        self._initialized = True
+        logger.info(f"VideoCapture {self.path}: {self._size[0]}x{self._size[1]} at {self.fps:.1f} FPS, "
+                    f"{self.duration:.0f}s, sampling {self.sample_fps} FPS")
+        return True
+
+    @property
+    def duration(self) -> float:
+        return self.frame_count / self.fps if self.fps else 0.0
+
+    @property
+    def screen_size(self) -> Optional[Tuple[int, int]]:
+        return self._size
+
+    def __len__(self) -> int:
+        """Number of frames this source will serve."""
+        if not self._initialized:
+            return 0
+        end = min(self.end, self.duration) if self.end is not None else self.duration
+        return max(int(math.ceil(end * self.sample_fps - 1e-6)) - self._first_sample, 0)
+
+    def capture(self) -> Optional[np.ndarray]:
+        if not self._initialized:
+            if not self.initialize():
+                self.exhausted = True
+                return None
+        if self.exhausted:
+            return None
+        seconds = self._sample / self.sample_fps
+        target = int(round(seconds * self.fps))
+        if (self.end is not None and seconds >= self.end) or (self.frame_count and target >= self.frame_count):
+            self.exhausted = True
+            return None
+
+        gap = target - self._position
+        if gap < 0 or gap > self.seek_frames:
+            self._video.set(cv2.CAP_PROP_POS_FRAMES, target)
+            self.frames_skipped += max(gap, 0)
+            self._position = target
+        while self._position < target:
+            if not self._video.grab():
+                self.exhausted = True
+                return None
+            self._position += 1
+            self.frames_skipped += 1
+
+        ok, frame = self._video.read()
+        if not ok:
+            self.exhausted = True
+            return None
+        self._position += 1
+        self._sample += 1
+        self.frames_decoded += 1
+        # The timestamp must be truthy; capture_time() treats 0 as "no timestamp"
+        self.last_capture = seconds or 1e-6
+        return frame
+
+    def capture_region(self, x: int, y: int, width: int, height: int) -> Optional[np.ndarray]:
+        frame = self.capture()
+        return None if frame is None else frame[y:y + height, x:x + width]
+
+    def capture_plan(self, plan: CapturePlan) -> Optional[RegionFrame]:
+        frame = self.capture()
+        if frame is None:
+            return None
+        images = [frame[y:y + h, x:x + w] for x, y, w, h in plan.boxes]
+        return RegionFrame(plan.boxes, images, (frame.shape[1], frame.shape[0]))
+
+    def capture_with_throttle(self):
+        return self.capture()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'frames_decoded': self.frames_decoded,
+            'frames_skipped': self.frames_skipped,
+            'position': round(self.last_capture, 2),
+        }
+
+    def release(self):
+        if self._video is not None:
+            self._video.release()
+            self._video = None
+        self._initialized = False
+
+    def __enter__(self):
+        self.initialize()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
@@ -0,0 +1,139 @@
+"""
+Wire Format Module
+Compact delta-encoded binary frames for game_state messages
+Layout is mirrored by decodeStateFrame in discord-bot/vision-server.js
+"""
+
+import struct
+from typing import Any, Dict, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+WIRE_FORMAT = "binary-delta-v1"
+MAGIC = 0x56  # 'V'
+VERSION = 1
+FLAG_KEYFRAME = 0x01
+
+# Header: magic, version, flags, seq, sent_at, present mask, null mask
+HEADER = struct.Struct('<BBBIdHH')
+
+# Field order is part of the protocol; append only
+FIELDS: Tuple[Tuple[str, str], ...] = (
+    ('hp', 'H'),
+    ('shield', 'H'),
+    ('wood', 'H'),
+    ('brick', 'H'),
+    ('metal', 'H'),
+    ('storm_phase', 'B'),
+    ('storm_seconds', 'H'),
+    ('alive_players', 'B'),
+    ('eliminations', 'B'),
+    ('surge_active', '?'),
+    ('surge_text', 'str'),
+    ('timestamp', 'd'),
+    ('capture_fps', 'f'),
+    ('confidence', 'f'),
+    ('stream_id', 'str'),
+)
+# Sent on every frame when set, so receivers can route deltas per stream
+ALWAYS_SENT = frozenset(('stream_id',))
+_STRUCTS = {code: struct.Struct('<' + code) for _, code in FIELDS if code != 'str'}
+_INT_LIMITS = {'B': 0xFF, 'H': 0xFFFF}
+
+
+class StateEncoder:
+    """
+    Encodes game_state dicts as binary frames holding only the fields that
+    changed since the previous frame, with a full keyframe every
+    keyframe_interval frames. The websocket is ordered and reliable, so a
+    frame sent on a live connection counts as acknowledged; reset() on every
+    (re)connect forces the next frame to be a keyframe.
+    """
+
+    def __init__(self, keyframe_interval: int = 30):
+        self.keyframe_interval = keyframe_interval
+        self._last: Optional[Dict[str, Any]] = None
+        self._seq = 0
+        self._since_keyframe = 0
+
+    def reset(self):
+        self._last = None
+        self._since_keyframe = 0
+
+    def encode(self, state: Dict[str, Any], sent_at: float) -> bytes:
+        values = {name: self._quantize(code, state.get(name)) for name, code in FIELDS}
+        keyframe = self._last is None or self._since_keyframe >= self.keyframe_interval
+        present = 0
+        nulls = 0
+        body = []
+        for bit, (name, code) in enumerate(FIELDS):
+            value = values[name]
+            if not keyframe and self._last.get(name) == value and not (name in ALWAYS_SENT and value is not None):
+                continue
+            present |= 1 << bit
+            if value is None:
+                nulls |= 1 << bit
+            elif code == 'str':
+                raw = value.encode('utf-8')[:255]
+                body.append(bytes((len(raw),)) + raw)
+            else:
+                body.append(_STRUCTS[code].pack(value))
+
+        self._seq = (self._seq + 1) & 0xFFFFFFFF
+        self._since_keyframe = 0 if keyframe else self._since_keyframe + 1
+        self._last = values
+        flags = FLAG_KEYFRAME if keyframe else 0
+        return HEADER.pack(MAGIC, VERSION, flags, self._seq, sent_at, present, nulls) + b''.join(body)
+
+    @staticmethod
+    def _quantize(code: str, value: Any) -> Any:
+        if value is None:
+            return None
+        if code in _INT_LIMITS:
+            return max(0, min(int(value), _INT_LIMITS[code]))
+        if code == 'f':
+            return round(float(value), 1)
+        if code == '?':
+            return bool(value)
+        if code == 'str':
+            return str(value)
+        return float(value)
+
+
+class StateDecoder:
+    """Rebuilds full state dicts from a stream of binary frames, per stream_id."""
+
+    def __init__(self):
+        self.state: Optional[Dict[str, Any]] = None
+        self._streams: Dict[Optional[str], Dict[str, Any]] = {}
+
+    def decode(self, frame: bytes) -> Optional[Tuple[Dict[str, Any], float]]:
+        magic, version, flags, _seq, sent_at, present, nulls = HEADER.unpack_from(frame, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a game_state frame")
+        changes = {}
+        offset = HEADER.size
+        for bit, (name, code) in enumerate(FIELDS):
+            if not present & (1 << bit):
+                continue
+            if nulls & (1 << bit):
+                changes[name] = None
+            elif code == 'str':
+                length = frame[offset]
+                changes[name] = frame[offset + 1:offset + 1 + length].decode('utf-8')
+                offset += 1 + length
+            else:
+                changes[name] = _STRUCTS[code].unpack_from(frame, offset)[0]
+                offset += _STRUCTS[code].size
+        stream = changes.get('stream_id')
+        if flags & FLAG_KEYFRAME:
+            self.state = self._streams[stream] = changes
+        elif stream in self._streams:
+            self.state = self._streams[stream]
+            self.state.update(changes)
+        else:
+            return None
+        seconds = self.state.get('storm_seconds')
+        self.state['storm_timer'] = f"{seconds // 60}:{seconds % 60:02d}" if seconds is not None else None
+        return dict(self.state), sent_at
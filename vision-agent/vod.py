@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Fortnite IGL Vision Agent - VOD Analysis
+Runs the extractor over a recorded match faster than real time and writes
+the GameState timeline as JSON Lines (one state per sampled frame).
+
+The video is split into one time segment per worker process. Each worker
+samples its segment at --fps, skipping the frames in between, and runs its
+own extractor and tracker; the segments are stitched back together in order.
+
+Usage:
+    python vod.py match.mp4
+    python vod.py match.mp4 --fps 2 --workers 4 -o match.timeline.jsonl
+    python vod.py match.mp4 --start 600 --end 900
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import logging
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import cv2
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils.extractor import StateExtractor
+from utils.state import StateArray
+from utils.tracker import StateTracker
+from utils.backends import BACKENDS, backend_available
+from utils.video import VideoCapture
+
+logger = logging.getLogger(__name__)
+
+
+def plan_segments(start: float, end: float, workers: int, min_segment: float = 60.0) -> List[Tuple[float, float]]:
+    """Split [start, end) into at most workers segments of at least min_segment seconds."""
+    count = max(1, min(workers, int((end - start) // min_segment) or 1))
+    length = (end - start) / count
+    return [(start + i * length, end if i == count - 1 else start + (i + 1) * length) for i in range(count)]
+
+
+def _init_worker(threads: int):
+    # Keep each process's native thread pools to its share of the cores.
+    # OCR backends import their runtime lazily, so the variables still apply.
+    os.environ['OMP_NUM_THREADS'] = str(threads)
+    os.environ['MKL_NUM_THREADS'] = str(threads)
+    cv2.setNumThreads(threads)
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s | %(levelname)7s | %(name)s | %(message)s',
+                        datefmt='%H:%M:%S')
+
+
+def analyze_segment(config: Dict[str, Any], path: str, start: float, end: float, fps: float,
+                    warmup: float = 10.0, threads: int = 0) -> Tuple[StateArray, Dict[str, Any]]:
+    """
+    Extract the timeline of [start, end). Decoding starts warmup seconds
+    early so the tracker has confirmed values at the segment boundary;
+    those states are not returned. The timeline comes back as one
+    structured array, which pickles to the parent much faster than dicts.
+    """
+    capture = VideoCapture(path, sample_fps=fps, start=max(start - warmup, 0.0), end=end, threads=threads)
+    extractor = StateExtractor(config, capture=capture)
+    if extractor.ocr.digits is not None:
+        extractor.ocr.digits.templates_path = None  # segments run in parallel; the live agent owns the file
+    if not extractor.initialize():
+        raise RuntimeError(f"Extractor failed to initialize for {path}")
+    tracker_config = config.get('tracker', {})
+    tracker = None
+    if tracker_config.get('enabled', True):
+        tracker = StateTracker(tracker_config, scheduler=extractor.scheduler)
+
+    timeline = StateArray(int((end - start) * fps) + 1)
+    started = time.perf_counter()
+    try:
+        while True:
+            state = extractor.extract_state()
+            if state is None:
+                if extractor.capture_exhausted:
+                    break
+                continue
+            if tracker is not None:
+                state = tracker.update(state, extractor.last_refreshed)
+            if state.timestamp >= start:
+                timeline.append(state)
+        stats = dict(capture.stats(), start=start, end=end, states=len(timeline),
+                     seconds=round(time.perf_counter() - started, 2), cache=extractor.cache_stats())
+    finally:
+        extractor.release()
+        capture.release()
+    return timeline, stats
+
+
+def analyze(config: Dict[str, Any], path: str, fps: float, workers: int, start: float = 0.0,
+            end: Optional[float] = None, warmup: float = 10.0) -> Tuple[StateArray, List[Dict[str, Any]]]:
+    with VideoCapture(path) as probe:
+        if not probe.frame_count:
+            raise RuntimeError(f"Could not read {path}")
+        duration = probe.duration
+    end = min(end, duration) if end is not None else duration
+    segments = plan_segments(start, end, workers)
+    threads = max(1, (os.cpu_count() or 1) // len(segments))
+    logger.info(f"{path}: {end - start:.0f}s of video in {len(segments)} segments at {fps} FPS")
+
+    if len(segments) == 1:
+        _init_worker(threads)
+        results = [analyze_segment(config, path, segments[0][0], segments[0][1], fps, warmup, threads)]
+    else:
+        # spawn: workers load their own OCR engine and must not inherit a forked one
+        with ProcessPoolExecutor(max_workers=len(segments), mp_context=mp.get_context('spawn'),
+                                 initializer=_init_worker, initargs=(threads,)) as executor:
+            futures = [executor.submit(analyze_segment, config, path, seg_start, seg_end, fps, warmup, threads)
+                       for seg_start, seg_end in segments]
+            results = [future.result() for future in futures]
+
+    timeline = StateArray.concatenate(segment for segment, _ in results)
+    return timeline, [stats for _, stats in results]
+
+
+def write_timeline(timeline: StateArray, path: str):
+    with open(path, 'w') as f:
+        for state in timeline.to_dicts():
+            f.write(json.dumps(state, separators=(',', ':')))
+            f.write('\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fortnite IGL Vision Agent - VOD analysis")
+    parser.add_argument('video', help="recorded match (any format OpenCV/FFmpeg can read)")
+    parser.add_argument('--config', '-c', default='config.json')
+    parser.add_argument('--output', '-o', help="timeline path (default: <video>.timeline.jsonl)")
+    parser.add_argument('--fps', type=float, default=None, help="frames sampled per second of video "
+                        "(default: capture.target_fps)")
+    parser.add_argument('--workers', '-w', type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="worker processes, each with its own OCR engine")
+    parser.add_argument('--start', type=float, default=0.0, help="first second of video to analyze")
+    parser.add_argument('--end', type=float, default=None, help="last second of video to analyze")
+    parser.add_argument('--warmup', type=float, default=10.0,
+                        help="seconds decoded before each segment so the tracker is settled at its start")
+    parser.add_argument('--no-easyocr', action='store_true', help="digit recognizer only")
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default=None, help="override ocr.backend")
+    parser.add_argument('--debug', '-d', action='store_true')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.INFO,
+                        format='%(asctime)s | %(levelname)7s | %(name)s | %(message)s', datefmt='%H:%M:%S')
+
+    with open(args.config) as f:
+        config = json.load(f)
+    config.pop('streams', None)
+    capture_config = config.setdefault('capture', {})
+    capture_config.pop('record', None)
+    capture_config.pop('replay', None)
+    ocr_config = config.setdefault('ocr', {})
+    # Offline there is nothing to show while the model loads, and processes replace the pool
+    ocr_config['background_load'] = False
+    ocr_config['workers'] = 0
+    if args.backend:
+        ocr_config['backend'] = args.backend
+    backend = ocr_config.get('backend', 'easyocr')
+    if args.no_easyocr or not backend_available(backend):
+        if not args.no_easyocr:
+            logger.warning(f"OCR backend '{backend}' not installed: using the digit recognizer only")
+        ocr_config['fallback'] = False
+    fps = args.fps or capture_config.get('target_fps', 3)
+
+    started = time.perf_counter()
+    timeline, segments = analyze(config, args.video, fps, args.workers, args.start, args.end, args.warmup)
+    elapsed = time.perf_counter() - started
+    output = args.output or str(Path(args.video).with_suffix('.timeline.jsonl'))
+    write_timeline(timeline, output)
+
+    for stats in segments:
+        logger.info(f"Segment {stats['start']:.0f}-{stats['end']:.0f}s: {stats['states']} states, "
+                    f"{stats['frames_decoded']} decoded, {stats['frames_skipped']} skipped, {stats['seconds']}s")
+    timestamps = timeline.rows['timestamp']
+    covered = float(timestamps[-1] - timestamps[0]) if len(timeline) > 1 else 0.0
+    speed = f", {covered / elapsed:.1f}x real time" if elapsed > 0 and covered else ""
+    logger.info(f"Wrote {len(timeline)} states to {output} in {elapsed:.1f}s{speed}")
+
+
+if __name__ == "__main__":
+    main()